@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for lazy-cli.
+
+Run from the repository root:
+
+    python -m benchmarks                         # run every case, print a table
+    python -m benchmarks --output results.json   # also record the results
+    python -m benchmarks --baseline benchmarks/baseline.json
+
+See benchmarks/README.md.
+"""
@@ -0,0 +1,157 @@
+"""
+Synthetic directory trees for benchmarks.
+
+generate_tree() creates a reproducible tree (same seed, same tree) with a
+given number of files, spread over a directory tree of a given depth and
+fan-out, with a weighted mix of extensions, random name lengths and a share
+of hidden files.
+
+Usage:
+    python -m benchmarks.generate /tmp/tree --files 100000 --depth 3 \\
+        --extensions jpg=30,pdf=10,txt=5 --hidden-ratio 0.1
+"""
+
+import argparse
+import os
+import random
+import string
+from typing import Dict, List, Optional, Tuple
+
+# Extension -> weight, roughly a Downloads folder
+DEFAULT_EXTENSIONS = {
+    "jpg": 25,
+    "png": 10,
+    "pdf": 15,
+    "docx": 5,
+    "txt": 8,
+    "mp3": 6,
+    "mp4": 5,
+    "zip": 6,
+    "tar.gz": 2,
+    "py": 6,
+    "json": 4,
+    "exe": 3,
+    "xyz": 5,
+}
+
+_NAME_CHARS = string.ascii_lowercase + string.digits + "_-"
+
+
+def parse_extensions(spec: str) -> Dict[str, int]:
+    """
+    Parse an extension mix such as "jpg=30,pdf=10,txt".
+
+    Args:
+        spec: Comma-separated extensions, each with an optional weight (default 1)
+
+    Returns:
+        Dictionary of extension -> weight
+
+    Raises:
+        ValueError: If a weight is not a positive integer
+    """
+    mix: Dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        extension, _, weight = item.partition("=")
+        count = int(weight or 1)
+        if count <= 0:
+            raise ValueError(f"Weight of {extension} must be positive")
+        mix[extension.lstrip(".")] = count
+    return mix
+
+
+def _directories(root: str, depth: int, fanout: int) -> List[str]:
+    """All directories of a tree with the given depth and fan-out, root included."""
+    level = [root]
+    directories = [root]
+    for _ in range(depth):
+        level = [os.path.join(parent, f"dir{i:03d}") for parent in level for i in range(fanout)]
+        directories.extend(level)
+    return directories
+
+
+def generate_tree(
+    root: str,
+    files: int = 10000,
+    extensions: Optional[Dict[str, int]] = None,
+    depth: int = 2,
+    fanout: int = 8,
+    name_length: Tuple[int, int] = (8, 24),
+    hidden_ratio: float = 0.05,
+    max_size: int = 256,
+    seed: int = 0,
+) -> int:
+    """
+    Create a synthetic directory tree.
+
+    Args:
+        root: Directory to create the tree in (created if needed)
+        files: Number of files
+        extensions: Extension -> weight (defaults to DEFAULT_EXTENSIONS)
+        depth: Subdirectory levels below the root (0 = all files in the root)
+        fanout: Subdirectories per directory
+        name_length: Minimum and maximum length of file names, without extension
+        hidden_ratio: Share of files whose name starts with a dot
+        max_size: Largest file size in bytes
+        seed: Random seed, so the same arguments produce the same tree
+
+    Returns:
+        Number of files created
+    """
+    rng = random.Random(seed)
+    mix = extensions or DEFAULT_EXTENSIONS
+    names, weights = list(mix), list(mix.values())
+    directories = _directories(os.fspath(root), depth, fanout)
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    payload = bytes(max_size)
+    for i in range(files):
+        length = rng.randint(*name_length)
+        stem = "".join(rng.choices(_NAME_CHARS, k=length))
+        # The counter keeps names unique without remembering them
+        name = f"{stem}_{i}.{rng.choices(names, weights)[0]}"
+        if rng.random() < hidden_ratio:
+            name = "." + name
+        path = os.path.join(rng.choice(directories), name)
+        with open(path, "wb") as f:
+            f.write(payload[: rng.randint(0, max_size)])
+
+    return files
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line interface; see the module docstring."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate")
+    parser.add_argument("root", help="Directory to create the tree in")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument(
+        "--extensions",
+        type=parse_extensions,
+        default=None,
+        help="Extension mix, e.g. jpg=30,pdf=10,txt=5",
+    )
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--min-name", type=int, default=8)
+    parser.add_argument("--max-name", type=int, default=24)
+    parser.add_argument("--hidden-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    count = generate_tree(
+        args.root,
+        args.files,
+        args.extensions,
+        args.depth,
+        args.fanout,
+        (args.min_name, args.max_name),
+        args.hidden_ratio,
+        seed=args.seed,
+    )
+    print(f"Created {count} files in {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,386 @@
+"""
+Benchmark runner.
+
+Every case runs in a fresh Python process, so its peak RSS is its own and
+import costs are not shared between cases. A case prepares its input (for
+example a synthetic tree from benchmarks.generate), then times only the
+operation under test. Each case is repeated and the fastest run is kept.
+
+Results are a JSON document:
+
+    {"params": {...}, "cases": {"scan": {"items": 20000, "seconds": 0.21,
+     "throughput": 95238.1, "unit": "files/s", "peak_rss_mb": 41.2}, ...}}
+
+With --baseline, a case regresses when its throughput dropped by more than
+the threshold, or its peak RSS grew by more than the threshold (and by more
+than a small absolute margin, to ignore noise); the exit code is then 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.generate import generate_tree, parse_extensions
+
+# Allowed relative slowdown or memory growth before a case counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Peak RSS differences below this are noise
+MIN_RSS_DELTA_MB = 4.0
+
+DEFAULT_FILES = 20000
+DEFAULT_REPEAT = 3
+
+# Case name -> function(workdir, params) returning {"items": n, "seconds": s}
+Case = Callable[[Path, Dict[str, Any]], Dict[str, float]]
+CASES: Dict[str, Case] = {}
+UNITS: Dict[str, str] = {}
+
+
+def case(name: str, unit: str) -> Callable[[Case], Case]:
+    """Register a benchmark case."""
+
+    def register(function: Case) -> Case:
+        CASES[name] = function
+        UNITS[name] = unit
+        return function
+
+    return register
+
+
+def _tree(workdir: Path, params: Dict[str, Any], depth: Optional[int] = None) -> Path:
+    """Generate the synthetic tree for a case."""
+    root = workdir / "tree"
+    generate_tree(
+        str(root),
+        params["files"],
+        extensions=params["extensions"],
+        depth=params["depth"] if depth is None else depth,
+        name_length=tuple(params["name_length"]),
+        hidden_ratio=params["hidden_ratio"],
+        seed=params["seed"],
+    )
+    return root
+
+
+def _timed(function: Callable[[], int]) -> Dict[str, float]:
+    start = time.perf_counter()
+    items = function()
+    return {"items": items, "seconds": time.perf_counter() - start}
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+@case("scan", "files/s")
+def bench_scan(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """Recursive scan_directory() of a synthetic tree."""
+    from lazy_cli.plugins.organize_files import scan_directory
+
+    root = _tree(workdir, params)
+    return _timed(lambda: scan_directory(root, recursive=True).total)
+
+
+@case("scan_indexed", "files/s")
+def bench_scan_indexed(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """Recursive scan_directory(use_index=True) of an unchanged, already indexed tree."""
+    from lazy_cli.plugins.organize_files import scan_directory
+
+    root = _tree(workdir, params)
+    # Make the directories old enough to be trusted by the index
+    for path, _, _ in os.walk(root):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+    scan_directory(root, recursive=True, use_index=True)
+    return _timed(lambda: scan_directory(root, recursive=True, use_index=True).total)
+
+
+@case("get_category", "calls/s")
+def bench_get_category(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """get_category() over the extensions of a synthetic tree, many times."""
+    from lazy_cli.plugins.organize_files import get_category
+
+    extensions = [
+        name.rsplit(".", 1)[-1]
+        for _, _, names in os.walk(_tree(workdir, params, depth=0))
+        for name in names
+    ]
+
+    def run() -> int:
+        for _ in range(10):
+            for extension in extensions:
+                get_category(extension)
+        return len(extensions) * 10
+
+    return _timed(run)
+
+
+@case("organize_dry_run", "files/s")
+def bench_organize_dry_run(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """organize_files(dry_run=True) on a scanned flat directory."""
+    from lazy_cli.plugins.organize_files import organize_files, scan_directory
+
+    root = _tree(workdir, params, depth=0)
+    files = scan_directory(root)
+    return _timed(lambda: organize_files(root, files, dry_run=True)["moved"])
+
+
+@case("organize", "files/s")
+def bench_organize(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """organize_files() moving every file of a scanned flat directory."""
+    from lazy_cli.plugins.organize_files import organize_files, scan_directory
+
+    root = _tree(workdir, params, depth=0)
+    files = scan_directory(root)
+    return _timed(lambda: organize_files(root, files)["moved"])
+
+
+def _run_cli(args: List[str], runs: int) -> Dict[str, float]:
+    """Time runs of the lazy command in new interpreters, after a warm-up run."""
+    command = [sys.executable, "-m", "lazy_cli.main", *args]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+    def run() -> int:
+        for _ in range(runs):
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        return runs
+
+    return _timed(run)
+
+
+@case("cli_startup", "runs/s")
+def bench_cli_startup(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """`lazy --help` in a new interpreter: the fast path, without typer or plugins."""
+    return _run_cli(["--help"], 10)
+
+
+@case("cli_dispatch", "runs/s")
+def bench_cli_dispatch(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """`lazy organize --help` in a new interpreter: the whole startup of a command."""
+    return _run_cli(["organize", "--help"], 5)
+
+
+@case("plugin_info", "calls/s")
+def bench_plugin_info(workdir: Path, params: Dict[str, Any]) -> Dict[str, float]:
+    """get_plugin_info() with a warm plugin manifest."""
+    from lazy_cli.core.plugin_loader import get_plugin_info
+
+    get_plugin_info()
+
+    def run() -> int:
+        for _ in range(200):
+            get_plugin_info()
+        return 200
+
+    return _timed(run)
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+def _peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process and its finished children, in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case_here(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one case in this process, in a temporary home directory."""
+    workdir = Path(tempfile.mkdtemp(prefix=f"lazy-bench-{name}-"))
+    try:
+        # Keep the index, manifest and config of the benchmark away from the user's
+        os.environ["HOME"] = str(workdir)
+        result: Dict[str, Any] = dict(CASES[name](workdir, params))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def run_case(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one case in a fresh interpreter and return its measurements."""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.run",
+        "--child",
+        name,
+        "--params",
+        json.dumps(params),
+    ]
+    output = subprocess.run(
+        command, check=True, stdout=subprocess.PIPE, text=True, cwd=Path(__file__).parent.parent
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmarks(
+    names: List[str], params: Dict[str, Any], repeat: int = DEFAULT_REPEAT
+) -> Dict[str, Any]:
+    """
+    Run benchmark cases, keeping the fastest of several runs of each.
+
+    Args:
+        names: Cases to run
+        params: Tree parameters (files, extensions, depth, name_length, hidden_ratio, seed)
+        repeat: Runs per case
+
+    Returns:
+        Results document (see the module docstring)
+    """
+    cases: Dict[str, Any] = {}
+    for name in names:
+        runs = [run_case(name, params) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        cases[name] = {
+            "items": best["items"],
+            "seconds": round(best["seconds"], 4),
+            "throughput": round(best["items"] / best["seconds"], 1) if best["seconds"] else None,
+            "unit": UNITS[name],
+            "peak_rss_mb": max((run["peak_rss_mb"] or 0.0) for run in runs) or None,
+        }
+    return {
+        "params": params,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": cases,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_rss_delta_mb: float = MIN_RSS_DELTA_MB,
+) -> List[str]:
+    """
+    Compare results against a stored baseline.
+
+    Args:
+        current: Results as returned by run_benchmarks()
+        baseline: Baseline results in the same format
+        threshold: Allowed relative slowdown or memory growth (0.25 = 25%)
+        min_rss_delta_mb: Memory growth smaller than this is treated as noise
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, result in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        if base.get("throughput") and result.get("throughput"):
+            if result["throughput"] < base["throughput"] * (1 - threshold):
+                regressions.append(
+                    f"{name}: {base['throughput']:.0f} -> {result['throughput']:.0f} "
+                    f"{result['unit']}"
+                )
+        if base.get("peak_rss_mb") and result.get("peak_rss_mb"):
+            growth = result["peak_rss_mb"] - base["peak_rss_mb"]
+            if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold) and (
+                growth > min_rss_delta_mb
+            ):
+                regressions.append(
+                    f"{name}: peak RSS {base['peak_rss_mb']:.1f} MB -> "
+                    f"{result['peak_rss_mb']:.1f} MB"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Print results as a table."""
+    print(f"{'case':<18} {'items':>9} {'seconds':>9} {'throughput':>22} {'peak RSS':>10}")
+    for name, result in results["cases"].items():
+        throughput = f"{result['throughput'] or 0:,.0f} {result['unit']}"
+        rss = f"{result['peak_rss_mb']} MB" if result["peak_rss_mb"] else "-"
+        print(
+            f"{name:<18} {result['items']:>9} {result['seconds']:>9.3f} "
+            f"{throughput:>22} {rss:>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run ``python -m benchmarks``.
+
+    Returns:
+        Exit code: 0, or 1 if a case regressed against the baseline
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all of {list(CASES)})")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Files per tree")
+    parser.add_argument(
+        "--extensions",
+        type=parse_extensions,
+        default=None,
+        help="Extension mix of the trees, e.g. jpg=30,pdf=10,txt=5",
+    )
+    parser.add_argument("--depth", type=int, default=2, help="Depth of recursive trees")
+    parser.add_argument("--min-name", type=int, default=8, help="Shortest file name")
+    parser.add_argument("--max-name", type=int, default=24, help="Longest file name")
+    parser.add_argument("--hidden-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per case")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Fail if worse than these stored results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--params", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_case_here(args.child, json.loads(args.params))))
+        return 0
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    params = {
+        "files": args.files,
+        "extensions": args.extensions,
+        "depth": args.depth,
+        "name_length": [args.min_name, args.max_name],
+        "hidden_ratio": args.hidden_ratio,
+        "seed": args.seed,
+    }
+    results = run_benchmarks(args.cases or list(CASES), params, args.repeat)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print("Warning: baseline was recorded with different parameters", file=sys.stderr)
+        regressions = compare_results(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
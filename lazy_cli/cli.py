@@ -0,0 +1,68 @@
+"""
+Typer application for lazy-cli.
+Initializes the CLI and registers all plugins (imported lazily on dispatch).
+
+Importing this module pulls in typer and rich; lazy_cli.main only does so
+when an invocation actually needs the full CLI.
+"""
+
+from typing import Optional
+
+from lazy_cli.core.profiler import profiler
+
+with profiler.phase("import rich"):
+    from rich.console import Console
+
+with profiler.phase("import typer"):
+    import typer
+
+with profiler.phase("import plugin_loader"):
+    from lazy_cli.core.plugin_loader import load_plugins
+
+from lazy_cli import __version__
+from lazy_cli.core.trace import start_tracing
+from lazy_cli.main import APP_DESCRIPTION, APP_HELP
+
+# Initialize the main CLI app
+app = typer.Typer(
+    name="lazy",
+    help=APP_HELP,
+    add_completion=True,
+    rich_markup_mode="rich",
+)
+
+console = Console()
+
+
+def version_callback(value: bool):
+    """Display version information."""
+    if value:
+        console.print(f"[bold blue]lazy-cli[/bold blue] version [green]{__version__}[/green]")
+        raise typer.Exit()
+
+
+@app.callback(help=APP_DESCRIPTION)
+def main(
+    version: bool = typer.Option(
+        None,
+        "--version",
+        "-v",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        metavar="FILE",
+        help="Write a Chrome trace of the command to FILE ('-' prints a summary)",
+    ),
+):
+    # `lazy` handles --trace before the app is built; this covers direct use of the app
+    if trace:
+        start_tracing(trace)
+
+
+# Register all plugins; each module is imported only when its command runs
+with profiler.phase("plugin discovery"):
+    load_plugins(app)
@@ -0,0 +1,489 @@
+"""
+Streaming ZIP archives with parallel compression.
+
+zipfile compresses every member on the thread that writes it, so it builds
+an archive on a single core. ZIP members are compressed independently of
+each other, though: compress_files() deflates whole files on a thread pool
+(zlib and hashlib release the GIL on large buffers), while ZipWriter
+appends the finished members one after the other, in input order, to a
+stream that is only ever written sequentially, never seeked.
+
+Each member is compressed into a spooled temporary file: members up to
+SPOOL_SIZE stay in memory and larger ones spill to disk, so memory is
+bounded by the few files in flight, whatever their sizes. The CRC-32 and a
+SHA-256 digest of the contents are computed in the same read pass as the
+compression.
+
+Files whose extension says they are already compressed (JPEG, MP4,
+ZIP...) are stored instead of deflated, like ``zip -n`` does, which saves
+most of the CPU time on photo and video collections. Symbolic links are
+archived as links (their target, with the link file type), like ``zip -y``
+does, rather than followed.
+
+ZIP64 records are written when sizes, offsets or the number of members
+exceed the limits of the original format.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from lazy_cli.core.trace import tracer
+
+# Number of threads compressing files
+DEFAULT_COMPRESS_WORKERS = os.cpu_count() or 1
+
+# zlib compression level (0 stores every file)
+DEFAULT_LEVEL = 6
+
+# Bytes read per chunk
+CHUNK_SIZE = 1024 * 1024
+
+# Files compressed per task: a batch ends after this many bytes or files
+BATCH_BYTES = 1024 * 1024
+BATCH_FILES = 256
+
+# Compressed bytes of a member kept in memory before spilling to a temporary file
+SPOOL_SIZE = 8 * 1024 * 1024
+
+# Digest of the member contents, for change detection
+DIGEST_ALGORITHM = "sha256"
+
+# Extensions of already compressed formats, stored without deflating
+STORED_EXTENSIONS = {
+    ".7z",
+    ".aac",
+    ".avi",
+    ".bz2",
+    ".docx",
+    ".flac",
+    ".gif",
+    ".gz",
+    ".heic",
+    ".jar",
+    ".jpeg",
+    ".jpg",
+    ".m4a",
+    ".mkv",
+    ".mov",
+    ".mp3",
+    ".mp4",
+    ".ogg",
+    ".png",
+    ".pptx",
+    ".rar",
+    ".tgz",
+    ".webm",
+    ".webp",
+    ".xlsx",
+    ".xz",
+    ".zip",
+    ".zst",
+}
+
+STORED = 0
+DEFLATED = 8
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END = struct.Struct("<IHHHHIIH")
+_END64 = struct.Struct("<IQHHIIQQQQ")
+_LOCATOR64 = struct.Struct("<IIQI")
+_ZIP64_EXTRA = 0x0001
+
+_LOCAL_SIGNATURE = 0x04034B50
+_CENTRAL_SIGNATURE = 0x02014B50
+_END_SIGNATURE = 0x06054B50
+_END64_SIGNATURE = 0x06064B50
+_LOCATOR64_SIGNATURE = 0x07064B50
+
+# Versions needed to extract: 2.0 (deflate), 4.5 (ZIP64); "made by" Unix 4.5
+_VERSION = 20
+_VERSION64 = 45
+_MADE_BY = (3 << 8) | _VERSION64
+
+# Names are UTF-8 (general purpose flag bit 11)
+_UTF8 = 0x800
+
+_LIMIT = 0xFFFFFFFF
+_COUNT_LIMIT = 0xFFFF
+
+_buffers = threading.local()
+
+T = TypeVar("T")
+
+
+def _buffer() -> memoryview:
+    """This thread's reusable read buffer."""
+    view = getattr(_buffers, "view", None)
+    if view is None:
+        view = _buffers.view = memoryview(bytearray(CHUNK_SIZE))
+    return view
+
+
+def _dos_time(mtime: float) -> Tuple[int, int]:
+    """MS-DOS (time, date) of a timestamp, clamped to the 1980-2107 range."""
+    t = time.localtime(mtime)
+    year = min(max(t.tm_year, 1980), 2107)
+    if year != t.tm_year:
+        return (0, (1 << 5) | 1) if year == 1980 else (0xBF7D, 0xFF9F)
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
+
+
+class CompressedFile:
+    """
+    A compressed member waiting to be written.
+
+    Attributes:
+        method: STORED or DEFLATED
+        crc: CRC-32 of the contents
+        size: Size of the contents
+        compressed_size: Size of the compressed data
+        digest: Hex digest of the contents (see DIGEST_ALGORITHM)
+        data: Compressed data, positioned at its start
+        mode: Unix mode of the file (file type and permission bits)
+    """
+
+    __slots__ = ("method", "crc", "size", "compressed_size", "digest", "data", "mode")
+
+    def __init__(
+        self,
+        method: int,
+        crc: int,
+        size: int,
+        digest: str,
+        data: "tempfile.SpooledTemporaryFile",
+        mode: int = stat.S_IFREG | 0o644,
+    ) -> None:
+        self.method = method
+        self.mode = mode
+        self.crc = crc
+        self.size = size
+        self.compressed_size = data.tell()
+        self.digest = digest
+        self.data = data
+        data.seek(0)
+
+    def close(self) -> None:
+        """Free the compressed data."""
+        self.data.close()
+
+
+def compress_file(path: str, level: int = DEFAULT_LEVEL) -> CompressedFile:
+    """
+    Compress a file in one read pass, also computing its CRC and digest.
+
+    A symbolic link is not followed: its member holds the link target.
+
+    Args:
+        path: File to compress
+        level: zlib level; 0, or an already compressed format, stores the file
+
+    Returns:
+        The compressed member
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    if os.path.islink(path):
+        return _link_member(path)
+
+    store = level == 0 or os.path.splitext(path)[1].lower() in STORED_EXTENSIONS
+    compressor = None if store else zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    hasher = hashlib.new(DIGEST_ALGORITHM)
+    data = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    view = _buffer()
+    crc = size = 0
+
+    try:
+        with open(path, "rb") as f, tracer.span("compress_file"):
+            mode = os.fstat(f.fileno()).st_mode
+            while True:
+                count = f.readinto(view)
+                if not count:
+                    break
+                chunk = view[:count]
+                crc = zlib.crc32(chunk, crc)
+                hasher.update(chunk)
+                size += count
+                data.write(chunk if compressor is None else compressor.compress(chunk))
+            if compressor is not None:
+                data.write(compressor.flush())
+    except BaseException:
+        data.close()
+        raise
+
+    tracer.count("compressed_bytes", size)
+    method = STORED if compressor is None else DEFLATED
+    return CompressedFile(method, crc, size, hasher.hexdigest(), data, mode)
+
+
+def _link_member(path: str) -> CompressedFile:
+    """The member of a symbolic link: its target, stored."""
+    target = os.fsencode(os.readlink(path))
+    data = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    data.write(target)
+    digest = hashlib.new(DIGEST_ALGORITHM, target).hexdigest()
+    return CompressedFile(
+        STORED, zlib.crc32(target), len(target), digest, data, stat.S_IFLNK | 0o777
+    )
+
+
+# Results of compress_files(): (key, compressed member, error)
+CompressResult = Tuple[T, Optional["CompressedFile"], Optional[OSError]]
+
+# Results of one batch: a member or the error of each file
+_BatchResult = List[Union["CompressedFile", OSError]]
+
+
+def _compress_batch(paths: List[str], level: int) -> _BatchResult:
+    """Compress a batch of files, collecting failures instead of stopping."""
+    results: _BatchResult = []
+    for path in paths:
+        try:
+            results.append(compress_file(path, level))
+        except OSError as e:
+            tracer.count("compress_errors")
+            results.append(e)
+    return results
+
+
+def compress_files(
+    items: Iterable[Tuple[T, str, int]],
+    level: int = DEFAULT_LEVEL,
+    workers: Optional[int] = None,
+) -> Iterator[CompressResult]:
+    """
+    Compress many files in parallel, yielding them in input order.
+
+    Small files are handed to the threads in batches of about BATCH_BYTES,
+    so the cost of a task stays small next to the compression itself.
+
+    Args:
+        items: (key, path, size) tuples; the key is passed through to the
+            results, and the size (as scanned) is only used for batching
+        level: zlib level (see compress_file())
+        workers: Number of compressing threads (1 = in this thread)
+
+    Yields:
+        Tuples of (key, compressed member, error) in input order; the member
+        is None if the file could not be read, and error says why. The
+        caller closes each member once written.
+    """
+    workers = workers or DEFAULT_COMPRESS_WORKERS
+
+    def results(keys: List[T], batch: _BatchResult) -> Iterator[CompressResult]:
+        for key, result in zip(keys, batch):
+            if isinstance(result, OSError):
+                yield key, None, result
+            else:
+                yield key, result, None
+
+    if workers <= 1:
+        for key, path, _ in items:
+            yield from results([key], _compress_batch([path], level))
+        return
+
+    window: Deque[Tuple[List[T], "Future[_BatchResult]"]] = deque()
+    keys: List[T] = []
+    paths: List[str] = []
+    batch_bytes = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lazy-compress") as pool:
+        try:
+            for key, path, size in items:
+                keys.append(key)
+                paths.append(path)
+                batch_bytes += size
+                if batch_bytes < BATCH_BYTES and len(paths) < BATCH_FILES:
+                    continue
+                window.append((keys, pool.submit(_compress_batch, paths, level)))
+                keys, paths, batch_bytes = [], [], 0
+                # Keep a bounded number of batches in flight (and in memory)
+                while len(window) > workers * 2 or (window and window[0][1].done()):
+                    yield from results(*_pop_result(window))
+            if paths:
+                window.append((keys, pool.submit(_compress_batch, paths, level)))
+            while window:
+                yield from results(*_pop_result(window))
+        finally:
+            for _, future in window:
+                future.cancel()
+
+
+def _pop_result(
+    window: Deque[Tuple[List[T], "Future[_BatchResult]"]],
+) -> Tuple[List[T], _BatchResult]:
+    """Wait for the oldest batch and return its keys and results."""
+    keys, future = window.popleft()
+    return keys, future.result()
+
+
+class ZipWriter:
+    """
+    Writes a ZIP archive sequentially from already compressed members.
+
+    Usage:
+        with open(path, "wb") as f, ZipWriter(f) as archive:
+            for name, member in members:
+                archive.write(name, member, mtime)
+
+    Args:
+        stream: Binary stream the archive is written to
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.offset = 0
+        # Central directory entries, written at the end
+        self._entries: List[bytes] = []
+
+    def __enter__(self) -> "ZipWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self.offset += len(data)
+
+    def write(self, name: str, member: CompressedFile, mtime: float) -> None:
+        """
+        Append a member.
+
+        Args:
+            name: Path in the archive, with "/" separators
+            member: Compressed contents, from compress_file()
+            mtime: Modification time (seconds since the epoch)
+        """
+        encoded = name.encode("utf-8")
+        dos_time, dos_date = _dos_time(mtime)
+        offset = self.offset
+        zip64 = member.size >= _LIMIT or member.compressed_size >= _LIMIT
+        version = _VERSION64 if zip64 else _VERSION
+        flags = _UTF8 if not encoded.isascii() else 0
+
+        extra = b""
+        if zip64:
+            extra = struct.pack("<HHQQ", _ZIP64_EXTRA, 16, member.size, member.compressed_size)
+        self._write(
+            _LOCAL_HEADER.pack(
+                _LOCAL_SIGNATURE,
+                version,
+                flags,
+                member.method,
+                dos_time,
+                dos_date,
+                member.crc,
+                _LIMIT if zip64 else member.compressed_size,
+                _LIMIT if zip64 else member.size,
+                len(encoded),
+                len(extra),
+            )
+        )
+        self._write(encoded + extra)
+        with tracer.span("write_member"):
+            shutil.copyfileobj(member.data, self.stream, CHUNK_SIZE)
+        self.offset += member.compressed_size
+
+        # The central directory only puts the fields that overflow in ZIP64 extra data
+        values = [
+            value for value in (member.size, member.compressed_size, offset) if value >= _LIMIT
+        ]
+        central_extra = b""
+        if values:
+            central_extra = struct.pack(
+                f"<HH{len(values)}Q", _ZIP64_EXTRA, 8 * len(values), *values
+            )
+        self._entries.append(
+            _CENTRAL_HEADER.pack(
+                _CENTRAL_SIGNATURE,
+                _MADE_BY,
+                _VERSION64 if values else _VERSION,
+                flags,
+                member.method,
+                dos_time,
+                dos_date,
+                member.crc,
+                min(member.compressed_size, _LIMIT),
+                min(member.size, _LIMIT),
+                len(encoded),
+                len(central_extra),
+                0,
+                0,
+                0,
+                member.mode << 16,
+                min(offset, _LIMIT),
+            )
+            + encoded
+            + central_extra
+        )
+
+    def write_bytes(self, name: str, contents: bytes, mtime: Optional[float] = None) -> None:
+        """Append a small member from memory (deflated)."""
+        data = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        compressor = zlib.compressobj(DEFAULT_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        data.write(compressor.compress(contents) + compressor.flush())
+        digest = hashlib.new(DIGEST_ALGORITHM, contents).hexdigest()
+        member = CompressedFile(DEFLATED, zlib.crc32(contents), len(contents), digest, data)
+        try:
+            self.write(name, member, time.time() if mtime is None else mtime)
+        finally:
+            member.close()
+
+    @property
+    def count(self) -> int:
+        """Number of members written."""
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Write the central directory; the stream itself is left open."""
+        start = self.offset
+        for entry in self._entries:
+            self._write(entry)
+        size = self.offset - start
+        count = len(self._entries)
+
+        if count >= _COUNT_LIMIT or size >= _LIMIT or start >= _LIMIT:
+            end64 = self.offset
+            self._write(
+                _END64.pack(
+                    _END64_SIGNATURE,
+                    _END64.size - 12,
+                    _MADE_BY,
+                    _VERSION64,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self._write(_LOCATOR64.pack(_LOCATOR64_SIGNATURE, 0, end64, 1))
+        self._write(
+            _END.pack(
+                _END_SIGNATURE,
+                0,
+                0,
+                min(count, _COUNT_LIMIT),
+                min(count, _COUNT_LIMIT),
+                min(size, _LIMIT),
+                min(start, _LIMIT),
+                0,
+            )
+        )
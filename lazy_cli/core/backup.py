@@ -0,0 +1,208 @@
+"""
+Backup manifests for incremental backups.
+
+A BackupManifest records, for every file of the backed-up tree, the size,
+mtime and SHA-256 digest it had at the last backup and the archive holding
+that version. It is a SQLite database stored next to the archives
+(``<name>.manifest.db``), so a tree of millions of files is compared file
+by file with indexed lookups, without loading the manifest in memory.
+
+A file whose size and mtime match the manifest is unchanged and is not
+read at all; that one lookup per file is what makes the daily backup of a
+mostly unchanged tree cheap. A file whose mtime changed but whose digest
+did not (touched, or restored from elsewhere) is not archived again.
+
+Every run works in one transaction that is only committed once its archive
+is complete, so an interrupted backup leaves the manifest of the previous
+run untouched and the next run simply archives the same changes again.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Rows updated with one executemany()
+UPDATE_BATCH = 1000
+
+# Stored state of a file: (size, mtime in ns, digest)
+FileState = Tuple[int, int, str]
+
+
+def get_manifest_path(destination: Union[Path, str], name: str) -> Path:
+    """
+    Get the manifest of the backups of one tree.
+
+    Args:
+        destination: Directory holding the archives
+        name: Backup name (prefix of the archive names)
+
+    Returns:
+        Path to the manifest database
+    """
+    return Path(destination) / f"{name}.manifest.db"
+
+
+class BackupManifest:
+    """
+    Files of a tree as of its last backup.
+
+    Usage:
+        with BackupManifest(path) as manifest:
+            manifest.begin(archive)
+            ... lookup() / unchanged() / update() for each file ...
+            deleted = manifest.remove_missing()
+            manifest.commit(files, size)
+
+    Args:
+        path: Database file
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime INTEGER NOT NULL,"
+            " digest TEXT NOT NULL, archive TEXT NOT NULL, run INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY, archive TEXT NOT NULL, started INTEGER NOT NULL,"
+            " files INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+        )
+        self.run: Optional[int] = None
+        self.archive = ""
+        self._seen: List[Tuple[int, str]] = []
+
+    def __enter__(self) -> "BackupManifest":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def is_empty(self) -> bool:
+        """Whether no backup was completed yet."""
+        return self._db.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None
+
+    def begin(self, archive: str) -> None:
+        """
+        Start a backup run (a transaction) writing to an archive.
+
+        Args:
+            archive: File name of the run's archive
+        """
+        self._db.execute("BEGIN")
+        self.archive = archive
+        last = self._db.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+        self.run = (last or 0) + 1
+
+    def lookup(self, path: str) -> Optional[FileState]:
+        """
+        Get the state of a file at the last backup.
+
+        Args:
+            path: Path relative to the backed-up directory
+
+        Returns:
+            (size, mtime, digest), or None for a new file
+        """
+        return self._db.execute(
+            "SELECT size, mtime, digest FROM files WHERE path = ?", (path,)
+        ).fetchone()
+
+    def unchanged(self, path: str) -> None:
+        """Mark a file as still present and unchanged."""
+        self._seen.append((self.run, path))
+        if len(self._seen) >= UPDATE_BATCH:
+            self._flush_seen()
+
+    def _flush_seen(self) -> None:
+        self._db.executemany("UPDATE files SET run = ? WHERE path = ?", self._seen)
+        self._seen.clear()
+
+    def update(self, path: str, size: int, mtime: int, digest: str, archived: bool) -> None:
+        """
+        Record the new state of a file.
+
+        Args:
+            path: Path relative to the backed-up directory
+            size: Size in bytes
+            mtime: Modification time in nanoseconds
+            digest: Digest of the contents
+            archived: Whether this run's archive holds the file (False when
+                only its mtime changed)
+        """
+        if archived:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime, digest, self.archive, self.run),
+            )
+        else:
+            self._db.execute(
+                "UPDATE files SET size = ?, mtime = ?, run = ? WHERE path = ?",
+                (size, mtime, self.run, path),
+            )
+
+    def remove_missing(self) -> List[str]:
+        """
+        Forget the files not seen during this run.
+
+        Only call this after a complete scan: files in directories that
+        could not be listed would be taken for deleted.
+
+        Returns:
+            Paths of the deleted files
+        """
+        self._flush_seen()
+        deleted = [
+            path
+            for (path,) in self._db.execute(
+                "SELECT path FROM files WHERE run != ? ORDER BY path", (self.run,)
+            )
+        ]
+        self._db.execute("DELETE FROM files WHERE run != ?", (self.run,))
+        return deleted
+
+    def commit(self, files: int, size: int, archived: bool = True) -> None:
+        """
+        Commit the run once its archive is complete.
+
+        Args:
+            files: Number of files archived
+            size: Bytes archived (uncompressed)
+            archived: Whether the archive was written (False when nothing
+                changed); the run is recorded either way
+        """
+        self._flush_seen()
+        self._db.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+            (self.run, self.archive if archived else "", time.time_ns(), files, size),
+        )
+        self._db.execute("COMMIT")
+        self.run = None
+
+    def rollback(self) -> None:
+        """Drop the changes of an unfinished run."""
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+        self._seen.clear()
+        self.run = None
+
+    def archives(self) -> Iterator[Tuple[str, int, int]]:
+        """
+        Yield the archives of the completed runs, oldest first.
+
+        Yields:
+            Tuples of (archive file name, files, bytes)
+        """
+        yield from self._db.execute(
+            "SELECT archive, files, bytes FROM runs WHERE archive != '' ORDER BY id"
+        )
+
+    def close(self) -> None:
+        """Close the database, dropping an unfinished run."""
+        self.rollback()
+        self._db.close()
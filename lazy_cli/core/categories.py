@@ -0,0 +1,269 @@
+"""
+Compiled file categorization rules.
+
+A CategoryEngine turns an ordered list of rules into lookup structures once,
+so classifying a file costs the same whether there are ten rules or hundreds:
+
+- extensions (including multi-part suffixes such as ``tar.gz``) go into a
+  single dictionary keyed by suffix;
+- glob and regex name patterns are combined into one regular expression
+  with a named group per rule (regexes that cannot be combined, such as
+  ones with inline global flags or numbered backreferences, are checked on
+  their own);
+- size thresholds are checked only for the rules that matched.
+
+When several rules match, the one listed first wins.
+"""
+
+import fnmatch
+import hashlib
+import itertools
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+DEFAULT_CATEGORY = "Others"
+
+# Numbered group references (\1, (?(1)...)), which change meaning once the
+# pattern is one alternative among others
+_NUMBERED_REFERENCE = re.compile(r"\\[1-9]|\(\?\([1-9]")
+
+
+class _Rule:
+    """A compiled rule: target category plus optional size bounds."""
+
+    __slots__ = ("category", "min_size", "max_size")
+
+    def __init__(self, category: str, min_size: Optional[int], max_size: Optional[int]) -> None:
+        self.category = category
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def accepts(self, size: Optional[int]) -> bool:
+        """Check the size bounds (a rule with bounds never accepts unknown sizes)."""
+        if self.min_size is None and self.max_size is None:
+            return True
+        if size is None:
+            return False
+        if self.min_size is not None and size < self.min_size:
+            return False
+        return self.max_size is None or size <= self.max_size
+
+
+def _rule_fields(rule: Any) -> Dict[str, Any]:
+    """Read a rule given as a dict or as a model with the same fields."""
+    return dict(rule)
+
+
+class CategoryEngine:
+    """
+    Classifies file names (and optionally sizes) into categories.
+
+    Usage:
+        engine = CategoryEngine(FILE_CATEGORIES, rules=config.organize_rules)
+        engine.classify("backup.tar.gz", size=1024)
+
+    Args:
+        categories: Built-in mapping of category to extensions
+        rules: User rules, checked before the built-in categories. Each rule
+            has a "category" and any of "extensions", "patterns" (globs),
+            "regex", "min_size" and "max_size" (bytes)
+        default: Category for files no rule matches
+    """
+
+    def __init__(
+        self,
+        categories: Mapping[str, Sequence[str]],
+        rules: Iterable[Any] = (),
+        default: str = DEFAULT_CATEGORY,
+    ) -> None:
+        self.default = default
+        self._rules: List[_Rule] = []
+        self._suffixes: Dict[str, List[int]] = {}
+        self._unconditional: List[int] = []
+        patterns: List[str] = []
+        self._pattern_rules: List[int] = []
+        # Matcher of each pattern, and the positions of those left out of the
+        # combined pattern
+        self._matchers: List[Callable[[str], Any]] = []
+        self._standalone: List[int] = []
+        self.categories: List[str] = []
+        spec: List[Any] = [default]
+
+        for rule in rules:
+            fields = _rule_fields(rule)
+            spec.append(fields)
+            self._add_rule(
+                fields["category"],
+                fields.get("extensions") or (),
+                fields.get("patterns") or (),
+                fields.get("regex") or (),
+                fields.get("min_size"),
+                fields.get("max_size"),
+                patterns,
+            )
+
+        for category, extensions in categories.items():
+            spec.append([category, list(extensions)])
+            self._add_rule(category, extensions, (), (), None, None, patterns)
+
+        # Identifies the rules, e.g. to tell whether cached categories are still valid
+        self.key = hashlib.sha1(
+            json.dumps(spec, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        if default not in self.categories:
+            self.categories.append(default)
+
+        # Longest multi-part suffix determines how many dots are inspected
+        self._max_parts = max((suffix.count(".") + 1 for suffix in self._suffixes), default=1)
+
+        # One alternation for the other patterns; the first matching group wins
+        combined = [f"(?P<r{i}>{p})" for i, p in enumerate(patterns) if i not in self._standalone]
+        try:
+            self._pattern = re.compile("|".join(combined), re.IGNORECASE) if combined else None
+        except re.error:
+            # E.g. two regexes naming a group alike: check every pattern on its own
+            self._pattern = None
+            self._standalone = list(range(len(patterns)))
+
+    def _add_rule(
+        self,
+        category: str,
+        extensions: Iterable[str],
+        globs: Iterable[str],
+        regexes: Iterable[str],
+        min_size: Optional[int],
+        max_size: Optional[int],
+        patterns: List[str],
+    ) -> None:
+        """Compile one rule into the lookup structures."""
+        index = len(self._rules)
+        self._rules.append(_Rule(category, min_size, max_size))
+        if category not in self.categories:
+            # Keep the default category last
+            position = len(self.categories)
+            if self.default in self.categories:
+                position = self.categories.index(self.default)
+            self.categories.insert(position, category)
+
+        has_matcher = False
+        for extension in extensions:
+            suffix = extension.lower().lstrip(".")
+            self._suffixes.setdefault(suffix, []).append(index)
+            has_matcher = True
+
+        for glob in globs:
+            pattern = fnmatch.translate(glob)
+            patterns.append(pattern)
+            self._matchers.append(re.compile(pattern, re.IGNORECASE).match)
+            self._pattern_rules.append(index)
+            has_matcher = True
+
+        for regex in regexes:
+            try:
+                compiled = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid regex {regex!r} for category {category!r}: {e}") from e
+            # Regex rules match anywhere in the name, like re.search
+            pattern = f".*?(?:{regex})"
+            try:
+                re.compile(pattern)
+                combinable = not (compiled.groups and _NUMBERED_REFERENCE.search(regex))
+            except re.error:
+                # Inline global flags such as (?i) must start the pattern
+                combinable = False
+            if not combinable:
+                self._standalone.append(len(patterns))
+            patterns.append(pattern)
+            self._matchers.append(compiled.search)
+            self._pattern_rules.append(index)
+            has_matcher = True
+
+        if not has_matcher:
+            # Only size bounds: applies to every file
+            self._unconditional.append(index)
+
+    def _suffix_matches(self, name: str) -> List[int]:
+        """Return the indices of rules whose extension matches name."""
+        # Leading dots belong to the name (".bashrc" has no extension)
+        parts = name.lower().lstrip(".").rsplit(".", self._max_parts)
+        if len(parts) == 1:
+            return []
+        if len(parts) == 2:
+            return self._suffixes.get(parts[1], [])
+        matches: List[int] = []
+        for k in range(1, len(parts)):
+            matches.extend(self._suffixes.get(".".join(parts[k:]), ()))
+        return matches
+
+    def classify(self, name: str, size: Optional[int] = None) -> str:
+        """
+        Determine the category of a file.
+
+        Args:
+            name: File name
+            size: File size in bytes (needed for rules with size bounds)
+
+        Returns:
+            Category name
+        """
+        best: Optional[int] = None
+
+        for index in self._suffix_matches(name):
+            if (best is None or index < best) and self._rules[index].accepts(size):
+                best = index
+
+        if self._pattern_rules:
+            first = len(self._pattern_rules)
+            if self._pattern is not None:
+                match = self._pattern.match(name)
+                if match is not None:
+                    first = int(match.lastgroup[1:])  # type: ignore[index]
+            if first < len(self._pattern_rules) or self._standalone:
+                best = self._best_pattern_rule(name, size, first, best)
+
+        for index in self._unconditional:
+            if best is not None and index > best:
+                break
+            if self._rules[index].accepts(size):
+                best = index
+                break
+
+        return self._rules[best].category if best is not None else self.default
+
+    def _best_pattern_rule(
+        self, name: str, size: Optional[int], first: int, best: Optional[int]
+    ) -> Optional[int]:
+        """Pick the first matching pattern rule that also accepts size."""
+        # Combined patterns before first did not match; standalone ones may have
+        candidates = itertools.chain(
+            (position for position in self._standalone if position < first),
+            range(first, len(self._pattern_rules)),
+        )
+        for position in candidates:
+            index = self._pattern_rules[position]
+            if best is not None and index > best:
+                break
+            # The combined pattern already matched the first alternative;
+            # later ones (only needed if its size bounds failed) are re-checked
+            if position != first and not self._matchers[position](name):
+                continue
+            if self._rules[index].accepts(size):
+                return index
+        return best
+
+    def classify_extension(self, extension: str) -> str:
+        """
+        Determine the category for a bare extension (without the dot).
+
+        Args:
+            extension: File extension
+
+        Returns:
+            Category name
+        """
+        for index in self._suffixes.get(extension.lower().lstrip("."), ()):
+            if self._rules[index].accepts(None):
+                return self._rules[index].category
+        return self.default
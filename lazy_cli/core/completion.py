@@ -0,0 +1,338 @@
+"""
+Cached shell completion.
+
+Typer's own completion builds the whole CLI on every TAB press. Instead,
+completion data (commands, options and their choices) is precomputed from
+the plugin manifest into ``~/.lazy-cli/completion.json``. A completion
+request implements Typer's protocol (``_LAZY_COMPLETE=complete_<shell>``)
+by reading only that file; it is validated with one directory listing of
+the plugins folder plus a stat of each ``sys.path`` entry, and rebuilt from
+the manifest only when a plugin was added, removed or edited.
+
+This module only depends on the standard library and does not import the
+manifest module unless the cache has to be rebuilt.
+"""
+
+import json
+import os
+import re
+import shlex
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from lazy_cli.main import APP_OPTIONS
+
+COMPLETION_CACHE_VERSION = 2
+PLUGINS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plugins")
+
+
+def _option_entry(usage: str, help_text: str) -> Dict[str, Any]:
+    """Completion entry of an option from its help usage, e.g. "--trace FILE"."""
+    parts = usage.split(", ")
+    return {
+        "flags": [part.split(" ")[0] for part in parts],
+        "help": help_text,
+        # A metavar after the flag means it takes a value
+        "is_flag": not any(" " in part for part in parts),
+    }
+
+
+# Top-level options of the lazy command, from the list its help prints
+TOP_LEVEL_OPTIONS = [_option_entry(usage, help_text) for usage, help_text in APP_OPTIONS]
+
+HELP_OPTION = {"flags": ["--help"], "help": "Show this message and exit.", "is_flag": True}
+
+
+def get_completion_cache_path() -> str:
+    """
+    Get the path to the completion cache.
+
+    Returns:
+        Path to the cache file (~/.lazy-cli/completion.json)
+    """
+    return os.path.join(os.path.expanduser("~"), ".lazy-cli", "completion.json")
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+def _fingerprint() -> List[Any]:
+    """
+    Fingerprint everything the completion data is derived from.
+
+    Covers each plugin file's name, mtime and size, and the mtime of every
+    sys.path directory (which changes when entry-point packages are installed).
+    """
+    plugins = []
+    try:
+        with os.scandir(PLUGINS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".py") and not entry.name.startswith("_"):
+                    st = entry.stat()
+                    plugins.append([entry.name, st.st_mtime_ns, st.st_size])
+    except OSError:
+        pass
+    plugins.sort()
+
+    site = []
+    for path in sys.path:
+        try:
+            site.append([path, os.stat(path or ".").st_mtime_ns])
+        except OSError:
+            continue
+
+    return [COMPLETION_CACHE_VERSION, plugins, site]
+
+
+def _completion_entry(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce plugin (or subcommand) metadata to what completion needs."""
+    return {
+        "help": metadata.get("help", ""),
+        "options": list(metadata.get("options", [])) + [HELP_OPTION],
+        "arguments": metadata.get("arguments", []),
+        "commands": {
+            name: _completion_entry(sub) for name, sub in (metadata.get("commands") or {}).items()
+        },
+    }
+
+
+def build_completion_table(plugins: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the completion table for the whole CLI.
+
+    Args:
+        plugins: Plugin metadata from the manifest
+
+    Returns:
+        Root command entry with top-level options and one entry per plugin
+    """
+    return {
+        "help": "",
+        "options": TOP_LEVEL_OPTIONS,
+        "arguments": [],
+        "commands": {
+            plugin["name"]: _completion_entry(plugin)
+            for plugin in plugins
+            if plugin.get("name") and not plugin.get("error")
+        },
+    }
+
+
+def load_completion_table(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the completion table, rebuilding the cache if plugins changed.
+
+    Args:
+        path: Cache file path (defaults to get_completion_cache_path())
+
+    Returns:
+        Root command entry as built by build_completion_table()
+    """
+    path = path or get_completion_cache_path()
+    fingerprint = _fingerprint()
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            return cached["table"]
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    from lazy_cli.core.manifest import load_manifest
+
+    table = build_completion_table(load_manifest())
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "table": table}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Completion still works, it just rebuilds next time
+        pass
+
+    return table
+
+
+# ============================================================================
+# Completion
+# ============================================================================
+def _split(text: str) -> List[str]:
+    """Split a command line like a shell, tolerating unfinished quotes."""
+    try:
+        return shlex.split(text)
+    except ValueError:
+        return text.split()
+
+
+def _get_args(shell: str) -> Tuple[List[str], str]:
+    """
+    Read the words being completed from the environment.
+
+    Args:
+        shell: Shell name (bash, zsh, fish, powershell or pwsh)
+
+    Returns:
+        Tuple of (complete words after the program name, incomplete word)
+    """
+    if shell == "bash":
+        cwords = _split(os.environ.get("COMP_WORDS", ""))
+        cword = int(os.environ.get("COMP_CWORD", "0") or 0)
+        args = cwords[1:cword]
+        incomplete = cwords[cword] if cword < len(cwords) else ""
+        return args, incomplete
+
+    completion_args = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+    cwords = _split(completion_args)
+
+    if shell in ("powershell", "pwsh"):
+        incomplete = os.environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+        return (cwords[1:-1] if incomplete else cwords[1:]), incomplete
+
+    args = cwords[1:]
+    if args and not completion_args.endswith(" "):
+        return args[:-1], args[-1]
+    return args, ""
+
+
+def _find_option(command: Dict[str, Any], flag: str) -> Optional[Dict[str, Any]]:
+    """Find the option of a command that owns flag."""
+    flag = flag.split("=", 1)[0]
+    for option in command["options"]:
+        if flag in option["flags"]:
+            return option
+    return None
+
+
+def get_completions(
+    table: Dict[str, Any], args: List[str], incomplete: str
+) -> List[Tuple[str, str]]:
+    """
+    Compute completion candidates.
+
+    Args:
+        table: Completion table from load_completion_table()
+        args: Complete words after the program name
+        incomplete: Word being completed
+
+    Returns:
+        List of (value, help) pairs matching the incomplete word
+    """
+    command = table
+    pending_option: Optional[Dict[str, Any]] = None
+    positionals = 0
+
+    for arg in args:
+        if pending_option is not None:
+            pending_option = None
+        elif arg.startswith("-"):
+            option = _find_option(command, arg)
+            if option is not None and not option.get("is_flag") and "=" not in arg:
+                pending_option = option
+        elif positionals == 0 and arg in command["commands"]:
+            command = command["commands"][arg]
+        else:
+            positionals += 1
+
+    if pending_option is not None:
+        candidates = [(str(choice), "") for choice in pending_option.get("choices") or []]
+    elif incomplete.startswith("-"):
+        candidates = [
+            (flag, option.get("help", ""))
+            for option in command["options"]
+            for flag in option["flags"]
+        ]
+    elif command["commands"] and positionals == 0:
+        candidates = [(name, sub["help"]) for name, sub in sorted(command["commands"].items())]
+    elif positionals < len(command["arguments"]):
+        argument = command["arguments"][positionals]
+        candidates = [(str(choice), "") for choice in argument.get("choices") or []]
+    else:
+        candidates = []
+
+    # No candidates lets the shell fall back to completing paths
+    return [(value, text) for value, text in candidates if value.startswith(incomplete)]
+
+
+def format_completions(shell: str, items: List[Tuple[str, str]]) -> str:
+    """
+    Format completion candidates the way Typer's completion scripts expect.
+
+    Args:
+        shell: Shell name
+        items: List of (value, help) pairs
+
+    Returns:
+        Text to write to stdout
+    """
+    if shell == "bash":
+        return "\n".join(value for value, _ in items)
+
+    if shell == "zsh":
+
+        def escape(s: str) -> str:
+            return (
+                s.replace('"', '""')
+                .replace("'", "''")
+                .replace("$", "\\$")
+                .replace("`", "\\`")
+                .replace(":", r"\\:")
+            )
+
+        if not items:
+            return "_files"
+        lines = [
+            f'"{escape(value)}":"{escape(text)}"' if text else f'"{escape(value)}"'
+            for value, text in items
+        ]
+        return "_arguments '*: :((" + "\n".join(lines) + "))'"
+
+    if shell == "fish":
+        return "\n".join(
+            value + "\t" + re.sub(r"\s", " ", text) if text else value for value, text in items
+        )
+
+    # powershell / pwsh
+    return "\n".join(f"{value}:::{text or ' '}" for value, text in items)
+
+
+def complete(shell: str) -> int:
+    """
+    Answer a shell completion request.
+
+    Args:
+        shell: Shell name taken from ``_LAZY_COMPLETE=complete_<shell>``
+
+    Returns:
+        Exit code
+    """
+    args, incomplete = _get_args(shell)
+    items = get_completions(load_completion_table(), args, incomplete)
+
+    if shell == "fish":
+        action = os.environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if action == "is-args":
+            # Exit 0 enables argument completion, 1 lets fish complete files
+            return 0 if items else 1
+
+    output = format_completions(shell, items)
+    if output:
+        print(output)
+    return 0
+
+
+def main() -> None:
+    """
+    Standalone completion entry point (``lazy-complete``).
+
+    Reads the same environment variables as ``lazy`` and answers from the
+    cache without importing anything outside the standard library.
+    """
+    shell = os.environ.get("_LAZY_COMPLETE", "complete_bash")
+    sys.exit(complete(shell[len("complete_") :] if shell.startswith("complete_") else shell))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,44 @@
 """
 Configuration management for lazy-cli.
 Handles reading and writing user configuration files.
+
+The parsed configuration is cached for the whole process and only parsed
+again when the file's mtime or size changes, so reading values in a loop
+costs one stat() per call. Reading never writes: a missing file simply
+means the defaults. Writes go through update_config(), which saves once,
+atomically, however many values are changed.
 """
 
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional, Tuple
 import yaml
 from pydantic import BaseModel, Field
 
+# Use the libyaml parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class CategoryRule(BaseModel):
+    """A user-defined categorization rule for the organize command."""
+
+    category: str = Field(description="Folder the matching files are moved into")
+    extensions: list[str] = Field(
+        default_factory=list,
+        description="Extensions without the dot, including multi-part ones like 'tar.gz'",
+    )
+    patterns: list[str] = Field(
+        default_factory=list, description="Glob patterns matched against the file name"
+    )
+    regex: list[str] = Field(
+        default_factory=list, description="Regular expressions searched in the file name"
+    )
+    min_size: Optional[int] = Field(default=None, description="Minimum size in bytes")
+    max_size: Optional[int] = Field(default=None, description="Maximum size in bytes")
+
 
 class LazyConfig(BaseModel):
     """Configuration model for lazy-cli."""
@@ -26,6 +57,10 @@ class LazyConfig(BaseModel):
     )
     
     # Plugin-specific settings
+    organize_rules: list[CategoryRule] = Field(
+        default_factory=list,
+        description="Custom organize rules, checked in order before the built-in categories",
+    )
     stock_watchlist: list[str] = Field(
         default_factory=list,
         description="Stock symbols to watch"
@@ -43,60 +78,124 @@ def get_config_path() -> Path:
     Returns:
         Path to the config file (~/.lazy-cli/config.yaml)
     """
-    config_dir = Path.home() / ".lazy-cli"
-    config_dir.mkdir(exist_ok=True)
-    return config_dir / "config.yaml"
+    return Path.home() / ".lazy-cli" / "config.yaml"
+
+
+# Process-wide cache: (path, (mtime, size) of the file or None, parsed config)
+_cache: Optional[Tuple[Path, Optional[Tuple[int, int]], LazyConfig]] = None
+_lock = threading.RLock()
+
+
+def _signature(config_path: Path) -> Optional[Tuple[int, int]]:
+    """Identify a version of the config file by mtime and size (None if missing)."""
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached_config() -> LazyConfig:
+    """Get the shared config instance, parsing the file only if it changed."""
+    global _cache
+    config_path = get_config_path()
+    signature = _signature(config_path)
+    cache = _cache
+    if cache is not None and cache[0] == config_path and cache[1] == signature:
+        return cache[2]
+
+    with _lock:
+        config = LazyConfig()
+        if signature is not None:
+            try:
+                with open(config_path, "r") as f:
+                    config_data = yaml.load(f, Loader=_YAML_LOADER) or {}
+                config = LazyConfig(**config_data)
+            except Exception as e:
+                print(f"Warning: Could not load config: {e}")
+        # A broken file is cached too, so the warning is printed once per change
+        _cache = (config_path, signature, config)
+        return config
 
 
 def load_config() -> LazyConfig:
     """
-    Load configuration from file or create default.
+    Load configuration from file, or the defaults if there is none.
     
     Returns:
-        LazyConfig instance
+        LazyConfig instance (a copy the caller may modify)
     """
-    config_path = get_config_path()
-    
-    if config_path.exists():
-        try:
-            with open(config_path, "r") as f:
-                config_data = yaml.safe_load(f) or {}
-            return LazyConfig(**config_data)
-        except Exception as e:
-            print(f"Warning: Could not load config: {e}")
-            return LazyConfig()
-    
-    # Create default config
-    config = LazyConfig()
-    save_config(config)
-    return config
+    return _cached_config().model_copy(deep=True)
 
 
 def save_config(config: LazyConfig) -> None:
     """
     Save configuration to file.
     
+    The file is written to a temporary file and renamed into place, so
+    readers never see a partial config.
+
     Args:
         config: LazyConfig instance to save
     """
+    global _cache
     config_path = get_config_path()
+    tmp_path = config_path.with_name(f"{config_path.name}.{os.getpid()}.tmp")
     
     try:
-        with open(config_path, "w") as f:
-            yaml.safe_dump(
-                config.model_dump(exclude_none=True),
-                f,
-                default_flow_style=False,
-                sort_keys=False,
-            )
+        with _lock:
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                yaml.dump(
+                    config.model_dump(mode="json", exclude_none=True),
+                    f,
+                    Dumper=_YAML_DUMPER,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
+            os.replace(tmp_path, config_path)
+            _cache = (config_path, _signature(config_path), config.model_copy(deep=True))
     except Exception as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
         print(f"Warning: Could not save config: {e}")
 
 
+@contextmanager
+def update_config() -> Iterator[LazyConfig]:
+    """
+    Change several configuration values and save them once.
+
+    Usage:
+        with update_config() as config:
+            config.verbose = True
+            config.stock_watchlist.append("AAPL")
+
+    The changes are validated and written atomically when the block exits;
+    if it raises, nothing is written.
+
+    Yields:
+        LazyConfig instance to modify
+
+    Raises:
+        ValueError: If the changed values are invalid
+    """
+    with _lock:
+        config = load_config()
+        yield config
+        # Attribute assignment is not validated by pydantic: validate the result
+        save_config(LazyConfig(**dict(config)))
+
+
 def get_config_value(key: str, default: Any = None) -> Any:
     """
     Get a single configuration value.
     
+    Reads from the process-wide cache; the returned value is shared and
+    must not be modified (use update_config() to change it).
+
     Args:
         key: Configuration key
         default: Default value if key not found
@@ -104,8 +203,7 @@ def get_config_value(key: str, default: Any = None) -> Any:
     Returns:
         Configuration value or default
     """
-    config = load_config()
-    return getattr(config, key, default)
+    return getattr(_cached_config(), key, default)
 
 
 def set_config_value(key: str, value: Any) -> None:
@@ -116,6 +214,5 @@ def set_config_value(key: str, value: Any) -> None:
         key: Configuration key
         value: Value to set
     """
-    config = load_config()
-    setattr(config, key, value)
-    save_config(config)
+    with update_config() as config:
+        setattr(config, key, value)
@@ -0,0 +1,200 @@
+"""
+File deletion executor shared by file-oriented plugins.
+
+Deleting a large tree is dominated by ``unlink`` system calls, which release
+the GIL and, on network or busy filesystems, wait on the server. Paths are
+therefore grouped into batches and each batch is unlinked by a worker
+thread: one task per few hundred files keeps the pool overhead negligible,
+while several batches in flight keep the filesystem busy.
+
+The directories files were deleted from are remembered, so the ones left
+empty can be removed afterwards, deepest first, without listing the tree
+again.
+
+As with MoveExecutor, completion callbacks always run on the thread that
+submits deletions.
+"""
+
+import errno
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from lazy_cli.core.trace import tracer
+
+# Number of threads unlinking files
+DEFAULT_DELETE_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Files unlinked per task
+DELETE_BATCH_SIZE = 256
+
+# rmdir() errors meaning "not empty (any more)" or "already gone"
+KEPT_DIRECTORY_ERRORS = (errno.ENOTEMPTY, errno.EEXIST, errno.ENOENT)
+
+DeleteCallback = Callable[[str, Optional[OSError]], None]
+
+# Errors of a batch: (index in the batch, error)
+_BatchErrors = List[Tuple[int, OSError]]
+
+
+def _unlink_batch(paths: List[str]) -> _BatchErrors:
+    """Unlink a batch of files, collecting failures instead of stopping."""
+    errors: _BatchErrors = []
+    with tracer.span("unlink_batch", files=len(paths)):
+        for index, path in enumerate(paths):
+            try:
+                os.unlink(path)
+            except OSError as e:
+                errors.append((index, e))
+    tracer.count("unlink", len(paths) - len(errors))
+    return errors
+
+
+class DeleteExecutor:
+    """
+    Deletes files in batches on a thread pool.
+
+    Usage:
+        with DeleteExecutor(on_done=report) as deleter:
+            for record in expired:
+                deleter.submit(record.path, record.size)
+        deleter.remove_empty_directories(root)
+
+    Args:
+        on_done: Called as on_done(path, error) for every file, on the
+            submitting thread; error is None on success
+        workers: Number of unlinking threads
+        batch_size: Number of files per task
+    """
+
+    def __init__(
+        self,
+        on_done: DeleteCallback,
+        workers: Optional[int] = None,
+        batch_size: int = DELETE_BATCH_SIZE,
+    ) -> None:
+        self.on_done = on_done
+        self.workers = workers or DEFAULT_DELETE_WORKERS
+        self.batch_size = batch_size
+        self.max_pending = self.workers * 2
+        # Directories that had at least one file deleted
+        self.touched: Set[str] = set()
+        # Total size of the deleted files, as given to submit()
+        self.bytes_deleted = 0
+        self._batch: List[Tuple[str, int]] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict["Future[_BatchErrors]", List[Tuple[str, int]]] = {}
+
+    def __enter__(self) -> "DeleteExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, path: str, size: int = 0) -> None:
+        """
+        Delete a file (or symlink); directories are never deleted here.
+
+        Args:
+            path: File path
+            size: File size, added to bytes_deleted once the file is gone
+        """
+        self._batch.append((path, size))
+        if len(self._batch) >= self.batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Hand the current batch to the pool."""
+        if not self._batch:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="lazy-delete"
+            )
+        # Bound the number of batches in flight, and report finished ones early
+        if len(self._pending) >= self.max_pending:
+            self._collect(block=True)
+        batch, self._batch = self._batch, []
+        paths = [path for path, _ in batch]
+        self._pending[self._pool.submit(_unlink_batch, paths)] = batch
+        self._collect(block=False)
+
+    def _collect(self, block: bool) -> None:
+        """Report finished batches on the calling thread."""
+        if not self._pending:
+            return
+        done: Set["Future[_BatchErrors]"]
+        if block:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+        else:
+            done = {future for future in self._pending if future.done()}
+        for future in done:
+            batch = self._pending.pop(future)
+            errors = dict(future.result())
+            if errors:
+                tracer.count("delete_errors", len(errors))
+            for index, (path, size) in enumerate(batch):
+                error = errors.get(index)
+                if error is None:
+                    self.touched.add(os.path.dirname(path))
+                    self.bytes_deleted += size
+                self.on_done(path, error)
+
+    def close(self) -> None:
+        """Delete the remaining files and report them."""
+        self._flush_batch()
+        while self._pending:
+            self._collect(block=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def remove_empty_directories(
+        self,
+        root: str,
+        on_removed: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[str, OSError], None]] = None,
+    ) -> int:
+        """
+        Remove the directories left empty by the deletions, deepest first.
+
+        Only directories files were deleted from, and their ancestors up to
+        (but excluding) root, are tried; a directory that still holds
+        anything is kept.
+
+        Args:
+            root: Directory that is never removed
+            on_removed: Called with the path of each removed directory
+            on_error: Called with (path, error) when a removal fails for
+                another reason than the directory not being empty
+
+        Returns:
+            Number of directories removed
+        """
+        root = os.path.normpath(root)
+        prefix = os.path.join(root, "")
+        # Max-heap on depth, so children always go before their parents
+        heap = [(-path.count(os.sep), path) for path in self.touched if path.startswith(prefix)]
+        heapq.heapify(heap)
+        queued = set(self.touched)
+        removed = 0
+
+        while heap:
+            _, path = heapq.heappop(heap)
+            try:
+                os.rmdir(path)
+            except OSError as e:
+                if e.errno not in KEPT_DIRECTORY_ERRORS and on_error is not None:
+                    on_error(path, e)
+                continue
+            removed += 1
+            tracer.count("rmdir")
+            if on_removed is not None:
+                on_removed(path)
+            parent = os.path.dirname(path)
+            if parent.startswith(prefix) and parent not in queued:
+                queued.add(parent)
+                heapq.heappush(heap, (-parent.count(os.sep), parent))
+
+        return removed
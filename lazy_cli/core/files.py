@@ -0,0 +1,267 @@
+"""
+File scanning helpers shared by file-oriented plugins.
+
+Scanning is built on ``os.scandir``: the entry type comes from the directory
+listing itself, and each file is stat'ed exactly once. The result is kept in
+a FileRecord that later phases (preview tables, moves) reuse instead of
+calling ``stat()`` or ``exists()`` again.
+
+walk_files() lists whole trees with a thread pool. The directories next in
+depth-first order are listed ahead of the consumer, in parallel, but only
+within a fixed window, so memory stays bounded however large the tree is
+while results are still yielded in a fixed depth-first order.
+"""
+
+import fnmatch
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from lazy_cli.core.trace import tracer
+
+# Default number of threads used to list directories concurrently
+DEFAULT_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class FileRecord:
+    """
+    A scanned file together with the stat data of its directory entry.
+
+    Attributes:
+        path: Full path of the file (string)
+        name: File name
+        size: Size in bytes
+        mtime: Modification time in nanoseconds
+        inode: Inode number
+        device: Device number
+    """
+
+    __slots__ = ("path", "name", "size", "mtime", "inode", "device")
+
+    def __init__(self, path: str, name: str, stat: os.stat_result) -> None:
+        self.path = path
+        self.name = name
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+        self.inode = stat.st_ino
+        self.device = stat.st_dev
+
+    @classmethod
+    def from_entry(cls, entry: "os.DirEntry[str]") -> "FileRecord":
+        """Create a record from a directory entry (one stat at most)."""
+        return cls(entry.path, entry.name, entry.stat(follow_symlinks=False))
+
+    @classmethod
+    def from_values(
+        cls, path: str, name: str, size: int, mtime: int, inode: int, device: int
+    ) -> "FileRecord":
+        """Create a record from stored values (no stat)."""
+        record = cls.__new__(cls)
+        record.path = path
+        record.name = name
+        record.size = size
+        record.mtime = mtime
+        record.inode = inode
+        record.device = device
+        return record
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.path!r}, size={self.size})"
+
+
+def scan_files(directory: Union[Path, str], include_hidden: bool = False) -> Iterator[FileRecord]:
+    """
+    Yield the regular files directly inside a directory.
+
+    Directories are skipped using the type reported by the directory
+    listing, so they are never stat'ed.
+
+    Args:
+        directory: Directory to scan
+        include_hidden: Whether to include hidden files (starting with .)
+
+    Yields:
+        FileRecord for each file
+    """
+    tracer.count("scandir")
+    stats = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Skip directories
+                if entry.is_dir():
+                    continue
+
+                # Skip hidden files unless specified
+                if not include_hidden and entry.name.startswith("."):
+                    continue
+
+                stats += 1
+                yield FileRecord.from_entry(entry)
+    finally:
+        tracer.count("stat", stats)
+
+
+def list_names(directory: Union[Path, str]) -> Set[str]:
+    """
+    List the entry names of a directory once, for collision checks.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        Set of entry names (empty if the directory does not exist)
+    """
+    tracer.count("scandir")
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    """
+    Combine glob patterns into a single compiled regular expression.
+
+    Args:
+        patterns: Glob patterns (e.g. "*.tmp", "node_modules")
+
+    Returns:
+        Compiled pattern, or None if there are no patterns
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class _TreeWalker:
+    """Lists a directory tree concurrently; see walk_files()."""
+
+    def __init__(
+        self,
+        root: str,
+        include_hidden: bool,
+        max_depth: Optional[int],
+        exclude: Optional["re.Pattern[str]"],
+        skip_dirs: Set[str],
+        workers: int,
+    ) -> None:
+        self.root = root
+        self.prefix_length = len(os.path.join(root, ""))
+        self.include_hidden = include_hidden
+        self.max_depth = max_depth
+        self.exclude = exclude
+        self.skip_dirs = skip_dirs
+        self.workers = workers
+        # Directories listed ahead of the consumer
+        self.lookahead = workers * 2
+
+    def _excluded(self, entry: "os.DirEntry[str]") -> bool:
+        """Check an entry against the exclude globs (name or relative path)."""
+        if self.exclude is None:
+            return False
+        relative = entry.path[self.prefix_length :]
+        return bool(self.exclude.match(entry.name) or self.exclude.match(relative))
+
+    def _list(self, path: str, depth: int) -> Tuple[List[FileRecord], List[str]]:
+        """List one directory."""
+        files: List[FileRecord] = []
+        subdirs: List[str] = []
+
+        with tracer.span("list_directory", path=path), os.scandir(path) as entries:
+            for entry in entries:
+                if not self.include_hidden and entry.name.startswith("."):
+                    continue
+                if self._excluded(entry):
+                    continue
+                # Never follow directory symlinks, so cycles are impossible
+                if entry.is_dir(follow_symlinks=False):
+                    if self.max_depth is not None and depth >= self.max_depth:
+                        continue
+                    if entry.path not in self.skip_dirs:
+                        subdirs.append(entry.path)
+                elif not entry.is_dir():
+                    files.append(FileRecord.from_entry(entry))
+        tracer.count("scandir")
+        tracer.count("stat", len(files))
+
+        files.sort(key=lambda record: record.name)
+        subdirs.sort()
+        return files, subdirs
+
+    def walk(self, on_error: Optional[Callable[[str, OSError], None]]) -> Iterator[FileRecord]:
+        """Yield files in depth-first order, listing the next directories ahead."""
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lazy-walk")
+        futures: Dict[str, "Future[Tuple[List[FileRecord], List[str]]]"] = {}
+        # Directories still to visit; the next one is at the end
+        stack = [(self.root, 0)]
+        try:
+            while stack:
+                for path, depth in stack[-self.lookahead :]:
+                    if path not in futures:
+                        futures[path] = pool.submit(self._list, path, depth)
+
+                path, depth = stack.pop()
+                try:
+                    files, subdirs = futures.pop(path).result()
+                except OSError as e:
+                    if on_error is None:
+                        raise
+                    tracer.count("scan_errors")
+                    on_error(path, e)
+                    continue
+                yield from files
+                stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+        finally:
+            for future in futures.values():
+                future.cancel()
+            pool.shutdown(wait=True)
+
+
+def walk_files(
+    directory: Union[Path, str],
+    include_hidden: bool = False,
+    max_depth: Optional[int] = None,
+    exclude: Iterable[str] = (),
+    skip_dirs: Iterable[Union[Path, str]] = (),
+    workers: Optional[int] = None,
+    on_error: Optional[Callable[[str, OSError], None]] = None,
+) -> Iterator[FileRecord]:
+    """
+    Recursively yield the files of a directory tree, listing it in parallel.
+
+    Directories are listed concurrently by a thread pool, but files are
+    yielded in a deterministic depth-first order (sorted by name within each
+    directory), so repeated runs over the same tree produce the same output.
+    Directory symlinks are not followed.
+
+    Args:
+        directory: Root directory
+        include_hidden: Whether to include hidden files and directories
+        max_depth: Maximum depth to descend (0 = only the root; None = no limit)
+        exclude: Glob patterns matched against entry names and paths relative
+            to the root; matching files and directories are skipped
+        skip_dirs: Directories that are never descended into
+        workers: Number of listing threads
+        on_error: Called with (path, error) for unreadable directories; if
+            None, the error is raised
+
+    Yields:
+        FileRecord for each file
+    """
+    walker = _TreeWalker(
+        os.fspath(directory),
+        include_hidden,
+        max_depth,
+        compile_globs(exclude),
+        {os.fspath(d) for d in skip_dirs},
+        workers or DEFAULT_WALK_WORKERS,
+    )
+    return walker.walk(on_error)
@@ -0,0 +1,276 @@
+"""
+File hashing shared by file-oriented plugins.
+
+Every requested digest is computed in one read pass: each chunk is read
+once, with ``readinto`` into a reusable buffer, and fed to all hashers
+through a memoryview, so no bytes objects are created per chunk. Files are
+read rather than memory-mapped: a file truncated while it is mapped
+crashes the process with SIGBUS, which a tool run over live trees must not
+risk, while the extra copy of a read is small next to the hashing itself.
+
+hash_files() hashes many files on a thread pool (hashlib releases the GIL
+while hashing), keeping a bounded window of files in flight and yielding
+results in input order.
+
+HashCache remembers digests in SQLite (``~/.lazy-cli/hashes.db``) keyed by
+(device, inode, size, mtime), so hashing an unchanged file again costs one
+lookup. A digest is only cached if the file still had the scanned size and
+mtime after it was read.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from lazy_cli.core.files import FileRecord
+from lazy_cli.core.trace import tracer
+
+DEFAULT_ALGORITHM = "sha256"
+
+# Algorithms offered by the checksum plugin, in display order
+ALGORITHMS = ("md5", "sha1", "sha256", "sha512", "blake2b", "blake2s", "sha3_256")
+
+# Bytes read per chunk: large enough for few syscalls, small enough that a
+# chunk stays in cache while several hashers go over it
+CHUNK_SIZE = 1024 * 1024
+
+# Number of threads hashing files concurrently
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Cached digests written between two commits
+COMMIT_INTERVAL = 1000
+
+Digests = Dict[str, str]
+
+_buffers = threading.local()
+
+
+def check_algorithms(names: Iterable[str]) -> List[str]:
+    """
+    Normalize and validate algorithm names.
+
+    Args:
+        names: Algorithm names, any case (e.g. "SHA256", "md5")
+
+    Returns:
+        Lowercase names without duplicates, in the given order
+
+    Raises:
+        ValueError: If an algorithm is not supported
+    """
+    algorithms: List[str] = []
+    for name in names:
+        lowered = name.lower()
+        # Accept spellings like "SHA-256" and "sha3-256"
+        for candidate in (lowered, lowered.replace("-", ""), lowered.replace("-", "_")):
+            if candidate in ALGORITHMS:
+                break
+        else:
+            raise ValueError(f"Unsupported algorithm: {name} (choose from {', '.join(ALGORITHMS)})")
+        if candidate not in algorithms:
+            algorithms.append(candidate)
+    return algorithms
+
+
+def _buffer() -> memoryview:
+    """This thread's reusable read buffer."""
+    view = getattr(_buffers, "view", None)
+    if view is None:
+        view = _buffers.view = memoryview(bytearray(CHUNK_SIZE))
+    return view
+
+
+def hash_file(path: Union[Path, str], algorithms: Iterable[str]) -> Digests:
+    """
+    Compute several digests of a file in one read pass.
+
+    Args:
+        path: File to hash
+        algorithms: Algorithm names (see ALGORITHMS)
+
+    Returns:
+        Dictionary of algorithm -> hex digest
+    """
+    return _hash(os.fspath(path), list(algorithms))[0]
+
+
+def _hash(path: str, algorithms: List[str]) -> Tuple[Digests, Tuple[int, int]]:
+    """Hash a file; also return its (size, mtime) as of the end of the read."""
+    hashers = [hashlib.new(name) for name in algorithms]
+    view = _buffer()
+    total = 0
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            count = f.readinto(view)
+            if not count:
+                break
+            chunk = view[:count]
+            for hasher in hashers:
+                hasher.update(chunk)
+            total += count
+        st = os.fstat(f.fileno())
+    tracer.count("bytes_hashed", total)
+    digests = {name: hasher.hexdigest() for name, hasher in zip(algorithms, hashers)}
+    return digests, (st.st_size, st.st_mtime_ns)
+
+
+def get_hash_cache_path() -> Path:
+    """
+    Get the path to the digest cache.
+
+    Returns:
+        Path to the cache database (~/.lazy-cli/hashes.db)
+    """
+    return Path.home() / ".lazy-cli" / "hashes.db"
+
+
+class HashCache:
+    """
+    Digests stored by (device, inode, size, mtime).
+
+    Args:
+        path: Database file (default: ~/.lazy-cli/hashes.db)
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None) -> None:
+        self.path = Path(path) if path is not None else get_hash_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            " device INTEGER NOT NULL, inode INTEGER NOT NULL,"
+            " size INTEGER NOT NULL, mtime INTEGER NOT NULL,"
+            " algorithm TEXT NOT NULL, digest TEXT NOT NULL,"
+            " PRIMARY KEY (device, inode, algorithm)) WITHOUT ROWID"
+        )
+        self._uncommitted = 0
+        self.hits = 0
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def get(self, record: FileRecord, algorithms: List[str]) -> Optional[Digests]:
+        """
+        Look up the digests of an unchanged file.
+
+        Args:
+            record: Scanned file
+            algorithms: Algorithms needed
+
+        Returns:
+            Dictionary of algorithm -> hex digest, or None unless all are cached
+        """
+        digests = dict(
+            self._db.execute(
+                "SELECT algorithm, digest FROM digests"
+                " WHERE device = ? AND inode = ? AND size = ? AND mtime = ?",
+                (record.device, record.inode, record.size, record.mtime),
+            ).fetchall()
+        )
+        if not all(name in digests for name in algorithms):
+            return None
+        self.hits += 1
+        return {name: digests[name] for name in algorithms}
+
+    def put(self, record: FileRecord, digests: Digests) -> None:
+        """
+        Remember the digests of a file (replacing those of an older version).
+
+        Args:
+            record: Scanned file
+            digests: Dictionary of algorithm -> hex digest
+        """
+        self._db.executemany(
+            "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (record.device, record.inode, record.size, record.mtime, name, digest)
+                for name, digest in digests.items()
+            ],
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_INTERVAL:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit pending digests and close the database."""
+        self._db.commit()
+        self._db.close()
+
+
+HashResult = Tuple[FileRecord, Optional[Digests], Optional[OSError]]
+
+# A result waiting in hash_files(): digests from the cache, or a running hash
+_Pending = Union[Digests, "Future[Tuple[Digests, Tuple[int, int]]]"]
+
+
+def hash_files(
+    records: Iterable[FileRecord],
+    algorithms: Iterable[str],
+    workers: Optional[int] = None,
+    cache: Optional[HashCache] = None,
+) -> Iterator[HashResult]:
+    """
+    Hash many files in parallel, in one read pass per file.
+
+    Args:
+        records: Files to hash, e.g. from walk_files()
+        algorithms: Algorithm names (see ALGORITHMS)
+        workers: Number of hashing threads
+        cache: Digest cache to consult and fill
+
+    Yields:
+        Tuples of (record, digests, error) in input order; digests is None
+        if the file could not be read, and error says why
+    """
+    algorithms = list(algorithms)
+    workers = workers or DEFAULT_HASH_WORKERS
+    # Results in input order
+    window: Deque[Tuple[FileRecord, _Pending]] = deque()
+
+    def finish(record: FileRecord, pending: _Pending) -> HashResult:
+        if isinstance(pending, dict):
+            return record, pending, None
+        try:
+            digests, signature = pending.result()
+        except OSError as e:
+            tracer.count("hash_errors")
+            return record, None, e
+        if cache is not None and signature == (record.size, record.mtime):
+            cache.put(record, digests)
+        return record, digests, None
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lazy-hash") as pool:
+        try:
+            for record in records:
+                cached = cache.get(record, algorithms) if cache is not None else None
+                if cached is not None:
+                    window.append((record, cached))
+                else:
+                    window.append((record, pool.submit(_hash, record.path, algorithms)))
+                # Keep a bounded number of files in flight
+                while len(window) > workers * 4 or (window and _ready(window[0][1])):
+                    yield finish(*window.popleft())
+            while window:
+                yield finish(*window.popleft())
+        finally:
+            for _, pending in window:
+                if not isinstance(pending, dict):
+                    pending.cancel()
+
+
+def _ready(pending: _Pending) -> bool:
+    """Check whether a window entry can be yielded without waiting."""
+    return isinstance(pending, dict) or pending.done()
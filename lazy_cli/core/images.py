@@ -0,0 +1,248 @@
+"""
+Image resizing shared by image plugins.
+
+Pillow is an optional dependency (the ``plugins`` extra). It is imported
+by the functions that decode images, so this module, and the size
+arithmetic in it, can be imported without it.
+
+Camera JPEGs are never decoded at full size when they are shrunk:
+``Image.draft`` makes the JPEG decoder scale by 1/2, 1/4 or 1/8 while
+decoding (DCT scaling), down to the smallest scale still at least
+REDUCING_GAP times the target, and ``resize`` then shrinks by an integer
+factor with ``Image.reduce`` before the final Lanczos pass. For large
+reductions this decodes and filters a fraction of the pixels.
+
+resize_images() spreads images over a process pool with one worker per
+available core. Each worker opens, resizes and saves its image itself, so
+no pixel data crosses process boundaries: only the file names go in and
+the output size comes back. Each output is encoded straight into a
+temporary file next to its target and renamed into place, so an
+interrupted run never leaves a truncated image under the final name.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from lazy_cli.core.trace import tracer
+
+# Worker processes: one per core this process may run on
+if hasattr(os, "sched_getaffinity"):
+    DEFAULT_RESIZE_WORKERS = len(os.sched_getaffinity(0))
+else:
+    DEFAULT_RESIZE_WORKERS = os.cpu_count() or 1
+
+# Extensions of the images that are resized
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif", ".tif", ".tiff"}
+
+# JPEG and WebP quality of the outputs
+DEFAULT_QUALITY = 85
+
+# Reduced-size decoding and integer reduction stop at this multiple of the
+# target size, leaving enough pixels for the final filter (as in thumbnail())
+REDUCING_GAP = 2.0
+
+Size = Tuple[int, int]
+
+# Results of resize_images(): (source, destination, output size, error)
+ResizeResult = Tuple[str, str, Optional[Size], Optional[str]]
+
+# EXIF orientation tag, and the transposition that undoes each orientation
+_ORIENTATION = 0x0112
+_TRANSPOSE = {
+    2: "FLIP_LEFT_RIGHT",
+    3: "ROTATE_180",
+    4: "FLIP_TOP_BOTTOM",
+    5: "TRANSPOSE",
+    6: "ROTATE_270",
+    7: "TRANSVERSE",
+    8: "ROTATE_90",
+}
+
+# Orientations stored with width and height swapped
+_ROTATED = {5, 6, 7, 8}
+
+# Modes JPEG can store; others (alpha, palette) are converted to RGB
+_JPEG_MODES = {"RGB", "L", "CMYK"}
+
+
+def is_image(name: str) -> bool:
+    """Whether a file name has one of IMAGE_EXTENSIONS."""
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def target_size(
+    size: Size,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    percent: Optional[float] = None,
+    keep_aspect: bool = True,
+) -> Size:
+    """
+    Compute the size of a resized image.
+
+    Args:
+        size: Current (width, height)
+        width: Target width
+        height: Target height
+        percent: Scale in percent (takes precedence over width and height)
+        keep_aspect: With both width and height, fit the image inside them
+            instead of stretching it to exactly that size
+
+    Returns:
+        New (width, height), at least 1x1
+
+    Raises:
+        ValueError: If no width, height or percentage is given
+    """
+    current_width, current_height = size
+    if percent is not None:
+        scale = percent / 100
+    elif width and height:
+        if not keep_aspect:
+            return width, height
+        scale = min(width / current_width, height / current_height)
+    elif width:
+        scale = width / current_width
+    elif height:
+        scale = height / current_height
+    else:
+        raise ValueError("Give a width, a height or a percentage")
+    return max(1, round(current_width * scale)), max(1, round(current_height * scale))
+
+
+def resize_image(
+    source: str,
+    destination: str,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    percent: Optional[float] = None,
+    keep_aspect: bool = True,
+    quality: int = DEFAULT_QUALITY,
+) -> Size:
+    """
+    Resize one image, honoring its EXIF orientation.
+
+    Args:
+        source: Image file
+        destination: Output file; its extension sets the format
+        width, height, percent, keep_aspect: Target size (see target_size())
+        quality: JPEG and WebP quality (1-95)
+
+    Returns:
+        Size of the written image
+
+    Raises:
+        OSError: If the image cannot be read or written (including files
+            Pillow does not recognize)
+        ValueError: If no size is given or the output format is unknown
+    """
+    from PIL import Image
+
+    extension = os.path.splitext(destination)[1].lower()
+    output_format = Image.registered_extensions().get(extension)
+    if output_format is None:
+        raise ValueError(f"Unknown image format: {extension or destination}")
+
+    with Image.open(source) as image:
+        orientation = image.getexif().get(_ORIENTATION, 1)
+        rotated = orientation in _ROTATED
+        stored_width, stored_height = image.size
+
+        shown = (stored_height, stored_width) if rotated else (stored_width, stored_height)
+        new_width, new_height = target_size(shown, width, height, percent, keep_aspect)
+        stored = (new_height, new_width) if rotated else (new_width, new_height)
+
+        # JPEGs are decoded directly at a reduced scale (a no-op for other formats)
+        image.draft(None, (int(stored[0] * REDUCING_GAP), int(stored[1] * REDUCING_GAP)))
+        with tracer.span("resize_image"):
+            resized = image.resize(stored, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        icc_profile = image.info.get("icc_profile")
+
+    if orientation in _TRANSPOSE:
+        resized = resized.transpose(getattr(Image.Transpose, _TRANSPOSE[orientation]))
+    if output_format == "JPEG" and resized.mode not in _JPEG_MODES:
+        resized = resized.convert("RGB")
+
+    options: Dict[str, Any] = {"quality": quality}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+
+    tmp_path = f"{destination}.{os.getpid()}.tmp"
+    try:
+        resized.save(tmp_path, output_format, **options)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return resized.size
+
+
+def _resize_job(
+    source: str, destination: str, spec: Dict[str, Any]
+) -> Tuple[Optional[Size], Optional[str]]:
+    """Resize an image in a worker, returning (size, None) or (None, error message)."""
+    from PIL import Image
+
+    try:
+        return resize_image(source, destination, **spec), None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        return None, getattr(e, "strerror", None) or str(e)
+
+
+def resize_images(
+    jobs: Iterable[Tuple[str, str]],
+    workers: Optional[int] = None,
+    **spec: Any,
+) -> Iterator[ResizeResult]:
+    """
+    Resize many images in parallel worker processes.
+
+    Args:
+        jobs: (source, destination) pairs
+        workers: Number of worker processes (1 = in this process)
+        **spec: Size and quality arguments of resize_image()
+
+    Yields:
+        (source, destination, size, error) in completion order; size is
+        None if the image could not be resized, and error says why
+    """
+    workers = workers or DEFAULT_RESIZE_WORKERS
+
+    if workers <= 1:
+        for source, destination in jobs:
+            size, error = _resize_job(source, destination, spec)
+            yield source, destination, size, error
+        return
+
+    pending: Dict["Future[Tuple[Optional[Size], Optional[str]]]", Tuple[str, str]] = {}
+
+    def finished(block: bool) -> Iterator[ResizeResult]:
+        if block:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        else:
+            done = {future for future in pending if future.done()}
+        for future in done:
+            source, destination = pending.pop(future)
+            size, error = future.result()
+            yield source, destination, size, error
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for source, destination in jobs:
+                # Keep every worker busy, with a bounded number of images queued
+                if len(pending) >= workers * 2:
+                    yield from finished(block=True)
+                pending[pool.submit(_resize_job, source, destination, spec)] = (
+                    source,
+                    destination,
+                )
+                yield from finished(block=False)
+            while pending:
+                yield from finished(block=True)
+        finally:
+            for future in pending:
+                future.cancel()
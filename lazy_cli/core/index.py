@@ -0,0 +1,402 @@
+"""
+Persistent filesystem index.
+
+FileIndex keeps the listing of every directory it has scanned in a SQLite
+database (``~/.lazy-cli/index.db``): for each directory its mtime, device
+and subdirectories, and for each file its name, size, mtime, inode and
+category. A later walk stats each directory once and compares its mtime
+with the stored one; only directories whose mtime changed (entries added,
+removed or renamed) are listed again, everything else is answered from the
+database. A walk over a mostly unchanged tree therefore costs one stat per
+directory instead of one per file.
+
+Caveats:
+
+- A file modified in place does not change its directory's mtime, so its
+  stored size and mtime may be stale until its directory changes.
+- A directory whose mtime is very recent when it is listed is not trusted
+  on the next walk (it could still change within the same timestamp).
+- Categories are stored with the key of the CategoryEngine that produced
+  them; walking with different rules reclassifies the files once.
+
+Each directory's full listing is stored, whatever the filters of the walk
+that listed it, so walks with different filters share the index.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from lazy_cli.core.categories import CategoryEngine
+from lazy_cli.core.files import FileRecord, compile_globs
+from lazy_cli.core.trace import tracer
+
+SCHEMA_VERSION = 1
+
+# Directories listed between two commits
+COMMIT_INTERVAL = 500
+
+# Directories modified less than this many nanoseconds before they are
+# listed are listed again next time
+RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    id INTEGER PRIMARY KEY,
+    path BLOB NOT NULL UNIQUE,
+    parent INTEGER,
+    mtime INTEGER,
+    device INTEGER
+);
+CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+CREATE TABLE IF NOT EXISTS files (
+    directory INTEGER NOT NULL,
+    name BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    category TEXT,
+    PRIMARY KEY (directory, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_SUBTREE = """
+WITH RECURSIVE tree(id) AS (
+    SELECT ? UNION ALL SELECT directories.id FROM directories JOIN tree ON parent = tree.id
+)
+"""
+
+# (name, size, mtime, inode, category)
+_FileRow = Tuple[str, int, int, int, Optional[str]]
+
+
+def get_index_path() -> Path:
+    """
+    Get the path to the filesystem index.
+
+    Returns:
+        Path to the index database (~/.lazy-cli/index.db)
+    """
+    return Path.home() / ".lazy-cli" / "index.db"
+
+
+class FileIndex:
+    """
+    Directory listings cached in SQLite, refreshed by directory mtime.
+
+    Usage:
+        with FileIndex() as index:
+            for record, category in index.categorized(directory, engine):
+                ...
+
+    Args:
+        path: Database file (default: ~/.lazy-cli/index.db)
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None) -> None:
+        self.path = Path(path) if path is not None else get_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Walks may run on a prefetch thread; only one thread uses it at a time
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS directories; DROP TABLE IF EXISTS files;"
+                "DROP TABLE IF EXISTS meta;" + _SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+        # Directories listed from disk and answered from the index
+        self.stats = {"listed": 0, "reused": 0}
+        self._uncommitted = 0
+
+    def __enter__(self) -> "FileIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    # Public walks
+    # ------------------------------------------------------------------
+    def files(
+        self,
+        directory: Union[Path, str],
+        include_hidden: bool = False,
+        max_depth: Optional[int] = None,
+        exclude: Iterable[str] = (),
+        skip_dirs: Iterable[Union[Path, str]] = (),
+        on_error: Optional[Callable[[str, OSError], None]] = None,
+    ) -> Iterator[FileRecord]:
+        """
+        Yield the files of a directory tree, like walk_files(), from the index.
+
+        Args:
+            directory: Root directory
+            include_hidden: Whether to include hidden files and directories
+            max_depth: Maximum depth to descend (0 = only the root; None = no limit)
+            exclude: Glob patterns matched against entry names and paths
+                relative to the root
+            skip_dirs: Directories that are never descended into
+            on_error: Called with (path, error) for unreadable directories; if
+                None, the error is raised
+
+        Yields:
+            FileRecord for each file
+        """
+        for record, _ in self._walk(
+            directory, include_hidden, max_depth, exclude, skip_dirs, on_error, None
+        ):
+            yield record
+
+    def categorized(
+        self,
+        directory: Union[Path, str],
+        engine: CategoryEngine,
+        include_hidden: bool = False,
+        max_depth: Optional[int] = None,
+        exclude: Iterable[str] = (),
+        skip_dirs: Iterable[Union[Path, str]] = (),
+        on_error: Optional[Callable[[str, OSError], None]] = None,
+    ) -> Iterator[Tuple[FileRecord, str]]:
+        """
+        Yield the files of a directory tree with their stored category.
+
+        Files are only classified when they are new, or when the engine's
+        rules differ from the ones the stored categories came from.
+
+        Args:
+            directory: Root directory
+            engine: Category engine to classify with
+            include_hidden: Whether to include hidden files and directories
+            max_depth: Maximum depth to descend (0 = only the root; None = no limit)
+            exclude: Glob patterns matched against entry names and paths
+                relative to the root
+            skip_dirs: Directories that are never descended into
+            on_error: Called with (path, error) for unreadable directories; if
+                None, the error is raised
+
+        Yields:
+            Tuples of (FileRecord, category)
+        """
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'categories'").fetchone()
+        if row is None or row[0] != engine.key:
+            # Stored categories came from other rules
+            self._db.execute("UPDATE files SET category = NULL")
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('categories', ?)",
+                (engine.key,),
+            )
+            self._db.commit()
+        for record, category in self._walk(
+            directory, include_hidden, max_depth, exclude, skip_dirs, on_error, engine
+        ):
+            yield record, category or ""
+
+    # ------------------------------------------------------------------
+    # Walking
+    # ------------------------------------------------------------------
+    def _walk(
+        self,
+        directory: Union[Path, str],
+        include_hidden: bool,
+        max_depth: Optional[int],
+        exclude: Iterable[str],
+        skip_dirs: Iterable[Union[Path, str]],
+        on_error: Optional[Callable[[str, OSError], None]],
+        engine: Optional[CategoryEngine],
+    ) -> Iterator[Tuple[FileRecord, Optional[str]]]:
+        """Depth-first walk answering unchanged directories from the index."""
+        root = os.path.abspath(directory)
+        prefix_length = len(os.path.join(root, ""))
+        exclude_pattern = compile_globs(exclude)
+        skip = {os.path.abspath(d) for d in skip_dirs}
+
+        def wanted(path: str, name: str) -> bool:
+            if not include_hidden and name.startswith("."):
+                return False
+            if exclude_pattern is None:
+                return True
+            return not (exclude_pattern.match(name) or exclude_pattern.match(path[prefix_length:]))
+
+        stack = [(root, 0)]
+        try:
+            while stack:
+                path, depth = stack.pop()
+                try:
+                    dir_id, device, rows, subdirs = self._directory(path, engine)
+                except OSError as e:
+                    if on_error is None:
+                        raise
+                    tracer.count("scan_errors")
+                    on_error(path, e)
+                    continue
+
+                for name, size, mtime, inode, category in rows:
+                    file_path = os.path.join(path, name)
+                    if wanted(file_path, name):
+                        record = FileRecord.from_values(file_path, name, size, mtime, inode, device)
+                        yield record, category
+
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for subdir in reversed(subdirs):
+                    if subdir not in skip and wanted(subdir, os.path.basename(subdir)):
+                        stack.append((subdir, depth + 1))
+        finally:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def _directory(
+        self, path: str, engine: Optional[CategoryEngine]
+    ) -> Tuple[int, int, List[_FileRow], List[str]]:
+        """
+        Get one directory's files and subdirectories, listing it only if it changed.
+
+        Returns:
+            Tuple of (directory id, device, file rows sorted by name,
+            subdirectory paths sorted)
+        """
+        encoded = os.fsencode(path)
+        tracer.count("stat")
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._forget(encoded)
+            raise
+
+        row = self._db.execute(
+            "SELECT id, mtime, device FROM directories WHERE path = ?", (encoded,)
+        ).fetchone()
+        if row is not None and row[1] == st.st_mtime_ns and row[2] == st.st_dev:
+            self.stats["reused"] += 1
+            dir_id = row[0]
+            rows = self._stored_files(dir_id, engine)
+            subdirs = [
+                os.fsdecode(subdir)
+                for (subdir,) in self._db.execute(
+                    "SELECT path FROM directories WHERE parent = ? ORDER BY path", (dir_id,)
+                )
+            ]
+            return dir_id, st.st_dev, rows, subdirs
+
+        self.stats["listed"] += 1
+        if row is None:
+            dir_id = self._db.execute(
+                "INSERT INTO directories (path) VALUES (?)", (encoded,)
+            ).lastrowid
+        else:
+            dir_id = row[0]
+        rows, subdirs = self._list(path, dir_id, engine)
+
+        # A directory changed within the timestamp granularity may change again
+        # without its mtime moving: do not trust it next time
+        mtime: Optional[int] = st.st_mtime_ns
+        if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+            mtime = None
+        self._db.execute(
+            "UPDATE directories SET mtime = ?, device = ? WHERE id = ?",
+            (mtime, st.st_dev, dir_id),
+        )
+
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_INTERVAL:
+            self._db.commit()
+            self._uncommitted = 0
+        return dir_id, st.st_dev, rows, subdirs
+
+    def _stored_files(self, dir_id: int, engine: Optional[CategoryEngine]) -> List[_FileRow]:
+        """Read a directory's files, classifying those without a category."""
+        rows = [
+            (os.fsdecode(name), size, mtime, inode, category)
+            for name, size, mtime, inode, category in self._db.execute(
+                "SELECT name, size, mtime, inode, category FROM files"
+                " WHERE directory = ? ORDER BY name",
+                (dir_id,),
+            )
+        ]
+        if engine is None:
+            return rows
+
+        updates = []
+        for position, (name, size, mtime, inode, category) in enumerate(rows):
+            if category is None:
+                category = engine.classify(name, size)
+                rows[position] = (name, size, mtime, inode, category)
+                updates.append((category, dir_id, os.fsencode(name)))
+        if updates:
+            self._db.executemany(
+                "UPDATE files SET category = ? WHERE directory = ? AND name = ?", updates
+            )
+        return rows
+
+    def _list(
+        self, path: str, dir_id: int, engine: Optional[CategoryEngine]
+    ) -> Tuple[List[_FileRow], List[str]]:
+        """List a directory from disk and replace its stored listing."""
+        rows: List[_FileRow] = []
+        subdirs: List[str] = []
+        tracer.count("scandir")
+        with tracer.span("list_directory", path=path), os.scandir(path) as entries:
+            for entry in entries:
+                # Never follow directory symlinks, so cycles are impossible
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif not entry.is_dir():
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    category = engine.classify(entry.name, st.st_size) if engine else None
+                    rows.append((entry.name, st.st_size, st.st_mtime_ns, st.st_ino, category))
+        rows.sort()
+        subdirs.sort()
+        tracer.count("stat", len(rows))
+
+        self._db.execute("DELETE FROM files WHERE directory = ?", (dir_id,))
+        self._db.executemany(
+            "INSERT INTO files (directory, name, size, mtime, inode, category)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(dir_id, os.fsencode(name), *values) for name, *values in rows],
+        )
+        self._sync_subdirs(dir_id, subdirs)
+        return rows, subdirs
+
+    def _sync_subdirs(self, dir_id: int, subdirs: List[str]) -> None:
+        """Make the stored subdirectories of a directory match a fresh listing."""
+        current: Set[bytes] = {os.fsencode(subdir) for subdir in subdirs}
+        stored: Dict[bytes, int] = dict(
+            self._db.execute("SELECT path, id FROM directories WHERE parent = ?", (dir_id,))
+        )
+        for encoded, child_id in stored.items():
+            if encoded not in current:
+                self._forget_id(child_id)
+        self._db.executemany(
+            "INSERT INTO directories (path, parent) VALUES (?, ?)"
+            " ON CONFLICT (path) DO UPDATE SET parent = excluded.parent",
+            [(encoded, dir_id) for encoded in current if encoded not in stored],
+        )
+
+    def _forget(self, encoded: bytes) -> None:
+        """Drop a directory that no longer exists, with everything below it."""
+        row = self._db.execute("SELECT id FROM directories WHERE path = ?", (encoded,)).fetchone()
+        if row is not None:
+            self._forget_id(row[0])
+
+    def _forget_id(self, dir_id: int) -> None:
+        self._db.execute(
+            _SUBTREE + "DELETE FROM files WHERE directory IN (SELECT id FROM tree)", (dir_id,)
+        )
+        self._db.execute(
+            _SUBTREE + "DELETE FROM directories WHERE id IN (SELECT id FROM tree)", (dir_id,)
+        )
@@ -0,0 +1,629 @@
+"""
+Streaming JSON formatting and validation.
+
+Documents are never loaded whole. The input is read in blocks, and each
+value that fits in the block being read is parsed by the C decoder of the
+json module (``raw_decode``) and written re-formatted straight away; only
+the brackets, commas and keys of containers too large for a block go
+through a small Python state machine. Memory therefore stays bounded by a
+few blocks however large the file is, while nearly all the parsing runs at
+C speed. Formatting uses orjson when it is installed.
+
+With sort_keys the members of an object have to be reordered before it can
+be written: the members of each open large object are kept as formatted
+text until it closes, so memory is bounded by the largest object rather
+than by the document.
+
+Errors are reported as ``json.JSONDecodeError`` with the line and column of
+the first error, like ``json.loads``. As with ``json.tool``, values are
+re-serialized, so numbers are written in their canonical form.
+
+JSON Lines input is split into blocks of whole lines that are parsed and
+re-serialized in parallel worker processes.
+"""
+
+import codecs
+import json
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, BinaryIO, Callable, Deque, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters read at once; values up to this size are parsed in one call
+READ_SIZE = 1024 * 1024
+
+# Characters of output buffered before a write
+WRITE_SIZE = 1024 * 1024
+
+# Bytes of JSON Lines handed to a worker at once
+JSONL_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Longest number or literal: a value ending closer than this to the end of
+# the buffer may continue in the next block
+_SHORT_TOKEN = 64
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# A string valid so far, maybe cut off by the end of the buffer; and a whole one
+_OPEN_STRING = re.compile(
+    r'"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*'
+    r"(?:\\(?:u[0-9a-fA-F]{0,3})?)?"
+)
+_STRING = re.compile(r'"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"')
+
+# Parser states: what may come next
+_VALUE = 0  # a value (document start, after ":" or "," in an array)
+_FIRST_ITEM = 1  # a value or "]" (after "[")
+_FIRST_KEY = 2  # a key or "}" (after "{")
+_KEY = 3  # a key (after "," in an object)
+_COLON = 4  # ":" (after a key)
+_NEXT = 5  # "," or the closing bracket (after a value in a container)
+_DONE = 6  # nothing (after the top-level value)
+
+_EXPECTING = {
+    _VALUE: "Expecting value",
+    _FIRST_ITEM: "Expecting value",
+    _FIRST_KEY: "Expecting property name enclosed in double quotes",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _NEXT: "Expecting ',' delimiter",
+    _DONE: "Extra data",
+}
+
+
+def decode_error(
+    message: str, line: int, column: int, offset: Optional[int] = None
+) -> json.JSONDecodeError:
+    """
+    Build a JSONDecodeError for a position in a stream.
+
+    Args:
+        message: What is wrong
+        line: Line number (from 1)
+        column: Column number (from 1)
+        offset: Character offset in the stream, if known
+
+    Returns:
+        JSONDecodeError whose message ends with the position, like json.loads
+    """
+    error = json.JSONDecodeError(message, "", 0)
+    error.lineno, error.colno = line, column
+    position = f"{message}: line {line} column {column}"
+    if offset is not None:
+        error.pos = offset
+        position += f" (char {offset})"
+    error.args = (position,)
+    return error
+
+
+class Utf8Reader:
+    """
+    Text stream decoding a binary stream as strict UTF-8.
+
+    Unlike a text file, it reports invalid bytes as a JSONDecodeError with
+    their line, column and byte offset, so they read like any other error
+    of the document.
+
+    Args:
+        raw: Binary stream to decode
+    """
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        # Bytes read, lines and characters since the last newline returned
+        self._offset = 0
+        self._lines = 0
+        self._column = 0
+
+    def read(self, size: int = -1) -> str:
+        """Read and decode up to size bytes ("" only at the end)."""
+        while True:
+            pending = self._decoder.getstate()[0]
+            data = self.raw.read(size)
+            try:
+                text = self._decoder.decode(data, final=not data)
+            except UnicodeDecodeError as e:
+                # The decoder reports positions in its pending bytes plus data
+                self._advance(e.object[: e.start].decode("utf-8"))
+                offset = self._offset - len(pending) + e.start
+                raise decode_error(
+                    f"Invalid UTF-8 at byte {offset} ({e.reason})",
+                    self._lines + 1,
+                    self._column + 1,
+                ) from None
+            self._offset += len(data)
+            # Bytes of an incomplete character decode to nothing yet
+            if text or not data:
+                self._advance(text)
+                return text
+
+    def _advance(self, text: str) -> None:
+        newlines = text.count("\n")
+        if newlines:
+            self._lines += newlines
+            self._column = len(text) - text.rfind("\n") - 1
+        else:
+            self._column += len(text)
+
+
+def _reject_constant(name: str) -> None:
+    """Reject NaN and Infinity, which are not JSON."""
+    raise ValueError(f"Invalid literal {name}")
+
+
+_DECODER = json.JSONDecoder(parse_constant=_reject_constant)
+
+# Marks a value too large to be parsed from the buffer in one piece
+_TOO_LARGE = object()
+
+
+class _Reader:
+    """A text stream read in blocks, with the position of every character."""
+
+    def __init__(self, stream: TextIO, read_size: int = READ_SIZE) -> None:
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Position of the buffer start in the stream
+        self.offset = 0
+        self.lines = 0
+        self.column = 0
+
+    def fill(self) -> bool:
+        """Drop the consumed text and read the next block; False at the end."""
+        block = self.stream.read(self.read_size)
+        if not block:
+            self.eof = True
+            return False
+        consumed = self.buffer[: self.pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self.lines += newlines
+            self.column = len(consumed) - consumed.rfind("\n") - 1
+        else:
+            self.column += len(consumed)
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def decode(self) -> Any:
+        """
+        Parse the value at pos with the C decoder.
+
+        Returns:
+            The value, or _TOO_LARGE if it does not fit in a block
+        """
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Maybe only cut off by the end of the buffer
+                remaining = len(self.buffer) - self.pos
+                if not self.eof and remaining < max(self.read_size, _SHORT_TOKEN):
+                    self.fill()
+                    continue
+                if not self.eof:
+                    return _TOO_LARGE
+                raise self.error(e.msg, e.pos) from None
+            except ValueError as e:
+                # NaN, Infinity, or an integer with too many digits
+                raise self.error(str(e), self.pos) from None
+            if end > len(self.buffer) - _SHORT_TOKEN and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def string(self) -> str:
+        """Read the string at pos (a key, or a very long value), as written."""
+        while True:
+            match = _STRING.match(self.buffer, self.pos)
+            if match is not None:
+                # Complete once its closing quote is read, even as the last character
+                self.pos = match.end()
+                return match.group()
+            # Read on only while the string is valid up to the end of the buffer
+            partial = _OPEN_STRING.match(self.buffer, self.pos)
+            if partial.end() < len(self.buffer) or self.eof:
+                raise self.error("Unterminated string or invalid character", self.pos)
+            self.fill()
+
+    def error(self, message: str, position: int) -> json.JSONDecodeError:
+        """An error at a position of the buffer."""
+        newlines = self.buffer.count("\n", 0, position)
+        if newlines:
+            column = position - self.buffer.rfind("\n", 0, position)
+        else:
+            column = self.column + position + 1
+        return decode_error(message, self.lines + newlines + 1, column, self.offset + position)
+
+
+class _Writer:
+    """Buffered text output."""
+
+    def __init__(self, stream: Optional[TextIO]) -> None:
+        self.stream = stream
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= WRITE_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts and self.stream is not None:
+            self.stream.write("".join(self.parts))
+        self.parts = []
+        self.size = 0
+
+
+def _dumper(indent: Optional[int], sort_keys: bool) -> Callable[[Any], str]:
+    """Build the function serializing a parsed value (at depth 0)."""
+    separators = (",", ": ") if indent is not None else (",", ":")
+
+    def dumps(value: Any) -> str:
+        return json.dumps(
+            value, indent=indent, separators=separators, sort_keys=sort_keys, ensure_ascii=False
+        )
+
+    if orjson is None or indent not in (None, 2):
+        return dumps
+
+    option = (orjson.OPT_INDENT_2 if indent == 2 else 0) | (
+        orjson.OPT_SORT_KEYS if sort_keys else 0
+    )
+
+    def fast_dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, option=option).decode("utf-8")
+        except TypeError:
+            # Integers beyond 64 bits
+            return dumps(value)
+
+    return fast_dumps
+
+
+class _SortedObject:
+    """An open object whose members are kept until it closes (sort_keys)."""
+
+    __slots__ = ("members", "key", "parts")
+
+    def __init__(self) -> None:
+        self.members: List[Tuple[str, str]] = []
+        self.key = ""
+        self.parts: List[str] = []
+
+    def end_member(self) -> None:
+        """Store the member written since the last key."""
+        self.members.append((json.loads(self.key), "".join(self.parts)))
+        # Cleared in place: the parser appends through parts.append
+        self.parts.clear()
+
+
+def format_stream(
+    source: TextIO,
+    destination: Optional[TextIO],
+    indent: Optional[int] = 2,
+    sort_keys: bool = False,
+    read_size: int = READ_SIZE,
+) -> None:
+    """
+    Validate a JSON document and write it re-formatted, both while reading.
+
+    Args:
+        source: Text stream with one JSON document
+        destination: Where the formatted document goes (None only validates)
+        indent: Spaces per level, or None to minify
+        sort_keys: Whether to sort object members by key
+        read_size: Characters read at once
+
+    Raises:
+        json.JSONDecodeError: At the first error, with its line and column;
+            the output written so far ends there
+    """
+    reader = _Reader(source, read_size)
+    output = _Writer(destination)
+    validate_only = destination is None
+    dumps = _dumper(indent, sort_keys)
+    emit: Callable[[str], None] = output.write
+
+    colon = ": " if indent is not None else ":"
+    step = " " * indent if indent is not None else None
+
+    def newline(depth: int) -> str:
+        return "\n" + step * depth if step is not None else ""
+
+    # Open large containers: True for objects
+    stack: List[bool] = []
+    # With sort_keys: the open large objects and the emit function of each level
+    objects: List[_SortedObject] = []
+    emitters: List[Callable[[str], None]] = []
+    state = _VALUE
+
+    while True:
+        char = reader.peek()
+        if state == _DONE:
+            if char:
+                raise reader.error(_EXPECTING[state], reader.pos)
+            break
+
+        if state in (_VALUE, _FIRST_ITEM):
+            if char == "]" and state == _FIRST_ITEM:
+                reader.pos += 1
+                stack.pop()
+                emit("]")
+                state = _NEXT if stack else _DONE
+                continue
+
+            if state == _FIRST_ITEM:
+                emit(newline(len(stack)))
+
+            if not char:
+                raise reader.error(_EXPECTING[state], reader.pos)
+            value = reader.decode()
+
+            if value is not _TOO_LARGE:
+                if not validate_only:
+                    text = dumps(value)
+                    if stack and step:
+                        text = text.replace("\n", newline(len(stack)))
+                    emit(text)
+                state = _NEXT if stack else _DONE
+                continue
+
+            if char not in "[{":
+                # A string larger than a block (numbers and literals are short)
+                if char != '"':
+                    raise reader.error(_EXPECTING[state], reader.pos)
+                emit(reader.string())
+                state = _NEXT if stack else _DONE
+                continue
+
+            # A large container: go through it piece by piece
+            reader.pos += 1
+            if char == "{":
+                stack.append(True)
+                state = _FIRST_KEY
+                if sort_keys:
+                    sorted_object = _SortedObject()
+                    objects.append(sorted_object)
+                    emitters.append(emit)
+                    emit = sorted_object.parts.append
+                    continue
+            else:
+                stack.append(False)
+                state = _FIRST_ITEM
+            emit(char)
+            continue
+
+        if state in (_FIRST_KEY, _KEY):
+            if char == "}" and state == _FIRST_KEY:
+                reader.pos += 1
+                stack.pop()
+                if sort_keys:
+                    emit = _close_sorted(objects.pop(), emitters, True, "", "")
+                else:
+                    emit("}")
+                state = _NEXT if stack else _DONE
+                continue
+            if char != '"':
+                raise reader.error(_EXPECTING[state], reader.pos)
+            # Written like the decoded values, e.g. "\u00e9" as "é"
+            key = json.dumps(json.loads(reader.string()), ensure_ascii=False)
+            if sort_keys:
+                objects[-1].key = key
+            elif state == _FIRST_KEY:
+                emit(newline(len(stack)))
+            emit(key)
+            state = _COLON
+            continue
+
+        if state == _COLON:
+            if char != ":":
+                raise reader.error(_EXPECTING[state], reader.pos)
+            reader.pos += 1
+            emit(colon)
+            state = _VALUE
+            continue
+
+        # state == _NEXT
+        if char == ",":
+            reader.pos += 1
+            if stack[-1]:
+                state = _KEY
+                if sort_keys:
+                    objects[-1].end_member()
+                    continue
+            else:
+                state = _VALUE
+            emit("," + newline(len(stack)))
+            continue
+
+        if not char or char not in "]}" or stack[-1] != (char == "}"):
+            raise reader.error(_EXPECTING[state], reader.pos)
+        reader.pos += 1
+        stack.pop()
+        if sort_keys and char == "}":
+            emit = _close_sorted(
+                objects.pop(), emitters, False, newline(len(stack) + 1), newline(len(stack))
+            )
+        else:
+            emit(newline(len(stack)) + char)
+        state = _NEXT if stack else _DONE
+
+    if not validate_only:
+        output.write("\n")
+        output.flush()
+
+
+def _close_sorted(
+    closed: _SortedObject,
+    emitters: List[Callable[[str], None]],
+    empty: bool,
+    inner: str,
+    outer: str,
+) -> Callable[[str], None]:
+    """Write a closed object's members in key order; return the parent's emit."""
+    emit = emitters.pop()
+    if empty:
+        emit("{}")
+        return emit
+    closed.end_member()
+    closed.members.sort(key=lambda member: member[0])
+    emit("{" + inner + ("," + inner).join(text for _, text in closed.members) + outer + "}")
+    return emit
+
+
+def _parse_line(line: bytes) -> Tuple[object, bool]:
+    """Parse one JSON Lines record; also say whether orjson can serialize it."""
+    if orjson is not None:
+        try:
+            return orjson.loads(line), True
+        except orjson.JSONDecodeError:
+            # orjson rejects integers beyond 64 bits; the json module does not
+            pass
+    return json.loads(line, parse_constant=_reject_constant), False
+
+
+def _dump_line(value: object, sort_keys: bool, fast: bool) -> bytes:
+    """Serialize one record compactly."""
+    if fast:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    return text.encode("utf-8")
+
+
+JsonlResult = Tuple[bytes, int, Optional[Tuple[int, int, str]]]
+
+
+def process_jsonl_chunk(
+    chunk: bytes, first_line: int, sort_keys: bool = False, validate_only: bool = False
+) -> JsonlResult:
+    """
+    Validate and re-serialize a block of JSON Lines.
+
+    Args:
+        chunk: Whole lines
+        first_line: Line number of the first line in the file
+        sort_keys: Whether to sort object members by key
+        validate_only: Whether to skip producing output
+
+    Returns:
+        Tuple of (output lines, number of records, first error as
+        (line, column, message) or None); output stops at the error
+    """
+    output: List[bytes] = []
+    records = 0
+    for number, line in enumerate(chunk.split(b"\n"), first_line):
+        if not line.strip():
+            continue
+        try:
+            value, fast = _parse_line(line)
+        except ValueError as e:
+            column = getattr(e, "colno", 1)
+            message = getattr(e, "msg", str(e))
+            return b"".join(output), records, (number, column, message)
+        records += 1
+        if not validate_only:
+            output.append(_dump_line(value, sort_keys, fast) + b"\n")
+    return b"".join(output), records, None
+
+
+def _jsonl_chunks(source: BinaryIO, chunk_size: int) -> Iterator[Tuple[bytes, int]]:
+    """Yield (block of whole lines, number of its first line)."""
+    line = 1
+    rest = b""
+    while True:
+        block = source.read(chunk_size)
+        if not block:
+            break
+        data = rest + block
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            rest = data
+            continue
+        chunk, rest = data[:cut], data[cut:]
+        yield chunk, line
+        line += chunk.count(b"\n")
+    if rest:
+        yield rest, line
+
+
+def format_jsonl(
+    source: BinaryIO,
+    destination: Optional[BinaryIO],
+    sort_keys: bool = False,
+    workers: int = 1,
+    chunk_size: int = JSONL_CHUNK_SIZE,
+) -> int:
+    """
+    Validate JSON Lines and write each record compactly, in parallel blocks.
+
+    Args:
+        source: Binary stream of JSON Lines
+        destination: Where the records go (None only validates)
+        sort_keys: Whether to sort object members by key
+        workers: Number of worker processes (1 = in this process)
+        chunk_size: Bytes handed to a worker at once
+
+    Returns:
+        Number of records
+
+    Raises:
+        json.JSONDecodeError: At the first invalid record; the records
+            before it have been written
+    """
+    validate_only = destination is None
+    records = 0
+
+    def collect(result: JsonlResult) -> None:
+        nonlocal records
+        output, count, error = result
+        records += count
+        if destination is not None and output:
+            destination.write(output)
+        if error is not None:
+            line, column, message = error
+            raise decode_error(message, line, column)
+
+    chunks = _jsonl_chunks(source, chunk_size)
+    if workers <= 1:
+        for chunk, line in chunks:
+            collect(process_jsonl_chunk(chunk, line, sort_keys, validate_only))
+        return records
+
+    # Results in input order, with a bounded number of blocks in flight
+    window: Deque["Future[JsonlResult]"] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for chunk, line in chunks:
+                window.append(
+                    pool.submit(process_jsonl_chunk, chunk, line, sort_keys, validate_only)
+                )
+                if len(window) > workers * 2:
+                    collect(window.popleft().result())
+            while window:
+                collect(window.popleft().result())
+        finally:
+            for future in window:
+                future.cancel()
+    return records
@@ -0,0 +1,466 @@
+"""
+Plugin manifest - static plugin metadata cached on disk.
+
+Plugin metadata (name, help, module path and options) is read from the
+plugin source with the ``ast`` module, so no plugin code is executed.
+Results are cached in ``~/.lazy-cli/plugins.json`` and each entry is
+invalidated by its file's mtime and size. Third-party plugins registered
+under the ``lazy_cli.plugins`` entry-point group are cached the same way.
+
+This module only depends on the standard library so that it can be used
+on the fast startup path without importing typer, rich or pydantic.
+"""
+
+import ast
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lazy_cli import __version__
+
+ENTRY_POINT_GROUP = "lazy_cli.plugins"
+MANIFEST_VERSION = 2
+PLUGINS_DIR = Path(__file__).parent.parent / "plugins"
+
+
+def get_manifest_path() -> Path:
+    """
+    Get the path to the plugin manifest cache.
+
+    Returns:
+        Path to the manifest file (~/.lazy-cli/plugins.json)
+    """
+    return Path.home() / ".lazy-cli" / "plugins.json"
+
+
+# ============================================================================
+# Static metadata extraction
+# ============================================================================
+def _literal(node: Optional[ast.AST], default: Any = None) -> Any:
+    """Evaluate a literal AST node, returning default if it is not a literal."""
+    if node is None:
+        return default
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, SyntaxError):
+        return default
+
+
+def _is_typer_call(node: ast.AST, name: str) -> bool:
+    """Check whether node is a call to typer.<name>(...) or <name>(...)."""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr == name
+    return isinstance(func, ast.Name) and func.id == name
+
+
+def _read_enums(tree: ast.Module) -> Dict[str, List[Any]]:
+    """
+    Collect the literal member values of module-level Enum classes.
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        Dictionary mapping class name to its member values
+    """
+    enums: Dict[str, List[Any]] = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = [
+            b.attr if isinstance(b, ast.Attribute) else getattr(b, "id", "") for b in node.bases
+        ]
+        if not any(base.endswith("Enum") for base in bases):
+            continue
+        values = [
+            _literal(item.value)
+            for item in node.body
+            if isinstance(item, ast.Assign) and _literal(item.value) is not None
+        ]
+        enums[node.name] = values
+    return enums
+
+
+def _annotation_choices(
+    annotation: Optional[ast.AST], enums: Dict[str, List[Any]]
+) -> Optional[List[Any]]:
+    """Return the allowed values of an Enum or Literal[...] annotation, if any."""
+    if isinstance(annotation, ast.Name):
+        return enums.get(annotation.id)
+    if isinstance(annotation, ast.Subscript):
+        name = annotation.value
+        name = name.attr if isinstance(name, ast.Attribute) else getattr(name, "id", "")
+        inner = annotation.slice
+        if isinstance(inner, ast.Index):  # Python < 3.9
+            inner = inner.value  # type: ignore[attr-defined]
+        if name == "Literal":
+            values = _literal(inner)
+            return list(values) if isinstance(values, tuple) else [values]
+        if name == "Optional":
+            return _annotation_choices(inner, enums)
+    return None
+
+
+def _read_parameters(
+    func: ast.FunctionDef, enums: Dict[str, List[Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Read the typer options and arguments declared by a command function.
+
+    Args:
+        func: Function definition node
+        enums: Module-level Enum values, as returned by _read_enums()
+
+    Returns:
+        Tuple of (options, arguments) metadata lists
+    """
+    options: List[Dict[str, Any]] = []
+    arguments: List[Dict[str, Any]] = []
+
+    args = func.args.args
+    defaults = [None] * (len(args) - len(func.args.defaults)) + list(func.args.defaults)
+
+    for arg, default in zip(args, defaults):
+        keywords = {}
+        if isinstance(default, ast.Call):
+            keywords = {kw.arg: kw.value for kw in default.keywords if kw.arg}
+
+        choices = _annotation_choices(arg.annotation, enums)
+        click_type = keywords.get("click_type")
+        if isinstance(click_type, ast.Call) and click_type.args:
+            choices = _literal(click_type.args[0]) or choices
+
+        if default is not None and _is_typer_call(default, "Argument"):
+            arguments.append(
+                {
+                    "name": arg.arg,
+                    "help": _literal(keywords.get("help"), ""),
+                    "choices": choices,
+                }
+            )
+            continue
+
+        if default is not None and _is_typer_call(default, "Option"):
+            flags = [_literal(a) for a in default.args[1:]]
+            flags = [f for f in flags if isinstance(f, str)]
+            initial = _literal(default.args[0]) if default.args else None
+        else:
+            flags = []
+            initial = _literal(default)
+
+        if not flags:
+            flags = ["--" + arg.arg.replace("_", "-")]
+
+        annotation = arg.annotation.id if isinstance(arg.annotation, ast.Name) else None
+        is_flag = annotation == "bool" or isinstance(initial, bool)
+        options.append(
+            {
+                "name": arg.arg,
+                "flags": flags,
+                "help": _literal(keywords.get("help"), ""),
+                "is_flag": is_flag,
+                "choices": choices,
+            }
+        )
+
+    return options, arguments
+
+
+def _command_name(func: ast.FunctionDef) -> Optional[str]:
+    """Return the command name if func is decorated with @<app>.command()."""
+    for decorator in func.decorator_list:
+        call = decorator if isinstance(decorator, ast.Call) else None
+        target = call.func if call else decorator
+        if isinstance(target, ast.Attribute) and target.attr == "command":
+            name = _literal(call.args[0]) if call and call.args else None
+            if call and name is None:
+                for kw in call.keywords:
+                    if kw.arg == "name":
+                        name = _literal(kw.value)
+            return name or func.name.replace("_", "-")
+    return None
+
+
+def read_plugin_metadata(plugin_file: Path, module: str) -> Dict[str, Any]:
+    """
+    Read plugin metadata from a source file without importing it.
+
+    Only literal top-level assignments of PLUGIN_NAME and PLUGIN_HELP are
+    recognised. Options and arguments are read from the ``typer.Option``
+    and ``typer.Argument`` defaults of the command functions; their choices
+    come from Enum/Literal annotations or a ``click_type=Choice([...])``.
+
+    Args:
+        plugin_file: Path to the plugin source file
+        module: Importable module name of the plugin
+
+    Returns:
+        Dictionary with plugin metadata; "name" is None if PLUGIN_NAME is missing
+    """
+    tree = ast.parse(plugin_file.read_text(encoding="utf-8"), filename=str(plugin_file))
+
+    enums = _read_enums(tree)
+    constants: Dict[str, Any] = {}
+    commands: Dict[str, Dict[str, Any]] = {}
+    main_func: Optional[ast.FunctionDef] = None
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and target.id in ("PLUGIN_NAME", "PLUGIN_HELP"):
+                constants[target.id] = _literal(node.value)
+        elif isinstance(node, ast.FunctionDef):
+            if node.name == "main":
+                main_func = node
+            command_name = _command_name(node)
+            if command_name:
+                options, arguments = _read_parameters(node, enums)
+                commands[command_name] = {
+                    "help": (ast.get_docstring(node) or "").strip().split("\n")[0],
+                    "options": options,
+                    "arguments": arguments,
+                }
+
+    # A single-command Typer app (or a bare main function) is the command itself
+    if len(commands) == 1:
+        top = next(iter(commands.values()))
+        commands = {}
+    elif not commands and main_func is not None:
+        options, arguments = _read_parameters(main_func, enums)
+        top = {"options": options, "arguments": arguments}
+    else:
+        top = {"options": [], "arguments": []}
+
+    return {
+        "name": constants.get("PLUGIN_NAME"),
+        "help": constants.get("PLUGIN_HELP") or "No description available",
+        "file": plugin_file.name,
+        "path": str(plugin_file),
+        "module": module,
+        "options": top["options"],
+        "arguments": top["arguments"],
+        "commands": commands,
+    }
+
+
+# ============================================================================
+# Discovery
+# ============================================================================
+def _stat_key(path: Path) -> Optional[List[int]]:
+    """Return [mtime_ns, size] for a file, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _find_module_file(module: str) -> Optional[Path]:
+    """
+    Locate the source file of a module on sys.path without importing it.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Path to the module's .py file (or package __init__.py), or None
+    """
+    parts = module.split(".")
+    for entry in sys.path:
+        base = Path(entry or ".").joinpath(*parts)
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def _site_fingerprint() -> List[List[Any]]:
+    """
+    Fingerprint the sys.path directories.
+
+    Installing or removing a distribution adds or removes its metadata
+    directory, which changes the mtime of the containing directory.
+    """
+    fingerprint = []
+    for entry in sys.path:
+        try:
+            st = os.stat(entry or ".")
+        except OSError:
+            continue
+        fingerprint.append([entry, st.st_mtime_ns])
+    return fingerprint
+
+
+def _scan_entry_points() -> List[Dict[str, str]]:
+    """
+    Scan installed distributions for lazy_cli.plugins entry points.
+
+    Returns:
+        List of dictionaries with "name" and "value" of each entry point
+    """
+    from importlib import metadata
+
+    eps = metadata.entry_points()
+    if hasattr(eps, "select"):
+        group = eps.select(group=ENTRY_POINT_GROUP)
+    else:  # Python < 3.10
+        group = eps.get(ENTRY_POINT_GROUP, [])
+    return sorted(({"name": ep.name, "value": ep.value} for ep in group), key=lambda e: e["name"])
+
+
+class PluginManifest:
+    """
+    On-disk cache of plugin metadata.
+
+    Usage:
+        manifest = PluginManifest()
+        plugins = manifest.plugins()
+    """
+
+    def __init__(self, path: Optional[Path] = None, plugins_dir: Optional[Path] = None) -> None:
+        self.path = path or get_manifest_path()
+        self.plugins_dir = plugins_dir or PLUGINS_DIR
+        self.data = self._read()
+        self.dirty = False
+
+    def _read(self) -> Dict[str, Any]:
+        """Read the manifest file, discarding it if stale or unreadable."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        if data.get("version") != MANIFEST_VERSION or data.get("lazy_cli") != __version__:
+            data = {}
+        data.setdefault("version", MANIFEST_VERSION)
+        data.setdefault("lazy_cli", __version__)
+        data.setdefault("files", {})
+        data.setdefault("entry_points", {})
+        return data
+
+    def save(self) -> None:
+        """Write the manifest atomically if it changed."""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            # The cache is an optimisation; a read-only home is not an error
+            pass
+
+    def _file_metadata(self, plugin_file: Path, module: str) -> Dict[str, Any]:
+        """Return cached metadata for a file, re-parsing it if it changed."""
+        key = str(plugin_file)
+        stat_key = _stat_key(plugin_file)
+        cached = self.data["files"].get(key)
+
+        if cached is not None and cached["stat"] == stat_key and cached["module"] == module:
+            return cached["metadata"]
+
+        try:
+            metadata = read_plugin_metadata(plugin_file, module)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            metadata = {
+                "name": None,
+                "file": plugin_file.name,
+                "path": key,
+                "module": module,
+                "error": str(e),
+            }
+
+        self.data["files"][key] = {"stat": stat_key, "module": module, "metadata": metadata}
+        self.dirty = True
+        return metadata
+
+    def _entry_points(self) -> List[Dict[str, str]]:
+        """Return the cached entry-point list, rescanning if sys.path changed."""
+        fingerprint = _site_fingerprint()
+        cached = self.data["entry_points"]
+
+        if cached.get("fingerprint") == fingerprint:
+            return cached["items"]
+
+        items = _scan_entry_points()
+        self.data["entry_points"] = {"fingerprint": fingerprint, "items": items}
+        self.dirty = True
+        return items
+
+    def plugins(self, include_entry_points: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get metadata for all plugins.
+
+        Args:
+            include_entry_points: Also include third-party entry-point plugins
+
+        Returns:
+            List of plugin metadata dictionaries; entries whose "name" is None
+            could not be read or lack PLUGIN_NAME
+        """
+        plugins = []
+        seen_files = set()
+
+        if self.plugins_dir.exists():
+            for plugin_file in sorted(self.plugins_dir.glob("*.py")):
+                # __init__.py, _template.py and private helpers are not plugins
+                if plugin_file.name.startswith("_"):
+                    continue
+                seen_files.add(str(plugin_file))
+                module = f"lazy_cli.plugins.{plugin_file.stem}"
+                plugins.append(self._file_metadata(plugin_file, module))
+
+        if include_entry_points:
+            for ep in self._entry_points():
+                module, _, attr = ep["value"].partition(":")
+                module = module.strip()
+                plugin_file = _find_module_file(module)
+                if plugin_file is None:
+                    metadata = {
+                        "name": ep["name"],
+                        "help": "No description available",
+                        "file": module,
+                        "module": module,
+                        "options": [],
+                        "arguments": [],
+                        "commands": {},
+                    }
+                else:
+                    seen_files.add(str(plugin_file))
+                    metadata = dict(self._file_metadata(plugin_file, module))
+                    metadata["name"] = metadata.get("name") or ep["name"]
+                metadata["entry_point"] = ep["name"]
+                if attr.strip():
+                    metadata["attr"] = attr.strip()
+                plugins.append(metadata)
+
+        # Forget files that no longer exist
+        for key in list(self.data["files"]):
+            if key not in seen_files:
+                del self.data["files"][key]
+                self.dirty = True
+
+        self.save()
+        return plugins
+
+
+def load_manifest(include_entry_points: bool = True) -> List[Dict[str, Any]]:
+    """
+    Get metadata for all plugins from the on-disk manifest cache.
+
+    Args:
+        include_entry_points: Also include third-party entry-point plugins
+
+    Returns:
+        List of plugin metadata dictionaries
+    """
+    return PluginManifest().plugins(include_entry_points)
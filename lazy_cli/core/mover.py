@@ -0,0 +1,214 @@
+"""
+File move executor shared by file-oriented plugins.
+
+Moves within one filesystem are a single atomic ``os.rename``. Moves across
+filesystems (where ``shutil.move`` silently falls back to copy + delete, one
+file at a time) are spread over a bounded thread pool and copied with the
+kernel's copy offload (``copy_file_range``, then ``sendfile``), so data does
+not pass through Python buffers. Each copy is written to a temporary name
+and renamed into place, so a destination never holds a partial file.
+
+Completion callbacks always run on the thread that submits moves, so callers
+can print and update statistics without locking.
+"""
+
+import errno
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from lazy_cli.core.trace import tracer
+
+# Number of threads copying files across filesystems
+DEFAULT_MOVE_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Chunk size for a single copy_file_range/sendfile call
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Suffix of the temporary file a cross-device copy is written to
+PARTIAL_SUFFIX = ".lazy-partial"
+
+# Errors meaning "this copy method does not work for these files"
+UNSUPPORTED_COPY_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+
+MoveCallback = Callable[[str, str, Optional[BaseException]], None]
+
+
+def _copy_with(copy: Callable[[int, int, int], int], src_fd: int, dst_fd: int) -> None:
+    """Copy from the current file positions with a kernel copy function until EOF."""
+    while copy(src_fd, dst_fd, COPY_CHUNK_SIZE) > 0:
+        pass
+
+
+def copy_file(source: str, destination: str) -> None:
+    """
+    Copy a file's contents using kernel copy offload where available.
+
+    Tries ``os.copy_file_range`` (Linux, can share extents or copy
+    server-side on network filesystems), then ``os.sendfile``, then a plain
+    buffered copy.
+
+    Args:
+        source: Source file path
+        destination: Destination file path (created or truncated)
+    """
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+
+        strategies = []
+        if hasattr(os, "copy_file_range"):
+            strategies.append(lambda s, d, n: os.copy_file_range(s, d, n))
+        if hasattr(os, "sendfile"):
+            strategies.append(lambda s, d, n: os.sendfile(d, s, None, n))
+
+        for strategy in strategies:
+            try:
+                _copy_with(strategy, src_fd, dst_fd)
+                break
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                    raise
+                # Not supported for this pair of files: restart with the next strategy
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        else:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+        if tracer.enabled:
+            tracer.count("bytes_copied", dst.tell())
+
+
+def move_across_devices(source: str, destination: str) -> None:
+    """
+    Move a file to another filesystem: copy, keep metadata, then delete.
+
+    Args:
+        source: Source file path
+        destination: Destination file path
+    """
+    partial = destination + PARTIAL_SUFFIX
+    with tracer.span("copy", source=source):
+        try:
+            copy_file(source, partial)
+            shutil.copystat(source, partial)
+            os.replace(partial, destination)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        os.unlink(source)
+
+
+class MoveExecutor:
+    """
+    Executes file moves, renaming in place when possible.
+
+    Usage:
+        with MoveExecutor(on_done=report) as mover:
+            for source, destination in plan:
+                mover.submit(source, destination)
+
+    Args:
+        on_done: Called as on_done(source, destination, error) for every
+            move, on the submitting thread; error is None on success
+        workers: Number of threads for cross-device copies
+    """
+
+    def __init__(self, on_done: MoveCallback, workers: Optional[int] = None) -> None:
+        self.on_done = on_done
+        self.workers = workers or DEFAULT_MOVE_WORKERS
+        self.max_pending = self.workers * 2
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict["Future[None]", Tuple[str, str]] = {}
+        self._devices: Dict[str, int] = {}
+
+    def _report(self, source: str, destination: str, error: Optional[BaseException]) -> None:
+        if error is not None:
+            tracer.count("move_errors")
+        self.on_done(source, destination, error)
+
+    def __enter__(self) -> "MoveExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _device_of(self, directory: str) -> int:
+        """Return the device of a destination directory (stat'ed once)."""
+        device = self._devices.get(directory)
+        if device is None:
+            device = os.stat(directory).st_dev
+            self._devices[directory] = device
+        return device
+
+    def submit(self, source: str, destination: str, source_device: Optional[int] = None) -> None:
+        """
+        Move a file.
+
+        Args:
+            source: Source file path
+            destination: Destination file path (its directory must exist)
+            source_device: Device of the source if already known (e.g. from
+                a FileRecord), to skip a rename that would fail with EXDEV
+        """
+        try:
+            # Without a known device, just try the rename; EXDEV says otherwise
+            same_device = source_device is None or (
+                source_device == self._device_of(os.path.dirname(destination))
+            )
+            if same_device:
+                tracer.count("rename")
+                os.rename(source, destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                self._report(source, destination, e)
+                return
+            same_device = False
+
+        if same_device:
+            self._report(source, destination, None)
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="lazy-move"
+            )
+        # Bound the number of in-flight copies, and report finished ones early
+        if len(self._pending) >= self.max_pending:
+            self._collect(block=True)
+        future = self._pool.submit(move_across_devices, source, destination)
+        self._pending[future] = (source, destination)
+        self._collect(block=False)
+
+    def is_pending(self, destination: str) -> bool:
+        """Check whether a cross-device move to destination is still running."""
+        return any(target == destination for _, target in self._pending.values())
+
+    def _collect(self, block: bool) -> None:
+        """Report finished cross-device moves on the calling thread."""
+        if not self._pending:
+            return
+        done: Set["Future[None]"]
+        if block:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+        else:
+            done = {future for future in self._pending if future.done()}
+        for future in done:
+            source, destination = self._pending.pop(future)
+            self._report(source, destination, future.exception())
+
+    def wait(self) -> None:
+        """Wait for all submitted moves and report them; the pool stays open."""
+        while self._pending:
+            self._collect(block=True)
+
+    def close(self) -> None:
+        """Wait for all cross-device moves and report them."""
+        self.wait()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
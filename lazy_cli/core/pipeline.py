@@ -0,0 +1,93 @@
+"""
+Bounded hand-off between pipeline stages.
+
+prefetch() runs an iterator (for example a directory scan followed by
+classification) on a background thread and hands its items to the consumer
+in batches through a bounded queue. The producer blocks when the consumer
+falls behind, so memory stays constant however long the iterator is, while
+the two stages still overlap (the filesystem calls of both release the GIL).
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+# Items handed over at once, and number of batches allowed in flight
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_BATCHES = 8
+
+# Marker for the end of the producer's items
+_DONE = object()
+
+
+def prefetch(
+    items: Iterable[T],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int = DEFAULT_MAX_BATCHES,
+) -> Iterator[T]:
+    """
+    Produce items on a background thread, with backpressure.
+
+    At most max_batches batches of batch_size items are buffered between the
+    producer and the consumer. An exception raised by the producer is raised
+    in the consumer; if the consumer stops early, the producer is stopped
+    too.
+
+    Args:
+        items: Iterable to run on the background thread
+        batch_size: Number of items per hand-off
+        max_batches: Number of batches buffered at most
+
+    Yields:
+        The items, in order
+    """
+    handoff: "queue.Queue[object]" = queue.Queue(maxsize=max_batches)
+    stop = threading.Event()
+
+    def put(value: object) -> bool:
+        """Hand a value over, giving up if the consumer has gone away."""
+        while not stop.is_set():
+            try:
+                handoff.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    iterator = iter(items)
+
+    def produce() -> None:
+        batch: List[T] = []
+        try:
+            for item in iterator:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+        finally:
+            # Let a generator release its resources on this thread
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="lazy-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            value = handoff.get()
+            if value is _DONE:
+                return
+            if isinstance(value, BaseException):
+                raise value
+            yield from value  # type: ignore[misc]
+    finally:
+        stop.set()
+        producer.join()
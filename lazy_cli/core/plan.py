@@ -0,0 +1,406 @@
+"""
+Move plans and journaled execution.
+
+A plan is a JSON Lines file: a header line with the plan id and root
+directory, then one ``[source, destination]`` pair per line, with paths
+stored relative to the root. Writing a plan is separate from executing it,
+so a large run can be reviewed (or edited) before anything is moved.
+
+Executing a plan appends to a journal next to it (``<plan>.journal``). Moves
+are done in batches; a line announcing each batch is written before it
+starts and a line recording its failures after it ends, each fsync'ed once
+per batch rather than once per file. An interrupted run therefore
+resumes from the last committed batch without rescanning: committed
+batches are skipped outright, and moves of the unfinished batch that had
+already happened are recognised because their source is gone and their
+destination exists. Undo walks the committed batches backwards and moves
+every file back, committing to the same journal, so it can be interrupted
+and resumed as well.
+"""
+
+import json
+import os
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from lazy_cli.core.files import list_names
+from lazy_cli.core.mover import MoveCallback, MoveExecutor
+
+PLAN_VERSION = 1
+
+# Number of moves committed to the journal at once
+DEFAULT_BATCH_SIZE = 1000
+
+JOURNAL_SUFFIX = ".journal"
+
+Move = Tuple[str, str]
+
+
+def get_journal_path(plan_path: str) -> str:
+    """
+    Get the path of the journal belonging to a plan.
+
+    Args:
+        plan_path: Plan file path
+
+    Returns:
+        Journal file path (<plan>.journal)
+    """
+    return os.fspath(plan_path) + JOURNAL_SUFFIX
+
+
+def _relative(path: str, prefix: str) -> str:
+    """Strip the root prefix from a path (paths outside the root stay absolute)."""
+    return path[len(prefix) :] if path.startswith(prefix) else path
+
+
+def write_plan(plan_path: str, root: str, moves: Iterable[Move]) -> int:
+    """
+    Write a move plan.
+
+    The plan is written to a temporary file and renamed into place, so an
+    existing plan is never left half-overwritten.
+
+    Args:
+        plan_path: Plan file path
+        root: Directory the paths are stored relative to
+        moves: (source, destination) pairs of absolute paths
+
+    Returns:
+        Number of moves written
+    """
+    root = os.path.abspath(root)
+    prefix = os.path.join(root, "")
+    header = {"version": PLAN_VERSION, "id": uuid.uuid4().hex, "root": root}
+    count = 0
+
+    tmp_path = f"{plan_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for source, destination in moves:
+                pair = [_relative(source, prefix), _relative(destination, prefix)]
+                f.write(json.dumps(pair, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp_path, plan_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return count
+
+
+def read_plan(plan_path: str) -> Tuple[Dict[str, object], List[Move]]:
+    """
+    Read a move plan.
+
+    Args:
+        plan_path: Plan file path
+
+    Returns:
+        Tuple of (header, list of absolute (source, destination) pairs)
+
+    Raises:
+        ValueError: If the file is not a valid plan
+    """
+    with open(plan_path, "r", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline() or "null")
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("version") != PLAN_VERSION:
+            raise ValueError(f"{plan_path} is not a lazy-cli move plan")
+
+        root = str(header["root"])
+        moves: List[Move] = []
+        for number, line in enumerate(f, start=2):
+            if not line.strip():
+                continue
+            try:
+                source, destination = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{plan_path}:{number}: invalid plan entry") from e
+            moves.append((os.path.join(root, source), os.path.join(root, destination)))
+
+    return header, moves
+
+
+class Journal:
+    """
+    Append-only record of the batches of a plan.
+
+    Records (one JSON object per line):
+        {"plan": id}                                  first record
+        {"begin": [start, end]}                       moves start..end-1 starting
+        {"batch": [start, end], "failed": [i, ...]}   moves start..end-1 done
+        {"undo": [start, end]}                        moves start..end-1 undone
+
+    Args:
+        path: Journal file path
+        plan_id: Id of the plan the journal belongs to
+    """
+
+    def __init__(self, path: str, plan_id: str) -> None:
+        self.path = path
+        self.plan_id = plan_id
+        # start -> (end, failed indices) for batches applied and not undone
+        self.batches: Dict[int, Tuple[int, Set[int]]] = {}
+        # Batch that was started but never committed (an interrupted run)
+        self.in_flight: Optional[Tuple[int, int]] = None
+        self._has_header = False
+        self._file: Optional[TextIO] = None
+        self._read()
+
+    def _read(self) -> None:
+        """Replay the journal; a torn line (from a crash) is ignored."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "plan" in record:
+                if record["plan"] != self.plan_id:
+                    raise ValueError(f"{self.path} belongs to a different plan")
+                self._has_header = True
+            elif "begin" in record:
+                self.in_flight = tuple(record["begin"])  # type: ignore[assignment]
+            elif "batch" in record:
+                start, end = record["batch"]
+                self.batches[start] = (end, set(record.get("failed", ())))
+                self.in_flight = None
+            elif "undo" in record:
+                self.batches.pop(record["undo"][0], None)
+                self.in_flight = None
+
+    def _append(self, record: Dict[str, object]) -> None:
+        """Write one record and make it durable."""
+        if self._file is None:
+            torn = False
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            except OSError:
+                pass
+            self._file = open(self.path, "a", encoding="utf-8")
+            if torn:
+                # Finish a line cut short by a crash so it stays separate
+                self._file.write("\n")
+            if not self._has_header:
+                self._file.write(json.dumps({"plan": self.plan_id}) + "\n")
+                self._has_header = True
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def begin(self, start: int, end: int) -> None:
+        """Record that moves start..end-1 are about to be applied."""
+        self._append({"begin": [start, end]})
+        self.in_flight = (start, end)
+
+    def commit(self, start: int, end: int, failed: Iterable[int]) -> None:
+        """Record that moves start..end-1 were applied."""
+        failed = sorted(failed)
+        self._append({"batch": [start, end], "failed": failed})
+        self.batches[start] = (end, set(failed))
+        self.in_flight = None
+
+    def commit_undo(self, start: int, end: int) -> None:
+        """Record that moves start..end-1 were undone."""
+        self._append({"undo": [start, end]})
+        self.batches.pop(start, None)
+        self.in_flight = None
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _BatchRunner:
+    """Runs moves in journaled batches; see apply_plan() and undo_plan()."""
+
+    def __init__(self, on_done: MoveCallback, workers: Optional[int]) -> None:
+        self.on_done = on_done
+        self.stats = {"moved": 0, "skipped": 0, "errors": 0}
+        self.listings: Dict[str, Set[str]] = {}
+        self.failed: Set[int] = set()
+        self.index_of: Dict[str, int] = {}
+        self.mover = MoveExecutor(on_done=self._report, workers=workers)
+
+    def _report(self, source: str, destination: str, error: Optional[BaseException]) -> None:
+        if error is None:
+            self.stats["moved"] += 1
+        else:
+            self.stats["errors"] += 1
+            self.failed.add(self.index_of[source])
+        self.on_done(source, destination, error)
+
+    def _names(self, directory: str) -> Set[str]:
+        """List a target directory once (creating it if needed)."""
+        names = self.listings.get(directory)
+        if names is None:
+            names = list_names(directory)
+            if not names:
+                os.makedirs(directory, exist_ok=True)
+            self.listings[directory] = names
+        return names
+
+    def _fail(self, index: int, source: str, destination: str, error: OSError) -> None:
+        self.failed.add(index)
+        self.stats["errors"] += 1
+        self.on_done(source, destination, error)
+
+    def move(self, index: int, source: str, destination: str) -> None:
+        """Move one file, recognising moves an interrupted run already did."""
+        directory, name = os.path.split(destination)
+        try:
+            names = self._names(directory)
+        except OSError as e:
+            # E.g. a file where the category folder should be; the batch goes on
+            self._fail(index, source, destination, e)
+            return
+        if name in names:
+            if not os.path.lexists(source):
+                # Done before an interruption
+                self.stats["skipped"] += 1
+                return
+            self._fail(index, source, destination, FileExistsError(f"{destination} already exists"))
+            return
+        names.add(name)
+        self.index_of[source] = index
+        self.mover.submit(source, destination)
+
+    def finish_batch(self) -> Set[int]:
+        """Wait for the batch's moves and return the indices that failed."""
+        self.mover.wait()
+        failed, self.failed, self.index_of = self.failed, set(), {}
+        return failed
+
+    def close(self) -> None:
+        self.mover.close()
+
+
+def _pending_ranges(
+    count: int, batches: Dict[int, Tuple[int, Set[int]]], batch_size: int
+) -> Iterator[Tuple[int, int]]:
+    """Split the moves outside committed batches into batch ranges."""
+    index = 0
+    while index < count:
+        if index in batches:
+            index = batches[index][0]
+            continue
+        end = min(index + batch_size, count)
+        # Do not overlap a committed batch further on
+        end = min([end] + [start for start in batches if index < start < end])
+        yield index, end
+        index = end
+
+
+def apply_plan(
+    plan_path: str,
+    on_done: MoveCallback,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Execute a plan, resuming after the last committed batch.
+
+    Args:
+        plan_path: Plan file path
+        on_done: Called as on_done(source, destination, error) for every move
+        batch_size: Number of moves per journal commit
+        workers: Number of threads for cross-filesystem moves
+        on_batch: Called as on_batch(start, end) after each committed batch
+
+    Returns:
+        Dictionary with statistics ("skipped" counts moves already done)
+    """
+    header, moves = read_plan(plan_path)
+    journal = Journal(get_journal_path(plan_path), str(header["id"]))
+    runner = _BatchRunner(on_done, workers)
+    stats = runner.stats
+    stats["skipped"] += sum(
+        end - start - len(failed) for start, (end, failed) in journal.batches.items()
+    )
+
+    try:
+        for start, end in _pending_ranges(len(moves), journal.batches, batch_size):
+            journal.begin(start, end)
+            for index in range(start, end):
+                runner.move(index, *moves[index])
+            journal.commit(start, end, runner.finish_batch())
+            if on_batch is not None:
+                on_batch(start, end)
+    finally:
+        runner.close()
+        journal.close()
+
+    return stats
+
+
+def undo_plan(
+    plan_path: str,
+    on_done: MoveCallback,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Move the files of every applied batch of a plan back, newest first.
+
+    Moves of a batch that was interrupted before its commit are undone too,
+    as far as they happened.
+    Category folders left empty are removed.
+
+    Args:
+        plan_path: Plan file path
+        on_done: Called as on_done(source, destination, error) for every move
+            back (source is the plan's destination)
+        workers: Number of threads for cross-filesystem moves
+
+    Returns:
+        Dictionary with statistics
+    """
+    header, moves = read_plan(plan_path)
+    journal = Journal(get_journal_path(plan_path), str(header["id"]))
+    runner = _BatchRunner(on_done, workers)
+
+    ranges = [(start, end, failed, True) for start, (end, failed) in journal.batches.items()]
+    if journal.in_flight is not None:
+        ranges.append((*journal.in_flight, set(), False))
+    ranges.sort()
+
+    try:
+        for start, end, failed, committed in reversed(ranges):
+            for index in range(end - 1, start - 1, -1):
+                if index in failed:
+                    continue
+                source, destination = moves[index]
+                if not committed and (os.path.lexists(source) or not os.path.lexists(destination)):
+                    # Not moved before the interruption
+                    continue
+                runner.move(index, destination, source)
+            runner.finish_batch()
+            journal.commit_undo(start, end)
+    finally:
+        runner.close()
+        journal.close()
+
+    # Remove the folders the plan created, if nothing else is in them
+    for directory in sorted({os.path.dirname(destination) for _, destination in moves}):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    return runner.stats
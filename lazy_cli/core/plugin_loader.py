@@ -1,124 +1,197 @@
 """
 Plugin Loader - Auto-discovers and loads plugins from the plugins directory.
+
+Plugins are registered lazily: every command is listed from its
+PLUGIN_NAME/PLUGIN_HELP stub, and the plugin module is only imported when
+that command is actually dispatched.
 """
 
 import importlib
-import inspect
-from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
 import typer
+from typer.core import TyperCommand, TyperGroup
 from rich.console import Console
+from lazy_cli.core.manifest import PLUGINS_DIR, load_manifest
+from lazy_cli.core.trace import tracer
 
 console = Console()
 
 
+def discover_plugins() -> List[Dict[str, Any]]:
+    """
+    Discover all plugins without importing them.
+
+    Metadata for the built-in plugins directory and for third-party plugins
+    registered under the ``lazy_cli.plugins`` entry-point group comes from
+    the on-disk manifest cache (see lazy_cli.core.manifest).
+
+    Returns:
+        List of dictionaries containing plugin metadata
+    """
+    plugins = []
+    with tracer.span("load_manifest"):
+        manifest = load_manifest()
+    for metadata in manifest:
+        if metadata.get("error"):
+            console.print(
+                f"[red]✗[/red] Failed to read {metadata['file']}: [red]{metadata['error']}[/red]"
+            )
+            continue
+
+        if not metadata.get("name"):
+            console.print(f"[yellow]⚠ Skipping {metadata['file']}: Missing PLUGIN_NAME[/yellow]")
+            continue
+
+        plugins.append(metadata)
+
+    return plugins
+
+
+def import_plugin_command(plugin: Dict[str, Any]) -> Any:
+    """
+    Import a plugin module and build its real Click command.
+
+    Args:
+        plugin: Plugin metadata as returned by discover_plugins()
+
+    Returns:
+        The Click command (or group) implementing the plugin
+
+    Raises:
+        ImportError: If the module cannot be imported
+        AttributeError: If the module has neither an 'app' nor a 'main'
+    """
+    module = importlib.import_module(plugin["module"])
+
+    # Entry points may name the object explicitly ("package.module:app")
+    target = getattr(module, plugin["attr"]) if plugin.get("attr") else None
+
+    # Check if plugin has a Typer app
+    if isinstance(target, typer.Typer) or (
+        target is None and isinstance(getattr(module, "app", None), typer.Typer)
+    ):
+        command = typer.main.get_command(target or module.app)
+
+    # Check if plugin has a main function
+    elif callable(target) or (target is None and callable(getattr(module, "main", None))):
+        wrapper = typer.Typer()
+        wrapper.command(name=plugin["name"], help=plugin["help"])(target or module.main)
+        command = typer.main.get_command(wrapper)
+
+    else:
+        raise AttributeError(f"{plugin['file']}: No 'app' or 'main' found")
+
+    command.name = plugin["name"]
+    if not command.help:
+        command.help = plugin["help"]
+    return command
+
+
+class LazyPluginCommand(TyperCommand):
+    """
+    Placeholder command that only carries a plugin's name and help text.
+
+    It is shown in ``lazy --help`` and replaced by the real command the
+    first time the group resolves it for dispatch.
+    """
+
+    def __init__(self, plugin: Dict[str, Any]) -> None:
+        super().__init__(
+            name=plugin["name"],
+            help=plugin["help"],
+            context_settings={"ignore_unknown_options": True, "allow_extra_args": True},
+        )
+        self.plugin = plugin
+
+    def load(self) -> Any:
+        """Import the plugin and return its real command."""
+        with tracer.span("plugin_import", plugin=self.plugin["name"]):
+            return import_plugin_command(self.plugin)
+
+
+class LazyPluginGroup(TyperGroup):
+    """
+    Typer group that registers plugins as stubs and imports them on demand.
+
+    Subclasses created by with_plugins() carry the discovered plugin
+    metadata; Typer instantiates the group when the app is invoked.
+    """
+
+    plugins: List[Dict[str, Any]] = []
+
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        for plugin in self.plugins:
+            self.commands.setdefault(plugin["name"], LazyPluginCommand(plugin))
+
+    @classmethod
+    def with_plugins(cls, plugins: List[Dict[str, Any]]) -> type:
+        """
+        Create a group class bound to a list of plugins.
+
+        Args:
+            plugins: Plugin metadata as returned by discover_plugins()
+
+        Returns:
+            A LazyPluginGroup subclass
+        """
+        return type(cls.__name__, (cls,), {"plugins": list(plugins)})
+
+    def resolve_command(self, ctx: Any, args: List[str]) -> Tuple[Optional[str], Any, List[str]]:
+        cmd_name, command, args = super().resolve_command(ctx, args)
+
+        if isinstance(command, LazyPluginCommand):
+            try:
+                command = command.load()
+            except Exception as e:
+                console.print(
+                    f"[red]✗[/red] Failed to load {command.plugin['file']}: [red]{str(e)}[/red]"
+                )
+                raise typer.Exit(1) from None
+            self.commands[cmd_name] = command
+
+        return cmd_name, command, args
+
+
 def load_plugins(app: typer.Typer) -> None:
     """
-    Automatically discover and load all plugins from the plugins directory.
-    
+    Automatically discover and register all plugins from the plugins directory.
+
     Each plugin should:
     1. Have a PLUGIN_NAME constant (string) - the command name
     2. Have a PLUGIN_HELP constant (string) - command description
     3. Have either:
        - An 'app' variable (Typer instance with commands)
        - A 'main' function decorated with @app.command()
-    
+
+    PLUGIN_NAME and PLUGIN_HELP must be plain literals: they are read
+    statically, and the plugin module is only imported when its command
+    is invoked. Third-party packages can provide plugins through the
+    ``lazy_cli.plugins`` entry-point group.
+
     Args:
         app: The main Typer application instance
     """
-    # Get the plugins directory path
-    plugins_dir = Path(__file__).parent.parent / "plugins"
-    
-    if not plugins_dir.exists():
-        console.print("[yellow]Warning: Plugins directory not found[/yellow]")
-        return
-    
-    # Find all Python files in plugins directory (excluding __init__.py and _template.py)
-    plugin_files = [
-        f for f in plugins_dir.glob("*.py")
-        if f.name not in ["__init__.py", "_template.py"]
-    ]
-    
-    loaded_count = 0
-    
-    for plugin_file in plugin_files:
-        try:
-            # Import the plugin module
-            module_name = f"lazy_cli.plugins.{plugin_file.stem}"
-            module = importlib.import_module(module_name)
-            
-            # Check if plugin has required attributes
-            if not hasattr(module, "PLUGIN_NAME"):
-                console.print(
-                    f"[yellow]⚠ Skipping {plugin_file.name}: Missing PLUGIN_NAME[/yellow]"
-                )
-                continue
-            
-            plugin_name = module.PLUGIN_NAME
-            plugin_help = getattr(module, "PLUGIN_HELP", "No description available")
-            
-            # Check if plugin has a Typer app
-            if hasattr(module, "app") and isinstance(module.app, typer.Typer):
-                # Add the plugin's Typer app as a subcommand
-                app.add_typer(
-                    module.app,
-                    name=plugin_name,
-                    help=plugin_help,
-                )
-                loaded_count += 1
-                console.print(f"[green]✓[/green] Loaded plugin: [bold]{plugin_name}[/bold]")
-            
-            # Check if plugin has a main function
-            elif hasattr(module, "main") and callable(module.main):
-                # Register the main function as a command
-                app.command(name=plugin_name, help=plugin_help)(module.main)
-                loaded_count += 1
-                console.print(f"[green]✓[/green] Loaded plugin: [bold]{plugin_name}[/bold]")
-            
-            else:
-                console.print(
-                    f"[yellow]⚠ Skipping {plugin_file.name}: No 'app' or 'main' found[/yellow]"
-                )
-        
-        except Exception as e:
-            console.print(
-                f"[red]✗[/red] Failed to load {plugin_file.name}: [red]{str(e)}[/red]"
-            )
-    
-    if loaded_count == 0:
-        console.print("[yellow]No plugins loaded. Add some plugins to get started![/yellow]")
-    else:
-        console.print(f"\n[bold green]Successfully loaded {loaded_count} plugin(s)[/bold green]\n")
+    with tracer.span("load_plugins"):
+        if not PLUGINS_DIR.exists():
+            console.print("[yellow]Warning: Plugins directory not found[/yellow]")
+            return
+
+        plugins = discover_plugins()
+
+        if not plugins:
+            console.print("[yellow]No plugins loaded. Add some plugins to get started![/yellow]")
 
+        app.info.cls = LazyPluginGroup.with_plugins(plugins)
 
-def get_plugin_info() -> list[dict[str, Any]]:
+
+def get_plugin_info() -> List[Dict[str, Any]]:
     """
     Get information about all available plugins.
-    
+
+    No plugin code is executed; metadata comes from the manifest cache.
+
     Returns:
         List of dictionaries containing plugin metadata
     """
-    plugins_dir = Path(__file__).parent.parent / "plugins"
-    plugin_files = [
-        f for f in plugins_dir.glob("*.py")
-        if f.name not in ["__init__.py", "_template.py"]
-    ]
-    
-    plugins_info = []
-    
-    for plugin_file in plugin_files:
-        try:
-            module_name = f"lazy_cli.plugins.{plugin_file.stem}"
-            module = importlib.import_module(module_name)
-            
-            if hasattr(module, "PLUGIN_NAME"):
-                plugins_info.append({
-                    "name": module.PLUGIN_NAME,
-                    "help": getattr(module, "PLUGIN_HELP", "No description"),
-                    "file": plugin_file.name,
-                    "module": module_name,
-                })
-        except Exception:
-            continue
-    
-    return plugins_info
+    return discover_plugins()
@@ -0,0 +1,199 @@
+"""
+Startup profiler for lazy-cli.
+
+Every startup phase (imports, plugin discovery, Typer registration) is timed
+with a pair of ``time.perf_counter()`` calls, which is cheap enough to leave
+on permanently. ``lazy --profile-startup`` additionally times the work that
+is deferred until a command runs (config load, each plugin import) and
+prints the breakdown as a table or JSON, optionally failing when a phase
+regressed against a stored baseline.
+
+This module only depends on the standard library.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# A phase must be this much slower (relative and absolute) to count as a regression
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 2.0
+
+
+class StartupProfiler:
+    """
+    Records wall time per named phase.
+
+    Usage:
+        with profiler.phase("import typer"):
+            import typer
+    """
+
+    def __init__(self) -> None:
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the recorded phases as a JSON-serialisable dictionary.
+
+        Returns:
+            Dictionary with per-phase and total times in milliseconds
+        """
+        phases: Dict[str, float] = {}
+        for name, seconds in self.phases:
+            phases[name] = round(phases.get(name, 0.0) + seconds * 1000, 3)
+        return {
+            "phases": phases,
+            "total_ms": round(sum(phases.values()), 3),
+        }
+
+
+# Process-wide profiler used by lazy_cli.main and the plugin loader
+profiler = StartupProfiler()
+
+
+def profile_deferred_phases() -> None:
+    """
+    Time the startup work that normally only happens on command dispatch.
+
+    Plugins are registered lazily, so their imports and the config load do
+    not show up in a plain startup; they are timed here so the report covers
+    what a real command invocation pays.
+    """
+    # Imported by the application first, so that cli.py times "import typer"
+    from lazy_cli.main import app
+
+    with profiler.phase("typer registration"):
+        from typer.main import get_command
+
+        command = get_command(app)
+
+    with profiler.phase("import pydantic"):
+        import pydantic  # noqa: F401
+
+    with profiler.phase("import yaml"):
+        import yaml  # noqa: F401
+
+    with profiler.phase("config load"):
+        from lazy_cli.core.config import load_config
+
+        load_config()
+
+    from lazy_cli.core.plugin_loader import LazyPluginCommand
+
+    for name in command.list_commands(None):
+        stub = command.get_command(None, name)
+        if not isinstance(stub, LazyPluginCommand):
+            continue
+        try:
+            with profiler.phase(f"plugin import: {name}"):
+                stub.load()
+        except Exception:
+            # A broken plugin is reported by its own command; keep its time
+            continue
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[str]:
+    """
+    Compare a profile against a stored baseline.
+
+    A phase regressed if it is both more than ``threshold`` (relative) and
+    more than ``min_delta_ms`` (absolute) slower than in the baseline.
+
+    Args:
+        current: Profile as returned by StartupProfiler.as_dict()
+        baseline: Baseline profile in the same format
+        threshold: Allowed relative slowdown (0.25 = 25%)
+        min_delta_ms: Slowdowns smaller than this are treated as noise
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    rows = list(current["phases"].items()) + [("total", current["total_ms"])]
+    base = dict(baseline.get("phases", {}), total=baseline.get("total_ms"))
+
+    regressions = []
+    for name, ms in rows:
+        base_ms = base.get(name)
+        if base_ms is None:
+            continue
+        if ms > base_ms * (1 + threshold) and ms - base_ms > min_delta_ms:
+            regressions.append(f"{name}: {base_ms:.1f} ms -> {ms:.1f} ms")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Print a profile as a table sorted by time.
+
+    Args:
+        report: Profile as returned by StartupProfiler.as_dict()
+    """
+    from lazy_cli.core.utils import console, create_table
+
+    total = report["total_ms"] or 1.0
+    table = create_table("Startup Profile", ["Phase", "Time (ms)", "Share"])
+    for name, ms in sorted(report["phases"].items(), key=lambda item: item[1], reverse=True):
+        table.add_row(name, f"{ms:.2f}", f"{ms / total:.0%}")
+    table.add_row("[bold]total[/bold]", f"[bold]{report['total_ms']:.2f}[/bold]", "")
+    console.print(table)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run ``lazy --profile-startup``.
+
+    Usage:
+        lazy --profile-startup [--json] [--baseline FILE]
+             [--threshold FRACTION] [--min-delta-ms MS]
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code: 0, or 1 if a phase regressed against the baseline
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="lazy --profile-startup")
+    parser.add_argument("--profile-startup", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Emit the profile as JSON")
+    parser.add_argument("--baseline", help="Fail if slower than this stored JSON profile")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    profile_deferred_phases()
+    report = profiler.as_dict()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"Startup regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
@@ -0,0 +1,256 @@
+"""
+Compact storage for scan results.
+
+A RecordStore keeps scanned files in parallel, array-backed columns instead
+of one Python object per file:
+
+- names are packed into a single byte buffer with an offset column;
+- each file refers to its directory by id; directory paths and devices are
+  stored once per directory;
+- size, mtime and inode are machine integers in ``array`` columns;
+- extensions and categories are interned: each appears once, and files
+  refer to it by id (categories through one index column per category).
+
+Memory target: at most ``MAX_BYTES_PER_RECORD`` bytes per file plus the
+length of its encoded name, array over-allocation included (a FileRecord
+with its strings and integers costs over 300 bytes). tests/test_records.py
+enforces it.
+
+Consumers read a store like the old ``Dict[str, List[FileRecord]]``: it is
+a mapping from category to a sequence view, and FileRecord objects are only
+created, one at a time, while iterating.
+"""
+
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union, overload
+
+from lazy_cli.core.files import FileRecord
+
+# Documented memory budget per file, on top of the file name itself
+MAX_BYTES_PER_RECORD = 64
+
+
+def _extension(name: str) -> str:
+    """Extension of a file name, lowercase and without the dot."""
+    return os.path.splitext(name)[1].lower().lstrip(".")
+
+
+class CategoryView(Sequence[FileRecord]):
+    """
+    The files of one category in a RecordStore.
+
+    Indexing and iteration build FileRecord objects on demand.
+    """
+
+    def __init__(self, store: "RecordStore", category: str, indices: "array[int]") -> None:
+        self.store = store
+        self.category = category
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, position: int) -> FileRecord: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[FileRecord]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[FileRecord, List[FileRecord]]:
+        if isinstance(position, slice):
+            return [self.store.record(index) for index in self.indices[position]]
+        return self.store.record(self.indices[position])
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        record = self.store.record
+        for index in self.indices:
+            yield record(index)
+
+    @property
+    def total_size(self) -> int:
+        """Total size of the category's files in bytes."""
+        return self.store.category_size(self.category)
+
+
+class RecordStore(Mapping[str, CategoryView]):
+    """
+    Scanned files grouped by category, in compact columns.
+
+    Usage:
+        store = RecordStore(engine.categories)
+        for record in scan_files(directory):
+            store.add(record, engine.classify(record.name, record.size))
+        store["Images"][0].path
+
+    Args:
+        categories: Categories present even when empty, in display order
+    """
+
+    def __init__(self, categories: Iterable[str] = ()) -> None:
+        # Directory table
+        self._dir_ids: Dict[str, int] = {}
+        self._dirs: List[str] = []
+        self._devices = array("Q")
+
+        # Per-file columns
+        self._dir = array("I")
+        self._name_end = array("Q")
+        self._names = bytearray()
+        self._size = array("q")
+        self._mtime = array("q")
+        self._inode = array("Q")
+        self._ext = array("I")
+
+        # Interned extensions
+        self._ext_ids: Dict[str, int] = {}
+        self.extensions: List[str] = []
+
+        # Category -> indices, count is len(indices)
+        self._categories: Dict[str, "array[int]"] = {}
+        self._category_sizes: Dict[str, int] = {}
+        for category in categories:
+            self._add_category(category)
+
+    def _add_category(self, category: str) -> "array[int]":
+        indices = self._categories[category] = array("I")
+        self._category_sizes[category] = 0
+        return indices
+
+    def add(self, record: FileRecord, category: str) -> int:
+        """
+        Store a scanned file.
+
+        Args:
+            record: File record from the scanner
+            category: Category of the file
+
+        Returns:
+            Index of the stored file
+        """
+        directory, name = os.path.split(record.path)
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_ids[directory] = len(self._dirs)
+            self._dirs.append(directory)
+            self._devices.append(record.device)
+
+        extension = _extension(name)
+        ext_id = self._ext_ids.get(extension)
+        if ext_id is None:
+            ext_id = self._ext_ids[extension] = len(self.extensions)
+            self.extensions.append(extension)
+
+        index = len(self._dir)
+        self._dir.append(dir_id)
+        self._names += os.fsencode(name)
+        self._name_end.append(len(self._names))
+        self._size.append(record.size)
+        self._mtime.append(record.mtime)
+        self._inode.append(record.inode)
+        self._ext.append(ext_id)
+
+        indices = self._categories.get(category)
+        if indices is None:
+            indices = self._add_category(category)
+        indices.append(index)
+        self._category_sizes[category] += record.size
+        return index
+
+    @classmethod
+    def from_files(
+        cls, files: Iterable[Tuple[FileRecord, str]], categories: Iterable[str] = ()
+    ) -> "RecordStore":
+        """
+        Build a store from (file record, category) pairs.
+
+        Args:
+            files: Pairs as produced by a scanner plus classification
+            categories: Categories present even when empty
+
+        Returns:
+            RecordStore instance
+        """
+        store = cls(categories)
+        for record, category in files:
+            store.add(record, category)
+        return store
+
+    # Mapping interface: category -> files
+    def __getitem__(self, category: str) -> CategoryView:
+        return CategoryView(self, category, self._categories[category])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    @property
+    def total(self) -> int:
+        """Number of stored files."""
+        return len(self._dir)
+
+    def category_size(self, category: str) -> int:
+        """Total size of a category's files in bytes."""
+        return self._category_sizes[category]
+
+    def summary(self) -> Dict[str, List[int]]:
+        """
+        Per-category totals, kept up to date while adding (no scan needed).
+
+        Returns:
+            Dictionary of category -> [file count, total size] for
+            non-empty categories
+        """
+        return {
+            category: [len(indices), self._category_sizes[category]]
+            for category, indices in self._categories.items()
+            if indices
+        }
+
+    # Per-file access
+    def name(self, index: int) -> str:
+        """File name of a stored file."""
+        start = self._name_end[index - 1] if index else 0
+        return os.fsdecode(bytes(self._names[start : self._name_end[index]]))
+
+    def path(self, index: int) -> str:
+        """Full path of a stored file."""
+        return os.path.join(self._dirs[self._dir[index]], self.name(index))
+
+    def extension(self, index: int) -> str:
+        """Interned extension of a stored file (lowercase, without dot)."""
+        return self.extensions[self._ext[index]]
+
+    def size(self, index: int) -> int:
+        """Size of a stored file in bytes."""
+        return self._size[index]
+
+    def record(self, index: int) -> FileRecord:
+        """
+        Build a FileRecord for a stored file.
+
+        Args:
+            index: Index returned by add()
+
+        Returns:
+            FileRecord instance
+        """
+        dir_id = self._dir[index]
+        name = self.name(index)
+        return FileRecord.from_values(
+            os.path.join(self._dirs[dir_id], name),
+            name,
+            size=self._size[index],
+            mtime=self._mtime[index],
+            inode=self._inode[index],
+            device=self._devices[dir_id],
+        )
+
+    def nbytes(self) -> int:
+        """Bytes held by the per-file columns and category indices."""
+        columns = [self._dir, self._name_end, self._size, self._mtime, self._inode, self._ext]
+        total = sum(column.itemsize * len(column) for column in columns)
+        total += sum(indices.itemsize * len(indices) for indices in self._categories.values())
+        return total + len(self._names)
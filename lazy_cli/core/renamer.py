@@ -0,0 +1,157 @@
+"""
+Rename plans for renaming many files in one directory.
+
+The complete old -> new mapping is computed in memory first and checked as
+a whole, so no file is touched when any target is invalid or taken.
+
+Renames that overlap (a -> b while b -> c) form chains and cycles: every
+name is the target of at most one rename, so following "target of" links
+from any rename ends either at a free name (a chain) or back at the start
+(a cycle). plan_renames() orders each chain from its free end, so every
+rename goes to a name that is already free, and breaks each cycle with a
+single temporary name, the fewest possible. Everything is done with dict
+and set lookups in O(n); the filesystem is listed once to know which names
+are taken, instead of calling ``exists()`` per file.
+
+apply_renames() then runs the steps as plain ``os.rename`` calls. If one
+fails, the steps already done are undone in reverse order, so a plan is
+applied either completely or not at all (barring a second failure while
+rolling back).
+"""
+
+import os
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from lazy_cli.core.trace import tracer
+
+# Prefix of the temporary names that break rename cycles
+TEMP_PREFIX = ".lazy-rename-"
+
+Rename = Tuple[str, str]
+
+
+def check_name(name: str) -> Optional[str]:
+    """
+    Check that a new file name is usable.
+
+    Args:
+        name: New file name
+
+    Returns:
+        Reason the name is invalid, or None if it is valid
+    """
+    if not name or name in (".", ".."):
+        return "empty name"
+    if "/" in name or (os.sep != "/" and os.sep in name) or "\0" in name:
+        return "name contains a path separator"
+    return None
+
+
+def plan_renames(renames: Iterable[Rename], existing: Set[str]) -> Tuple[List[Rename], List[str]]:
+    """
+    Order the renames of one directory so they can be applied one by one.
+
+    Args:
+        renames: (old name, new name) pairs; pairs with equal names are dropped
+        existing: Names present in the directory (files and directories)
+
+    Returns:
+        Tuple of (steps, conflicts). Steps are (old name, new name) renames
+        in execution order, including those to and from temporary names.
+        Conflicts describe why the renames cannot be done; if there are
+        any, steps is empty.
+    """
+    target_of: Dict[str, str] = {}
+    source_of: Dict[str, str] = {}
+    conflicts: List[str] = []
+
+    for old, new in renames:
+        if old == new:
+            continue
+        reason = check_name(new)
+        if reason is not None:
+            conflicts.append(f"{old} -> {new!r}: {reason}")
+            continue
+        if old in target_of:
+            conflicts.append(f"{old} is renamed twice")
+            continue
+        other = source_of.get(new)
+        if other is not None:
+            conflicts.append(f"{other} and {old} would both be renamed to {new}")
+            continue
+        target_of[old] = new
+        source_of[new] = old
+
+    # A target must be free, or be renamed away itself
+    for new, old in source_of.items():
+        if new in existing and new not in target_of:
+            conflicts.append(f"{old} -> {new}: {new} already exists")
+
+    if conflicts:
+        return [], conflicts
+
+    steps: List[Rename] = []
+    done: Set[str] = set()
+
+    # Chains: start from the renames whose target is free, and walk back
+    for old, new in target_of.items():
+        if new in target_of:
+            continue
+        source: Optional[str] = old
+        while source is not None:
+            steps.append((source, target_of[source]))
+            done.add(source)
+            source = source_of.get(source)
+
+    # Everything left is in a cycle: park one name, walk back, then unpark it
+    temp_names = 0
+    for start, new in target_of.items():
+        if start in done:
+            continue
+        temp = _temp_name(existing, source_of)
+        temp_names += 1
+        steps.append((start, temp))
+        done.add(start)
+        source = source_of[start]
+        while source != start:
+            steps.append((source, target_of[source]))
+            done.add(source)
+            source = source_of[source]
+        steps.append((temp, new))
+
+    tracer.count("rename_cycles", temp_names)
+    return steps, []
+
+
+def _temp_name(existing: Set[str], targets: Dict[str, str]) -> str:
+    """A name free in the directory and not used by the plan."""
+    while True:
+        name = f"{TEMP_PREFIX}{uuid.uuid4().hex[:12]}"
+        if name not in existing and name not in targets:
+            return name
+
+
+def apply_renames(directory: str, steps: List[Rename]) -> None:
+    """
+    Run planned renames, undoing them all if one fails.
+
+    Args:
+        directory: Directory containing the files
+        steps: Renames from plan_renames(), in order
+
+    Raises:
+        OSError: The error of the failed rename, after the earlier steps
+            were rolled back
+    """
+    done = 0
+    try:
+        with tracer.span("rename", steps=len(steps)):
+            for old, new in steps:
+                os.rename(os.path.join(directory, old), os.path.join(directory, new))
+                done += 1
+    except OSError:
+        tracer.count("rename_rollbacks")
+        for old, new in reversed(steps[:done]):
+            os.rename(os.path.join(directory, new), os.path.join(directory, old))
+        raise
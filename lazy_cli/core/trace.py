@@ -0,0 +1,260 @@
+"""
+Hot-path tracing: spans and counters.
+
+Spans time named phases (a directory listing, the move phase, a plugin
+import); counters add up events (syscalls, bytes moved, errors). Both are
+recorded by the process-wide ``tracer``:
+
+    from lazy_cli.core.trace import tracer
+
+    with tracer.span("scan", directory=str(directory)):
+        ...
+    tracer.count("stat", len(files))
+
+Tracing is off unless ``lazy --trace FILE`` (or start_tracing()) turns it
+on. While it is off, span() returns a shared do-nothing context manager and
+count() returns immediately, so instrumented hot paths pay one method call.
+When it is on, spans are recorded with their thread, and the trace is
+written at exit as a Chrome trace-event file (open it in
+``chrome://tracing`` or https://ui.perfetto.dev), or printed as a summary
+table with ``--trace -``.
+
+This module only depends on the standard library.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class _NullSpan:
+    """Context manager that does nothing; what span() returns while disabled."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Records spans and counters while enabled.
+
+    Usage:
+        tracer.enable()
+        with tracer.span("list", path=path):
+            ...
+        tracer.count("bytes_moved", size)
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        """Start recording."""
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording (recorded data is kept)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop recorded spans and counters."""
+        with self._lock:
+            self.events = []
+            self.counters = {}
+
+    def span(self, name: str, **args: Any) -> Any:
+        """
+        Time the enclosed block as a span.
+
+        Args:
+            name: Span name (spans with the same name are summed in the summary)
+            **args: Details shown with the span in the trace viewer
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the recorded spans per name.
+
+        Returns:
+            Dictionary with "spans" (name -> count, total_ms, max_ms) and
+            "counters"
+        """
+        spans: Dict[str, Dict[str, float]] = {}
+        for event in list(self.events):
+            totals = spans.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = event["dur"] / 1000
+            totals["count"] += 1
+            totals["total_ms"] += ms
+            totals["max_ms"] = max(totals["max_ms"], ms)
+        for totals in spans.values():
+            totals["total_ms"] = round(totals["total_ms"], 3)
+            totals["max_ms"] = round(totals["max_ms"], 3)
+        return {"spans": spans, "counters": dict(self.counters)}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Get the recorded data in the Chrome trace-event format.
+
+        Counters become counter events at the end of the trace.
+
+        Returns:
+            JSON-serialisable trace document
+        """
+        events = list(self.events)
+        end = max((event["ts"] + event["dur"] for event in events), default=0.0)
+        for name, value in sorted(self.counters.items()):
+            events.append(
+                {"name": name, "ph": "C", "ts": end, "pid": os.getpid(), "args": {name: value}}
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(self.counters)},
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Write the trace to a file in the Chrome trace-event format.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# Process-wide tracer used by the core modules and plugins
+tracer = Tracer()
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Print a trace summary as tables on stderr, slowest spans first.
+
+    Args:
+        summary: Summary as returned by Tracer.summary()
+    """
+    from rich.console import Console
+
+    from lazy_cli.core.utils import create_table
+
+    console = Console(stderr=True)
+    table = create_table("Trace", ["Span", "Count", "Total (ms)", "Max (ms)"])
+    spans = sorted(summary["spans"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    for name, totals in spans:
+        table.add_row(
+            name, str(totals["count"]), f"{totals['total_ms']:.2f}", f"{totals['max_ms']:.2f}"
+        )
+    console.print(table)
+
+    if summary["counters"]:
+        table = create_table("Counters", ["Counter", "Value"])
+        for name, value in sorted(summary["counters"].items()):
+            table.add_row(name, f"{value:,}")
+        console.print(table)
+
+
+def start_tracing(output: str) -> None:
+    """
+    Enable the tracer and report at exit.
+
+    Calling it again while tracing is already on does nothing.
+
+    Args:
+        output: Chrome trace file to write, or "-" for a summary table on stderr
+    """
+    if tracer.enabled:
+        return
+    tracer.enable()
+
+    def report() -> None:
+        tracer.disable()
+        if output == "-":
+            print_summary(tracer.summary())
+            return
+        try:
+            tracer.write(output)
+        except OSError as e:
+            print(f"Could not write trace to {output}: {e}", file=sys.stderr)
+
+    atexit.register(report)
+
+
+def pop_trace_option(argv: List[str]) -> Optional[str]:
+    """
+    Remove a leading ``--trace FILE`` / ``--trace=FILE`` from the arguments.
+
+    Only options before the command name are considered, like Typer's own
+    top-level options.
+
+    Args:
+        argv: Command-line arguments (modified in place)
+
+    Returns:
+        The trace output, or None if the option was not given
+    """
+    for index, arg in enumerate(argv):
+        if arg.startswith("--trace="):
+            del argv[index]
+            return arg[len("--trace=") :]
+        if arg == "--trace" and index + 1 < len(argv):
+            output = argv[index + 1]
+            del argv[index : index + 2]
+            return output
+        if not arg.startswith("-"):
+            break
+    return None
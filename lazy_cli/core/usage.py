@@ -0,0 +1,424 @@
+"""
+Disk usage of directory trees.
+
+scan_usage() lists directories with os.scandir on a thread pool. For each
+directory it keeps a small summary rather than its files: the bytes and
+number of files directly in it, its subdirectories, its largest files and
+the inodes of its files having several hard links. Subtree totals are then
+added up from the summaries, children before parents, and the largest
+directories and files are picked with heapq.nlargest (a bounded heap)
+instead of sorting everything.
+
+UsageCache stores the summaries in SQLite (``~/.lazy-cli/usage.db``) with
+the mtime of each directory. A later scan still stats every directory, but
+only lists again those whose mtime changed; the others are answered from
+the cache. As with FileIndex, a file resized in place does not change its
+directory's mtime, so its size may be stale until the directory changes
+(scan without the cache to refresh everything).
+
+Sizes are apparent sizes (st_size). A file with several hard links is
+counted once per (device, inode), in the first directory holding it in
+path order.
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from lazy_cli.core.files import DEFAULT_WALK_WORKERS
+from lazy_cli.core.index import RACY_WINDOW_NS
+from lazy_cli.core.trace import tracer
+
+SCHEMA_VERSION = 1
+
+# Largest files remembered per directory, hence the largest top-N of files
+TOP_FILES = 100
+
+# Rows written with one executemany()
+WRITE_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path BLOB PRIMARY KEY,
+    mtime INTEGER,
+    device INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    listing TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def get_usage_cache_path() -> Path:
+    """
+    Get the path to the disk usage cache.
+
+    Returns:
+        Path to the cache database (~/.lazy-cli/usage.db)
+    """
+    return Path.home() / ".lazy-cli" / "usage.db"
+
+
+class DirectoryUsage:
+    """
+    Summary of one directory's listing, and the totals of its subtree.
+
+    Attributes:
+        path: Full path of the directory
+        mtime: Modification time in nanoseconds (None if too recent to trust)
+        device: Device number
+        size: Bytes of the files directly in the directory
+        files: Number of files directly in the directory
+        subdirs: Names of the subdirectories
+        top: Largest files directly in the directory, as (size, name)
+        links: Files with several hard links, as (inode, size, name)
+        duplicates: Names of the hard links counted in another directory,
+            set by scan_usage()
+        total: Bytes of the whole subtree, set by scan_usage()
+        total_files: Files of the whole subtree, set by scan_usage()
+    """
+
+    __slots__ = (
+        "path",
+        "mtime",
+        "device",
+        "size",
+        "files",
+        "subdirs",
+        "top",
+        "links",
+        "duplicates",
+        "total",
+        "total_files",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        mtime: Optional[int],
+        device: int,
+        size: int,
+        files: int,
+        subdirs: List[str],
+        top: List[Tuple[int, str]],
+        links: List[Tuple[int, int, str]],
+    ) -> None:
+        self.path = path
+        self.mtime = mtime
+        self.device = device
+        self.size = size
+        self.files = files
+        self.subdirs = subdirs
+        self.top = top
+        self.links = links
+        self.duplicates: Set[str] = set()
+        self.total = size
+        self.total_files = files
+
+
+def list_directory(path: str, st: os.stat_result) -> DirectoryUsage:
+    """
+    Summarize a directory from its listing.
+
+    Args:
+        path: Directory to list
+        st: Stat of the directory, taken before listing it
+
+    Returns:
+        Summary of the directory (symlinks count as small files)
+
+    Raises:
+        OSError: If the directory cannot be listed
+    """
+    size = files = 0
+    subdirs: List[str] = []
+    top: List[Tuple[int, str]] = []
+    links: List[Tuple[int, int, str]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    continue
+                entry_st = entry.stat(follow_symlinks=False)
+            except OSError:
+                # Deleted while listing
+                continue
+            size += entry_st.st_size
+            files += 1
+            if len(top) < TOP_FILES:
+                heapq.heappush(top, (entry_st.st_size, entry.name))
+            elif entry_st.st_size > top[0][0]:
+                heapq.heapreplace(top, (entry_st.st_size, entry.name))
+            if entry_st.st_nlink > 1:
+                links.append((entry_st.st_ino, entry_st.st_size, entry.name))
+
+    # A directory changed within the timestamp granularity may change again
+    # without its mtime moving: do not trust it next time
+    mtime: Optional[int] = st.st_mtime_ns
+    if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        mtime = None
+    return DirectoryUsage(path, mtime, st.st_dev, size, files, subdirs, top, links)
+
+
+class UsageCache:
+    """
+    Directory summaries cached in SQLite, refreshed by directory mtime.
+
+    Usage:
+        with UsageCache() as cache:
+            usage = scan_usage(directory, cache=cache)
+
+    Args:
+        path: Database file (default: ~/.lazy-cli/usage.db)
+    """
+
+    def __init__(self, path: Optional[Union[Path, str]] = None) -> None:
+        self.path = Path(path) if path is not None else get_usage_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS directories;"
+                + _SCHEMA
+                + f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+
+    def __enter__(self) -> "UsageCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    def load(self, root: str) -> Dict[str, DirectoryUsage]:
+        """
+        Read the summaries of a directory and everything below it.
+
+        Args:
+            root: Absolute path of the directory
+
+        Returns:
+            Summaries by directory path
+        """
+        encoded = os.fsencode(root)
+        prefix = os.fsencode(os.path.join(root, ""))
+        # Paths under the prefix sort between it and the prefix with its
+        # separator incremented
+        upper = prefix[:-1] + bytes([prefix[-1] + 1])
+        cached: Dict[str, DirectoryUsage] = {}
+        rows = self._db.execute(
+            "SELECT path, mtime, device, size, files, listing FROM directories"
+            " WHERE path = ? OR (path >= ? AND path < ?)",
+            (encoded, prefix, upper),
+        )
+        for path, mtime, device, size, files, listing in rows:
+            subdirs, top, links = json.loads(listing)
+            path = os.fsdecode(path)
+            cached[path] = DirectoryUsage(
+                path,
+                mtime,
+                device,
+                size,
+                files,
+                subdirs,
+                [(file_size, name) for file_size, name in top],
+                [(inode, file_size, name) for inode, file_size, name in links],
+            )
+        return cached
+
+    def store(self, listed: Iterable[DirectoryUsage], removed: Iterable[str] = ()) -> None:
+        """
+        Save newly listed directories and forget vanished ones.
+
+        Args:
+            listed: Summaries of the directories listed from disk
+            removed: Paths of directories that no longer exist
+        """
+        batch: List[Tuple[bytes, Optional[int], int, int, int, str]] = []
+        for usage in listed:
+            listing = json.dumps([usage.subdirs, usage.top, usage.links], separators=(",", ":"))
+            path = os.fsencode(usage.path)
+            batch.append((path, usage.mtime, usage.device, usage.size, usage.files, listing))
+            if len(batch) >= WRITE_BATCH:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?)", batch
+                )
+                batch.clear()
+        if batch:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?)", batch
+            )
+        self._db.executemany(
+            "DELETE FROM directories WHERE path = ?", ((os.fsencode(path),) for path in removed)
+        )
+        self._db.commit()
+
+
+def _summarize(path: str, cached: Optional[DirectoryUsage]) -> Tuple[DirectoryUsage, bool]:
+    """Answer a directory from the cache if its mtime is unchanged, else list it."""
+    st = os.stat(path)
+    if cached is not None and cached.mtime == st.st_mtime_ns and cached.device == st.st_dev:
+        return cached, False
+    return list_directory(path, st), True
+
+
+def scan_usage(
+    root: Union[Path, str],
+    cache: Optional[UsageCache] = None,
+    workers: Optional[int] = None,
+    one_file_system: bool = False,
+    on_error: Optional[Callable[[str, OSError], None]] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> Dict[str, DirectoryUsage]:
+    """
+    Summarize every directory of a tree and add up subtree totals.
+
+    Args:
+        root: Directory to scan
+        cache: Cache of directory summaries (None lists everything)
+        workers: Number of listing threads
+        one_file_system: Whether to skip directories on other devices
+        on_error: Called with (path, error) for directories that cannot be
+            listed; errors are raised if None (except for the root's)
+        stats: Dictionary whose "listed" and "reused" counts are incremented
+
+    Returns:
+        Summaries by directory path, with total and total_files set; parents
+        come before their subdirectories
+
+    Raises:
+        OSError: If the root cannot be listed
+    """
+    root = os.path.abspath(os.fspath(root))
+    with tracer.span("load_cache"):
+        cached = cache.load(root) if cache is not None else {}
+
+    results: Dict[str, DirectoryUsage] = {}
+    listed: List[DirectoryUsage] = []
+    root_device: Optional[int] = None
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WALK_WORKERS) as pool:
+        pending: Dict[Future, str] = {pool.submit(_summarize, root, cached.get(root)): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    usage, was_listed = future.result()
+                except FileNotFoundError:
+                    if path == root:
+                        raise
+                    # Deleted since its parent was listed
+                    continue
+                except OSError as error:
+                    if path == root or on_error is None:
+                        raise
+                    on_error(path, error)
+                    continue
+                if root_device is None:
+                    root_device = usage.device
+                elif one_file_system and usage.device != root_device:
+                    continue
+                results[path] = usage
+                if was_listed:
+                    listed.append(usage)
+                for name in usage.subdirs:
+                    subdir = os.path.join(path, name)
+                    pending[pool.submit(_summarize, subdir, cached.get(subdir))] = subdir
+
+    tracer.count("directories_listed", len(listed))
+    if stats is not None:
+        stats["listed"] += len(listed)
+        stats["reused"] += len(results) - len(listed)
+    if cache is not None:
+        with tracer.span("store_cache"):
+            cache.store(listed, (path for path in cached if path not in results))
+
+    add_totals(root, results)
+    return results
+
+
+def add_totals(root: str, results: Dict[str, DirectoryUsage]) -> None:
+    """
+    Set the subtree totals of scanned directories, counting hard links once.
+
+    Args:
+        root: Scanned directory
+        results: Summaries by path, parents before their subdirectories
+    """
+    seen: Set[Tuple[int, int]] = set()
+    for path in sorted(path for path, usage in results.items() if usage.links):
+        usage = results[path]
+        usage.total, usage.total_files = usage.size, usage.files
+        usage.duplicates = set()
+        for inode, size, name in usage.links:
+            key = (usage.device, inode)
+            if key in seen:
+                usage.duplicates.add(name)
+                usage.total -= size
+                usage.total_files -= 1
+            else:
+                seen.add(key)
+    for usage in results.values():
+        if not usage.links:
+            usage.total, usage.total_files = usage.size, usage.files
+            usage.duplicates = set()
+
+    # Subdirectories come after their parents, so reversed order adds each
+    # complete subtree to its parent
+    for path, usage in reversed(list(results.items())):
+        if path == root:
+            continue
+        parent = results.get(os.path.dirname(path))
+        if parent is not None:
+            parent.total += usage.total
+            parent.total_files += usage.total_files
+
+
+def largest_directories(
+    results: Dict[str, DirectoryUsage], count: int, root: Optional[str] = None
+) -> List[DirectoryUsage]:
+    """
+    Get the directories with the largest subtree totals.
+
+    Args:
+        results: Summaries from scan_usage()
+        count: Number of directories
+        root: Directory to leave out (the scanned one)
+
+    Returns:
+        Up to count summaries, largest first
+    """
+    candidates = (usage for path, usage in results.items() if path != root)
+    return heapq.nlargest(count, candidates, key=lambda usage: usage.total)
+
+
+def largest_files(results: Dict[str, DirectoryUsage], count: int) -> List[Tuple[int, str]]:
+    """
+    Get the largest files of the scanned tree.
+
+    Args:
+        results: Summaries from scan_usage()
+        count: Number of files (at most TOP_FILES are remembered per directory)
+
+    Returns:
+        Up to count (size, path) tuples, largest first
+    """
+    candidates = (
+        (size, os.path.join(path, name))
+        for path, usage in results.items()
+        for size, name in usage.top
+        if name not in usage.duplicates
+    )
+    return heapq.nlargest(count, candidates)
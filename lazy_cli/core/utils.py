@@ -2,12 +2,25 @@
 Shared utility functions for lazy-cli plugins.
 """
 
+import json
+import os
+import re
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, TextIO, Union
 import typer
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeRemainingColumn,
+)
+from lazy_cli.core.trace import tracer
 
 console = Console()
 
@@ -80,17 +93,37 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} PB"
 
 
-def get_file_extension(file_path: Path) -> str:
+def parse_size(text: str) -> int:
+    """
+    Parse a human-readable file size.
+
+    Args:
+        text: Size such as "512", "10K", "1.5MB" or "2 GiB" (binary units)
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the text is not a size
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([KMGTP]?)(?:I?B)?\s*", text, re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Invalid size: {text!r}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGTP".index(unit.upper() or " "))
+
+
+def get_file_extension(file_path: Union[Path, str]) -> str:
     """
     Get file extension without the dot.
     
     Args:
-        file_path: Path to file
+        file_path: Path to file, or just its name
     
     Returns:
         File extension (lowercase, without dot)
     """
-    return file_path.suffix.lower().lstrip(".")
+    return os.path.splitext(os.fspath(file_path))[1].lower().lstrip(".")
 
 
 def ensure_directory(directory: Path) -> None:
@@ -135,3 +168,166 @@ def create_progress() -> Progress:
         TextColumn("[progress.description]{task.description}"),
         console=console,
     )
+
+
+class Reporter:
+    """
+    Reports the per-item results of a long-running operation.
+
+    In "text" mode a single progress display shows the count, throughput
+    and ETA, redrawn at most refresh_per_second times per second; per-item
+    lines are only printed when verbose is set (errors are always printed).
+    In "jsonl" mode every item is written to stdout as an unstyled JSON
+    record, buffered and flushed in blocks, for use in pipelines.
+
+    Usage:
+        with Reporter(output, verbose, description="Moving") as reporter:
+            reporter.start(total=len(items))
+            for item in items:
+                reporter.success(f"Moved: {item}", event="moved", source=item)
+
+    Args:
+        output: "text" or "jsonl"
+        verbose: Whether to print a line per item in text mode
+        description: Label of the progress display
+        unit: Name of the items, shown with the throughput
+        refresh_per_second: Maximum number of progress redraws per second
+        stream: Where JSON records go (defaults to stdout)
+        buffer_size: Number of JSON records written at once
+    """
+
+    def __init__(
+        self,
+        output: str = "text",
+        verbose: bool = False,
+        description: str = "Working",
+        unit: str = "files",
+        refresh_per_second: float = 4,
+        stream: Optional[TextIO] = None,
+        buffer_size: int = 1000,
+    ) -> None:
+        if output not in ("text", "jsonl"):
+            raise ValueError(f"Unknown output format: {output!r}")
+        self.output = output
+        self.verbose = verbose
+        self.description = description
+        self.unit = unit
+        self.interval = 1.0 / refresh_per_second
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.counts: Dict[str, int] = {}
+        self._buffer: List[str] = []
+        self._progress: Optional[Progress] = None
+        self._task: Optional[Any] = None
+        self._done = 0
+        self._shown = 0
+        self._started = 0.0
+        self._last_refresh = 0.0
+
+    @property
+    def is_jsonl(self) -> bool:
+        """Whether records are written as JSON Lines."""
+        return self.output == "jsonl"
+
+    def __enter__(self) -> "Reporter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self, total: Optional[int] = None) -> None:
+        """
+        Start counting items (and show the progress display on a terminal).
+
+        Args:
+            total: Expected number of items, if known (enables the ETA)
+        """
+        self._started = time.monotonic()
+        if self.is_jsonl or not console.is_terminal or self._progress is not None:
+            return
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("[cyan]{task.fields[rate]}"),
+            TimeRemainingColumn(),
+            console=console,
+            auto_refresh=False,
+            transient=True,
+        )
+        self._task = self._progress.add_task(self.description, total=total, rate="")
+        self._progress.start()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Write a JSON record (no-op in text mode).
+
+        Args:
+            event: Record type
+            **fields: Record fields
+        """
+        if not self.is_jsonl:
+            return
+        self._buffer.append(json.dumps({"event": event, **fields}, ensure_ascii=False))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def _item(self, level: str, message: str, event: str, fields: Dict[str, Any]) -> None:
+        """Count an item and report it according to the mode."""
+        self.counts[event] = self.counts.get(event, 0) + 1
+        self._done += 1
+        if self.is_jsonl:
+            self.emit(event, **fields)
+            return
+
+        if level == "error":
+            print_error(message)
+        elif self.verbose:
+            (print_success if level == "success" else print_warning)(message)
+
+        if self._progress is not None:
+            now = time.monotonic()
+            if now - self._last_refresh >= self.interval:
+                self._refresh(now)
+
+    def _refresh(self, now: float) -> None:
+        """Redraw the progress display."""
+        assert self._progress is not None
+        elapsed = max(now - self._started, 1e-9)
+        self._progress.update(
+            self._task,
+            advance=self._done - self._shown,
+            rate=f"{self._done / elapsed:,.0f} {self.unit}/s",
+        )
+        self._shown = self._done
+        with tracer.span("render_progress"):
+            self._progress.refresh()
+        self._last_refresh = now
+
+    def success(self, message: str, event: str = "done", **fields: Any) -> None:
+        """Report an item that succeeded."""
+        self._item("success", message, event, fields)
+
+    def skipped(self, message: str, event: str = "skipped", **fields: Any) -> None:
+        """Report an item that was skipped."""
+        self._item("warning", message, event, fields)
+
+    def error(self, message: str, event: str = "error", **fields: Any) -> None:
+        """Report an item that failed."""
+        self._item("error", message, event, dict(fields, message=message))
+
+    def flush(self) -> None:
+        """Write buffered JSON records."""
+        if self._buffer:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self._buffer) + "\n")
+            stream.flush()
+            self._buffer.clear()
+
+    def stop(self) -> None:
+        """Flush records and remove the progress display."""
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+        self.flush()
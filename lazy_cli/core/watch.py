@@ -0,0 +1,312 @@
+"""
+Watching a directory for new files.
+
+DirectoryWatcher reports files that appear in a directory, in batches, once
+they are complete. On Linux it subscribes to inotify (through ctypes, no
+extra dependency) for files closed after writing or moved in, and blocks in
+select() between events, so an idle watch uses no CPU. Elsewhere, or when
+inotify cannot be used, it polls: every interval it stats only the
+directory, lists it again only when the directory's mtime changed, and
+stats the files it is still waiting for.
+
+Files are handed over once the directory has been quiet for a settle
+period, so a burst of events (a whole folder being copied in) becomes one
+batch; during a long, continuous burst, files that have settled are handed
+over at least every max_delay seconds.
+
+Partial downloads (``.part``, ``.crdownload``, ...) are ignored until the
+browser renames them to their final name.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import socket
+import stat
+import struct
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lazy_cli.core.files import FileRecord
+
+# Suffixes of files still being downloaded
+PARTIAL_SUFFIXES = (".part", ".crdownload", ".download", ".partial", ".opdownload")
+
+# Seconds a file must stay untouched before it is reported
+DEFAULT_SETTLE = 1.0
+
+# Longest time settled files wait for a burst to end
+DEFAULT_MAX_DELAY = 10.0
+
+# Seconds between checks when polling
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify event flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class Inotify:
+    """
+    Minimal inotify binding.
+
+    Raises:
+        OSError: If inotify is not available
+    """
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._libc = libc
+        self.fd = fd
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch a path for the events in mask; returns the watch descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def read_events(self) -> List[Tuple[int, str]]:
+        """Read all queued events as (mask, name) pairs without blocking."""
+        events: List[Tuple[int, str]] = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Reports complete new files in a directory, in batches.
+
+    Usage:
+        watcher = DirectoryWatcher(directory)
+        for batch in watcher.batches():   # runs until watcher.stop()
+            handle(batch)
+
+    Args:
+        directory: Directory to watch (not recursive)
+        include_hidden: Whether to report hidden files
+        settle: Seconds without events before files are reported
+        max_delay: Longest time a settled file waits for a burst to end
+        poll_interval: Seconds between checks when polling
+        use_inotify: Use inotify if available (otherwise always poll)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        include_hidden: bool = False,
+        settle: float = DEFAULT_SETTLE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.include_hidden = include_hidden
+        self.settle = settle
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        # name -> (time of its last event, (size, mtime) when last seen)
+        self._pending: Dict[str, Tuple[float, Optional[Tuple[int, int]]]] = {}
+        self._last_event = 0.0
+        self._burst_start = 0.0
+        # A socket pair rather than a pipe: select() only takes sockets on Windows
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_write.setblocking(False)
+        self._stopped = False
+
+        self._inotify: Optional[Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+                self._inotify.add_watch(self.directory, IN_CLOSE_WRITE | IN_MOVED_TO)
+            except OSError:
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+
+        # Polling state: directory mtime and listing when last checked
+        self._dir_mtime: Optional[int] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        if self._inotify is None:
+            self._dir_mtime, self._snapshot = self._list()
+
+    @property
+    def mode(self) -> str:
+        """ "inotify" or "polling"."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def stop(self) -> None:
+        """Make batches() return (safe to call from another thread)."""
+        self._stopped = True
+        try:
+            self._wake_write.send(b"x")
+        except OSError:
+            # Already woken up (buffer full) or closed
+            pass
+
+    def close(self) -> None:
+        """Release the inotify descriptor and the wake-up sockets."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._wake_read.close()
+        self._wake_write.close()
+
+    def _wanted(self, name: str) -> bool:
+        """Check whether a file name should be reported at all."""
+        if not self.include_hidden and name.startswith("."):
+            return False
+        return not name.lower().endswith(PARTIAL_SUFFIXES)
+
+    def _list(self) -> Tuple[Optional[int], Dict[str, Tuple[int, int]]]:
+        """List the directory: its mtime and each wanted file's (size, mtime)."""
+        try:
+            dir_mtime = os.stat(self.directory).st_mtime_ns
+            snapshot = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and self._wanted(entry.name):
+                        st = entry.stat(follow_symlinks=False)
+                        snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+            return dir_mtime, snapshot
+        except OSError:
+            return None, {}
+
+    def _touch(self, name: str, signature: Optional[Tuple[int, int]] = None) -> None:
+        """Record an event for a file, (re)starting the settle period."""
+        now = time.monotonic()
+        if not self._pending:
+            self._burst_start = now
+        self._pending[name] = (now, signature)
+        self._last_event = now
+
+    def _poll(self) -> None:
+        """Find new or changed files by polling."""
+        try:
+            dir_mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return
+        if dir_mtime != self._dir_mtime:
+            # Entries were added, removed or renamed: list again
+            self._dir_mtime, snapshot = self._list()
+            for name, signature in snapshot.items():
+                if self._snapshot.get(name) != signature:
+                    self._touch(name, signature)
+            self._snapshot = snapshot
+
+        # Files still being written change size or mtime without touching the directory
+        for name, (_, signature) in list(self._pending.items()):
+            try:
+                st = os.lstat(os.path.join(self.directory, name))
+            except OSError:
+                del self._pending[name]
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current != signature:
+                self._touch(name, current)
+                self._snapshot[name] = current
+
+    def _read_inotify(self) -> None:
+        """Turn queued inotify events into pending files."""
+        assert self._inotify is not None
+        for mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: treat every file as new
+                for listed in self._list()[1]:
+                    self._touch(listed)
+            elif name and not mask & IN_ISDIR and self._wanted(name):
+                self._touch(name)
+
+    def _flush_time(self) -> float:
+        """When pending files are handed over: after a quiet period, or max_delay."""
+        return min(self._last_event + self.settle, self._burst_start + self.max_delay)
+
+    def _ready(self) -> List[FileRecord]:
+        """Hand over the settled files once the burst is over (or has lasted too long)."""
+        now = time.monotonic()
+        batch: List[FileRecord] = []
+        if not self._pending or now < self._flush_time():
+            return batch
+        for name, (touched, _) in list(self._pending.items()):
+            if touched + self.settle > now:
+                # Still changing: wait for the next batch
+                continue
+            del self._pending[name]
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                # Moved away or deleted in the meantime
+                continue
+            if stat.S_ISREG(st.st_mode):
+                batch.append(FileRecord(path, name, st))
+        if self._pending:
+            self._burst_start = now
+        batch.sort(key=lambda record: record.name)
+        return batch
+
+    def _timeout(self) -> Optional[float]:
+        """How long to wait for the next event (None = until something happens)."""
+        timeout = None
+        if self._pending:
+            timeout = max(0.0, self._flush_time() - time.monotonic())
+        if self._inotify is None:
+            timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+        return timeout
+
+    def batches(self) -> Iterator[List[FileRecord]]:
+        """
+        Wait for new files and yield them in batches, until stop() is called.
+
+        Yields:
+            Non-empty lists of FileRecord, sorted by name
+        """
+        watched: List[object] = [self._wake_read]
+        if self._inotify is not None:
+            watched.append(self._inotify.fileno())
+
+        while not self._stopped:
+            readable, _, _ = select.select(watched, [], [], self._timeout())
+            if self._wake_read in readable or self._stopped:
+                return
+
+            if self._inotify is not None:
+                if readable:
+                    self._read_inotify()
+            else:
+                self._poll()
+
+            batch = self._ready()
+            if batch:
+                yield batch
@@ -1,56 +1,174 @@
 """
 Main entry point for lazy-cli.
-Initializes the CLI and dynamically loads all plugins.
+
+This is a thin dispatch layer: trivial invocations (``--version``,
+top-level ``--help`` and shell completion) are answered from cached plugin
+metadata using only the standard library. Everything else builds the full
+Typer application in lazy_cli.cli, which imports typer and rich; pydantic
+and yaml are only imported by the commands that read the config.
 """
 
-import typer
-from rich.console import Console
-from lazy_cli.core.plugin_loader import load_plugins
+import os
+import sys
+from typing import Any, List, Optional
+
 from lazy_cli import __version__
 
-# Initialize the main CLI app
-app = typer.Typer(
-    name="lazy",
-    help="🚀 Life Automation CLI - Automate boring digital chores with ease!",
-    add_completion=True,
-    rich_markup_mode="rich",
-)
-
-console = Console()
-
-
-def version_callback(value: bool):
-    """Display version information."""
-    if value:
-        console.print(f"[bold blue]lazy-cli[/bold blue] version [green]{__version__}[/green]")
-        raise typer.Exit()
-
-
-@app.callback()
-def main(
-    version: bool = typer.Option(
-        None,
-        "--version",
-        "-v",
-        callback=version_callback,
-        is_eager=True,
-        help="Show version and exit",
+APP_HELP = "🚀 Life Automation CLI - Automate boring digital chores with ease!"
+
+APP_DESCRIPTION = """
+🚀 lazy-cli: Life Automation CLI
+
+Automate boring digital chores with simple, powerful commands.
+Each command is a plugin that you can use or extend!
+
+Use [bold]lazy --help[/bold] to see all available commands.
+Use [bold]lazy --profile-startup[/bold] to see where startup time goes.
+Use [bold]lazy --trace out.json COMMAND[/bold] to see where a command spends its time.
+"""
+
+# Top-level options, mirrored from lazy_cli.cli for the fast help path
+APP_OPTIONS = [
+    ("--version, -v", "Show version and exit"),
+    ("--trace FILE", "Write a Chrome trace of the command to FILE ('-' prints a summary)"),
+    ("--install-completion", "Install completion for the current shell."),
+    (
+        "--show-completion",
+        "Show completion for the current shell, to copy it or customize the installation.",
     ),
-):
+    ("--help", "Show this message and exit."),
+]
+
+# Environment variable Typer uses for shell completion requests
+COMPLETE_VAR = "_LAZY_COMPLETE"
+
+
+def _use_color() -> bool:
+    """Check whether ANSI colors should be written to stdout."""
+    return sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+
+def _strip_markup(text: str) -> str:
+    """Remove the simple [bold]...[/bold] style tags used in help texts."""
+    for tag in ("[bold]", "[/bold]"):
+        text = text.replace(tag, "")
+    return text
+
+
+def print_version() -> None:
+    """Print version information without importing rich."""
+    if _use_color():
+        print(f"\033[1;34mlazy-cli\033[0m version \033[32m{__version__}\033[0m")
+    else:
+        print(f"lazy-cli version {__version__}")
+
+
+def print_help(prog_name: str = "lazy") -> None:
+    """
+    Print top-level help from the plugin manifest without importing rich.
+
+    Args:
+        prog_name: Program name shown in the usage line
+    """
+    from lazy_cli.core.manifest import load_manifest
+
+    commands = sorted(
+        (plugin["name"], plugin["help"])
+        for plugin in load_manifest()
+        if plugin.get("name") and not plugin.get("error")
+    )
+
+    lines = [f"Usage: {prog_name} [OPTIONS] COMMAND [ARGS]...", ""]
+    description = _strip_markup(APP_DESCRIPTION).strip().split("\n")
+    lines += ["  " + line if line else "" for line in description]
+
+    for title, rows in (("Options", APP_OPTIONS), ("Commands", commands)):
+        if not rows:
+            continue
+        width = max(len(name) for name, _ in rows)
+        lines += ["", f"{title}:"]
+        lines += [f"  {name.ljust(width)}  {text}" for name, text in rows]
+
+    print("\n".join(lines))
+
+
+def _fast_path(argv: List[str]) -> Optional[int]:
+    """
+    Handle invocations that do not need the Typer application.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        Exit code if the invocation was handled, otherwise None
+    """
+    if argv in (["--version"], ["-v"]):
+        print_version()
+        return 0
+
+    if argv == ["--help"]:
+        print_help()
+        return 0
+
+    return None
+
+
+def run() -> None:
     """
-    🚀 lazy-cli: Life Automation CLI
-    
-    Automate boring digital chores with simple, powerful commands.
-    Each command is a plugin that you can use or extend!
-    
-    Use [bold]lazy --help[/bold] to see all available commands.
+    Console-script entry point.
+
+    Answers shell completion and other trivial invocations directly,
+    handles ``--profile-startup``, and hands everything else to the Typer
+    application. ``--trace`` is handled here rather than by Typer so that
+    plugin discovery is traced as well.
     """
-    pass
+    complete = os.environ.get(COMPLETE_VAR, "")
+    if complete.startswith("complete_"):
+        # Answered from the completion cache; source_* requests go to Typer
+        from lazy_cli.core.completion import complete as complete_from_cache
+
+        sys.exit(complete_from_cache(complete[len("complete_") :]))
+
+    from lazy_cli.core.profiler import profiler
+
+    argv = sys.argv[1:]
+
+    if any(arg.startswith("--trace") for arg in argv):
+        from lazy_cli.core.trace import pop_trace_option, start_tracing
+
+        trace_output = pop_trace_option(argv)
+        if trace_output is not None:
+            sys.argv[1:] = argv
+            start_tracing(trace_output)
+
+    if "--profile-startup" in argv:
+        from lazy_cli.core.profiler import main as profile_startup
+
+        sys.exit(profile_startup(argv))
+
+    if not complete:
+        with profiler.phase("fast path"):
+            exit_code = _fast_path(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from lazy_cli.core.trace import tracer
+
+    with tracer.span("startup"):
+        from lazy_cli.cli import app
+
+    with tracer.span("command", argv=argv):
+        app()
+
 
+def __getattr__(name: str) -> Any:
+    """Build the Typer application on first access to lazy_cli.main.app."""
+    if name in ("app", "console", "version_callback"):
+        from lazy_cli import cli
 
-# Dynamically load all plugins
-load_plugins(app)
+        return getattr(cli, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app()
+    run()
@@ -0,0 +1,358 @@
+"""
+Plugin: Backup
+Back up a folder to timestamped zip archives, archiving only what changed.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+import typer
+from rich.console import Console
+from lazy_cli.core.archive import DEFAULT_LEVEL, ZipWriter, compress_files
+from lazy_cli.core.backup import BackupManifest, FileState, get_manifest_path
+from lazy_cli.core.files import FileRecord, walk_files
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.utils import Reporter, format_size, print_error, print_success
+
+# Plugin metadata
+PLUGIN_NAME = "backup"
+PLUGIN_HELP = "Back up a folder to zip archives, only archiving changes"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+# Member listing the files deleted since the previous backup
+DELETED_LIST = ".lazy-backup/deleted.txt"
+
+# A file to archive: (record, path in the archive, state at the last backup)
+Change = Tuple[FileRecord, str, Optional[FileState]]
+
+
+def archive_name(destination: Path, name: str, now: Optional[float] = None) -> str:
+    """
+    Get a free archive file name: <name>-YYYYmmdd-HHMMSS.zip.
+
+    Args:
+        destination: Directory holding the archives
+        name: Backup name
+        now: Timestamp of the backup (defaults to the clock)
+
+    Returns:
+        File name of the new archive
+    """
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    candidate = f"{name}-{stamp}.zip"
+    number = 1
+    while (destination / candidate).exists():
+        number += 1
+        candidate = f"{name}-{stamp}-{number}.zip"
+    return candidate
+
+
+def iter_changes(
+    source: Path,
+    records: Iterable[FileRecord],
+    manifest: BackupManifest,
+    full: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+) -> Iterator[Tuple[Change, str, int]]:
+    """
+    Yield the files whose size or mtime differ from the last backup.
+
+    Unchanged files are marked as seen in the manifest and not read.
+
+    Args:
+        source: Backed-up directory
+        records: Files of the tree, e.g. from walk_files()
+        manifest: Manifest of the last backup, with a run begun
+        full: Whether to yield every file
+        stats: Dictionary whose "unchanged" count is incremented
+
+    Yields:
+        Tuples of (change, file path, size), as taken by compress_files()
+    """
+    prefix = os.path.join(os.fspath(source), "")
+    unchanged = 0
+    for record in records:
+        # walk_files() joins paths under the root, so slicing is enough
+        name = record.path[len(prefix) :]
+        if os.sep != "/":
+            name = name.replace(os.sep, "/")
+        previous = None if full else manifest.lookup(name)
+        if previous is not None and previous[0] == record.size and previous[1] == record.mtime:
+            manifest.unchanged(name)
+            unchanged += 1
+            continue
+        yield (record, name, previous), record.path, record.size
+
+    if stats is not None:
+        stats["unchanged"] += unchanged
+
+
+def run_backup(
+    source: Path,
+    destination: Path,
+    name: str,
+    level: int = DEFAULT_LEVEL,
+    full: bool = False,
+    include_hidden: bool = True,
+    exclude: Iterable[str] = (),
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
+) -> Dict[str, Any]:
+    """
+    Archive the files changed since the last backup, then update the manifest.
+
+    The archive is written under a temporary name and renamed when complete;
+    only then is the manifest committed. No archive is created when nothing
+    changed.
+
+    Args:
+        source: Directory to back up
+        destination: Directory receiving the archives and the manifest
+        name: Backup name (archive and manifest prefix)
+        level: zlib compression level (0 = store)
+        full: Archive every file, not only the changed ones
+        include_hidden: Whether to back up hidden files and directories
+        exclude: Glob patterns of files and directories to leave out
+        workers: Number of listing and compressing threads
+        reporter: Reporter for per-file results (defaults to a quiet one)
+
+    Returns:
+        Statistics: archived, bytes, compressed, unchanged, touched, deleted,
+        errors, plus "archive", the archive file name ("" if none)
+    """
+    reporter = reporter or Reporter()
+    destination.mkdir(parents=True, exist_ok=True)
+    stats: Dict[str, Any] = {
+        "archived": 0,
+        "bytes": 0,
+        "compressed": 0,
+        "unchanged": 0,
+        "touched": 0,
+        "deleted": 0,
+        "errors": 0,
+        "archive": "",
+    }
+
+    def on_scan_error(path: str, error: OSError) -> None:
+        stats["errors"] += 1
+        reporter.error(f"Cannot list {path}: {error.strerror}", path=path)
+
+    with BackupManifest(get_manifest_path(destination, name)) as manifest:
+        full = full or manifest.is_empty()
+        archive = archive_name(destination, name)
+        archive_path = destination / archive
+        tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+        manifest.begin(archive)
+
+        records = walk_files(
+            source,
+            include_hidden,
+            exclude=exclude,
+            skip_dirs=[destination],
+            workers=workers,
+            on_error=on_scan_error,
+        )
+        changes = iter_changes(source, records, manifest, full, stats)
+
+        try:
+            with open(tmp_path, "wb") as f, tracer.span("archive"):
+                writer = ZipWriter(f)
+                for (record, member_name, previous), member, error in compress_files(
+                    changes, level, workers
+                ):
+                    if member is None:
+                        stats["errors"] += 1
+                        # Keep its last backed-up state rather than forgetting it
+                        manifest.unchanged(member_name)
+                        reporter.error(
+                            f"Cannot read {record.path}: {error.strerror}", path=record.path
+                        )
+                        continue
+                    with tracer.span("write_member"):
+                        archived = previous is None or member.digest != previous[2]
+                        if archived:
+                            writer.write(member_name, member, record.mtime / 1e9)
+                        member.close()
+                    # Store the scanned values, which the next run compares
+                    manifest.update(member_name, record.size, record.mtime, member.digest, archived)
+                    if not archived:
+                        stats["touched"] += 1
+                        continue
+                    stats["archived"] += 1
+                    stats["bytes"] += member.size
+                    reporter.success(
+                        f"Archived: {member_name}",
+                        event="archived",
+                        path=member_name,
+                        size=member.size,
+                    )
+
+                # Deletions can only be told apart from unreadable directories
+                # after a complete scan
+                if stats["errors"] == 0:
+                    deleted = manifest.remove_missing()
+                    stats["deleted"] = len(deleted)
+                    if deleted and not full:
+                        listing = "".join(f"{path}\n" for path in deleted)
+                        writer.write_bytes(DELETED_LIST, listing.encode())
+                writer.close()
+
+            if writer.count:
+                os.replace(tmp_path, archive_path)
+                stats["archive"] = archive
+                stats["compressed"] = archive_path.stat().st_size
+            else:
+                os.unlink(tmp_path)
+            manifest.commit(stats["archived"], stats["bytes"], archived=writer.count > 0)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    return stats
+
+
+def _print_stats(reporter: Reporter, stats: Dict[str, Any], destination: Path) -> None:
+    """Print the summary of a backup (a "summary" record in JSONL mode)."""
+    if reporter.is_jsonl:
+        reporter.emit("summary", **stats)
+        reporter.flush()
+        return
+
+    console.print()
+    if stats["archive"]:
+        print_success(
+            f"Archived {stats['archived']} file(s), {format_size(stats['bytes'])} "
+            f"-> {format_size(stats['compressed'])}: {destination / stats['archive']}"
+        )
+    else:
+        print_success("No changes since the last backup, no archive written")
+
+    details = [f"{stats['unchanged']} unchanged"] if stats["unchanged"] else []
+    if stats["touched"]:
+        details.append(f"{stats['touched']} touched but identical")
+    if stats["deleted"]:
+        details.append(f"{stats['deleted']} deleted")
+    if details:
+        console.print(f"[dim]{', '.join(details)}[/dim]")
+
+    if stats["errors"]:
+        print_error(f"{stats['errors']} error(s); deleted files are only detected without errors")
+    console.print()
+
+
+@app.command()
+def main(
+    source: Path = typer.Argument(
+        ...,
+        help="Directory to back up",
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    destination: Path = typer.Argument(
+        ...,
+        help="Directory receiving the archives (created if needed)",
+        file_okay=False,
+        resolve_path=True,
+    ),
+    name: Optional[str] = typer.Option(
+        None,
+        "--name",
+        "-n",
+        help="Archive name prefix (default: the source folder's name)",
+    ),
+    exclude: List[str] = typer.Option(
+        [],
+        "--exclude",
+        "-e",
+        help="Glob pattern of files or directories to leave out (repeatable)",
+    ),
+    skip_hidden: bool = typer.Option(
+        False,
+        "--skip-hidden",
+        help="Leave out hidden files and directories (starting with .)",
+    ),
+    level: int = typer.Option(
+        DEFAULT_LEVEL,
+        "--level",
+        "-l",
+        min=0,
+        max=9,
+        help="Compression level, from 0 (store) to 9 (smallest)",
+    ),
+    full: bool = typer.Option(
+        False,
+        "--full",
+        help="Archive every file, not only those changed since the last backup",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of threads listing directories and compressing files",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: human-readable text, or one JSON record per file",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="Print a line per archived file instead of the progress display",
+    ),
+):
+    """
+    Back up a folder to a timestamped zip archive.
+
+    The first backup archives everything. Later ones only archive files
+    whose size or modification time changed (and whose contents really
+    differ), and list deleted files in .lazy-backup/deleted.txt. To
+    restore, extract the archives oldest first. Which file is in which
+    archive is kept in <name>.manifest.db next to them.
+    """
+    reporter = Reporter(output, verbose, description="Backing up")
+    name = name or source.name
+
+    if destination == source:
+        if reporter.is_jsonl:
+            reporter.emit("error", message="The destination cannot be the source")
+            reporter.flush()
+        else:
+            print_error("The destination cannot be the source")
+        raise typer.Exit(1)
+
+    if not reporter.is_jsonl:
+        console.print(f"\n[bold blue]📦 Backing up:[/bold blue] {source} -> {destination}\n")
+
+    reporter.start()
+    try:
+        stats = run_backup(
+            source,
+            destination,
+            name,
+            level,
+            full,
+            not skip_hidden,
+            exclude,
+            workers,
+            reporter,
+        )
+    finally:
+        reporter.stop()
+    _print_stats(reporter, stats, destination)
+    if stats["errors"]:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
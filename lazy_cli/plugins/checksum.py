@@ -0,0 +1,351 @@
+"""
+Plugin: Checksum
+Compute or verify MD5/SHA checksums of files and directory trees.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+import typer
+from rich.console import Console
+from lazy_cli.core.files import FileRecord, compile_globs, scan_files, walk_files
+from lazy_cli.core.hashing import (
+    ALGORITHMS,
+    DEFAULT_ALGORITHM,
+    Digests,
+    HashCache,
+    check_algorithms,
+    hash_files,
+)
+from lazy_cli.core.utils import Reporter, print_error, print_success, print_warning
+
+# Plugin metadata
+PLUGIN_NAME = "checksum"
+PLUGIN_HELP = "Compute or verify MD5/SHA checksums of files"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+# Checksum file lines: "<digest>  <path>" (GNU, "*" marks binary mode) and
+# "<ALGO> (<path>) = <digest>" (BSD tag style)
+GNU_LINE = re.compile(r"^\\?(?P<digest>[0-9a-fA-F]+) [ *](?P<path>.+)$")
+TAG_LINE = re.compile(r"^(?P<algorithm>[\w-]+) \((?P<path>.+)\) = (?P<digest>[0-9a-fA-F]+)$")
+
+# Algorithm of a GNU-style line, by digest length
+ALGORITHM_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+
+
+def iter_files(
+    paths: Iterable[Path],
+    recursive: bool = False,
+    include_hidden: bool = False,
+    exclude: Iterable[str] = (),
+    workers: Optional[int] = None,
+) -> Iterator[FileRecord]:
+    """
+    Yield the files to hash: given files, and the files inside given directories.
+
+    Args:
+        paths: Files and directories
+        recursive: Whether to include files in subdirectories
+        include_hidden: Whether to include hidden files
+        exclude: Glob patterns for files and directories to leave out
+        workers: Number of directory-listing threads in recursive mode
+
+    Yields:
+        FileRecord for each file
+    """
+    exclude = list(exclude)
+    exclude_pattern = compile_globs(exclude)
+
+    for path in paths:
+        if not path.is_dir():
+            yield FileRecord(str(path), path.name, path.stat())
+        elif recursive:
+            yield from walk_files(
+                path,
+                include_hidden,
+                exclude=exclude,
+                workers=workers,
+                on_error=lambda p, e: print_warning(f"Skipping {p}: {e.strerror}"),
+            )
+        else:
+            records = sorted(scan_files(path, include_hidden), key=lambda record: record.name)
+            for record in records:
+                if exclude_pattern is None or not exclude_pattern.match(record.name):
+                    yield record
+
+
+def format_digests(path: str, digests: Digests) -> List[str]:
+    """
+    Format the digests of a file as checksum file lines.
+
+    One algorithm gives the GNU format understood by sha256sum -c; several
+    give one BSD tag line per algorithm.
+
+    Args:
+        path: File path as displayed
+        digests: Algorithm -> hex digest
+
+    Returns:
+        List of lines
+    """
+    if len(digests) == 1:
+        return [f"{digest}  {path}" for digest in digests.values()]
+    return [f"{name.upper()} ({path}) = {digest}" for name, digest in digests.items()]
+
+
+def parse_checksum_file(checksum_file: Path) -> Tuple[List[Tuple[str, Digests]], int]:
+    """
+    Read a checksum file in GNU (sha256sum) or BSD tag format.
+
+    Args:
+        checksum_file: File to read
+
+    Returns:
+        Tuple of (list of (path, algorithm -> expected digest) in file
+        order, number of lines that could not be parsed)
+    """
+    entries: Dict[str, Digests] = {}
+    invalid = 0
+    with open(checksum_file, "r", encoding="utf-8", errors="surrogateescape") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+
+            match = TAG_LINE.match(line)
+            if match:
+                try:
+                    algorithm = check_algorithms([match["algorithm"]])[0]
+                except ValueError:
+                    invalid += 1
+                    continue
+            else:
+                match = GNU_LINE.match(line)
+                algorithm = ALGORITHM_BY_LENGTH.get(len(match["digest"])) if match else None
+                if algorithm is None:
+                    invalid += 1
+                    continue
+
+            entries.setdefault(match["path"], {})[algorithm] = match["digest"].lower()
+
+    return list(entries.items()), invalid
+
+
+def compute_checksums(
+    records: Iterable[FileRecord],
+    algorithms: List[str],
+    reporter: Reporter,
+    workers: Optional[int] = None,
+    cache: Optional[HashCache] = None,
+) -> Dict[str, int]:
+    """
+    Hash files and print their checksums (or JSON records).
+
+    Args:
+        records: Files to hash
+        algorithms: Algorithm names
+        reporter: Reporter for progress, errors and JSON output
+        workers: Number of hashing threads
+        cache: Digest cache to consult and fill
+
+    Returns:
+        Dictionary with statistics
+    """
+    for record, digests, error in hash_files(records, algorithms, workers, cache):
+        if digests is None:
+            reporter.error(f"{record.path}: {error.strerror}", path=record.path)
+            continue
+        reporter.success(record.path, event="hashed", path=record.path, **digests)
+        if not reporter.is_jsonl:
+            for line in format_digests(record.path, digests):
+                console.print(line, markup=False, highlight=False, soft_wrap=True)
+
+    return {"hashed": reporter.counts.get("hashed", 0), "errors": reporter.counts.get("error", 0)}
+
+
+def verify_checksums(
+    entries: List[Tuple[str, Digests]],
+    reporter: Reporter,
+    workers: Optional[int] = None,
+    cache: Optional[HashCache] = None,
+) -> Dict[str, int]:
+    """
+    Check files against expected digests.
+
+    Args:
+        entries: (path, algorithm -> expected digest) pairs
+        reporter: Reporter for per-file results
+        workers: Number of hashing threads
+        cache: Digest cache to consult and fill
+
+    Returns:
+        Dictionary with statistics (ok, failed, missing)
+    """
+    expected = dict(entries)
+    algorithms = [name for name in ALGORITHMS if any(name in d for d in expected.values())]
+
+    def records(paths: List[str]) -> Iterator[FileRecord]:
+        for path in paths:
+            try:
+                yield FileRecord(path, os.path.basename(path), os.stat(path))
+            except OSError as e:
+                reporter.error(
+                    f"{path}: FAILED open or read ({e.strerror})", event="missing", path=path
+                )
+
+    # Files listed with one algorithm are hashed with that one only
+    by_algorithms: Dict[Tuple[str, ...], List[str]] = {}
+    for path, digests in expected.items():
+        by_algorithms.setdefault(tuple(n for n in algorithms if n in digests), []).append(path)
+
+    for names, paths in by_algorithms.items():
+        for record, digests, error in hash_files(records(paths), names, workers, cache):
+            if digests is None:
+                reporter.error(
+                    f"{record.path}: FAILED open or read ({error.strerror})",
+                    event="missing",
+                    path=record.path,
+                )
+                continue
+            mismatched = [name for name in names if digests[name] != expected[record.path][name]]
+            if mismatched:
+                reporter.error(
+                    f"{record.path}: FAILED",
+                    event="failed",
+                    path=record.path,
+                    algorithms=mismatched,
+                )
+            else:
+                reporter.success(f"{record.path}: OK", event="ok", path=record.path)
+
+    return {
+        "ok": reporter.counts.get("ok", 0),
+        "failed": reporter.counts.get("failed", 0),
+        "missing": reporter.counts.get("missing", 0),
+    }
+
+
+@app.command()
+def main(
+    paths: Optional[List[Path]] = typer.Argument(
+        None,
+        help="Files or directories to hash",
+        exists=True,
+    ),
+    algorithm: List[str] = typer.Option(
+        [DEFAULT_ALGORITHM],
+        "--algorithm",
+        "-a",
+        help=f"Digest to compute, repeatable ({', '.join(ALGORITHMS)})",
+    ),
+    verify: Optional[Path] = typer.Option(
+        None,
+        "--verify",
+        "-c",
+        exists=True,
+        dir_okay=False,
+        help="Verify the files listed in a checksum file (sha256sum or BSD tag format)",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Also hash files in subdirectories",
+    ),
+    include_hidden: bool = typer.Option(
+        False,
+        "--include-hidden",
+        "-h",
+        help="Include hidden files (starting with .)",
+    ),
+    exclude: List[str] = typer.Option(
+        [],
+        "--exclude",
+        "-e",
+        help="Glob pattern of files or directories to leave out (repeatable)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of files hashed in parallel",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Read every file, ignoring digests cached in ~/.lazy-cli/hashes.db",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: checksum lines, or one JSON record per file",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="With --verify, print a line for every file (not only failures)",
+    ),
+):
+    """
+    Compute checksums of files, or verify them against a checksum file.
+
+    All requested digests are computed in a single read of each file, and
+    files are hashed in parallel. Digests are cached by inode, size and
+    modification time, so checking an unchanged tree again is nearly free.
+
+    The output of a single algorithm is compatible with sha256sum and
+    friends: lazy checksum -r dir > SHA256SUMS, then lazy checksum -c SHA256SUMS.
+    """
+    try:
+        algorithms = check_algorithms(algorithm)
+    except ValueError as e:
+        print_error(str(e))
+        raise typer.Exit(1) from None
+
+    if verify is None and not paths:
+        print_error("Give files or directories to hash, or --verify FILE")
+        raise typer.Exit(1)
+
+    # Computed digests are printed anyway; --verbose only adds the OK lines of --verify
+    reporter = Reporter(output, verbose and verify is not None, description="Hashing")
+    cache = None if no_cache else HashCache()
+    try:
+        reporter.start()
+        if verify is not None:
+            entries, invalid = parse_checksum_file(verify)
+            if invalid:
+                print_warning(f"{invalid} line(s) in {verify} are not valid checksum lines")
+            stats = verify_checksums(entries, reporter, workers, cache)
+            failed = stats["failed"] + stats["missing"]
+        else:
+            files = iter_files(paths or [], recursive, include_hidden, exclude, workers)
+            stats = compute_checksums(files, algorithms, reporter, workers, cache)
+            failed = stats["errors"]
+    finally:
+        reporter.stop()
+        if cache is not None:
+            cache.close()
+
+    if reporter.is_jsonl:
+        reporter.emit("summary", **stats)
+        reporter.flush()
+    elif verify is not None:
+        if failed:
+            print_error(
+                f"{stats['failed']} checksum(s) did not match, {stats['missing']} file(s) missing"
+            )
+        else:
+            print_success(f"All {stats['ok']} file(s) OK")
+
+    if failed:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,407 @@
+"""
+Plugin: Clean
+Delete files older than a number of days, and the directories they leave empty.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional
+import typer
+from rich.console import Console
+from lazy_cli.core.deleter import DeleteExecutor
+from lazy_cli.core.files import FileRecord, compile_globs, scan_files, walk_files
+from lazy_cli.core.records import RecordStore
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.utils import (
+    Reporter,
+    confirm_action,
+    create_table,
+    format_size,
+    parse_size,
+    print_error,
+    print_success,
+    print_warning,
+)
+
+# Plugin metadata
+PLUGIN_NAME = "clean"
+PLUGIN_HELP = "Delete files older than a number of days"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+NS_PER_DAY = 86400 * 10**9
+
+# Age bands of the preview table: (maximum age in days, label)
+AGE_BANDS = [(30, "Under 1 month"), (182, "1-6 months"), (365, "6-12 months")]
+OLDEST_BAND = "Over 1 year"
+BAND_LABELS = [label for _, label in AGE_BANDS] + [OLDEST_BAND]
+
+
+def age_band(mtime: int, now: int) -> str:
+    """
+    Get the age band of a file.
+
+    Args:
+        mtime: Modification time in nanoseconds
+        now: Current time in nanoseconds
+
+    Returns:
+        Band label (see AGE_BANDS)
+    """
+    age_days = (now - mtime) / NS_PER_DAY
+    for max_days, label in AGE_BANDS:
+        if age_days < max_days:
+            return label
+    return OLDEST_BAND
+
+
+def iter_expired(
+    directory: Path,
+    older_than: float,
+    min_size: int = 0,
+    include_hidden: bool = False,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    exclude: Iterable[str] = (),
+    workers: Optional[int] = None,
+    on_error: Optional[Callable[[str, OSError], None]] = None,
+    now: Optional[int] = None,
+) -> Iterator[FileRecord]:
+    """
+    Yield the files last modified more than older_than days ago.
+
+    Age and size come from the stat of each directory entry taken while
+    listing, so every file is stat'ed exactly once.
+
+    Args:
+        directory: Directory to clean
+        older_than: Minimum age in days
+        min_size: Minimum size in bytes
+        include_hidden: Whether to include hidden files and directories
+        recursive: Whether to include files in subdirectories
+        max_depth: Maximum depth to descend in recursive mode (None = no limit)
+        exclude: Glob patterns of files and directories to keep
+        workers: Number of directory-listing threads in recursive mode
+        on_error: Called with (path, error) for unreadable directories
+        now: Current time in nanoseconds (defaults to the clock)
+
+    Yields:
+        FileRecord for each expired file
+    """
+    cutoff = (now if now is not None else time.time_ns()) - int(older_than * NS_PER_DAY)
+
+    if recursive:
+        records: Iterable[FileRecord] = walk_files(
+            directory,
+            include_hidden,
+            max_depth=max_depth,
+            exclude=exclude,
+            workers=workers,
+            on_error=on_error,
+        )
+    else:
+        exclude_pattern = compile_globs(exclude)
+        records = (
+            record
+            for record in scan_files(directory, include_hidden)
+            if exclude_pattern is None or not exclude_pattern.match(record.name)
+        )
+
+    for record in records:
+        if record.mtime < cutoff and record.size >= min_size:
+            yield record
+
+
+def clean_files(
+    directory: Path,
+    records: Iterable[FileRecord],
+    dry_run: bool = False,
+    remove_empty_dirs: bool = True,
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
+) -> Dict[str, int]:
+    """
+    Delete files in batches, then the directories left empty.
+
+    Args:
+        directory: Directory being cleaned (never removed itself)
+        records: Files to delete, e.g. from iter_expired()
+        dry_run: If True, only report what would be deleted
+        remove_empty_dirs: Whether to remove directories emptied by the deletions
+        workers: Number of unlinking threads
+        reporter: Reporter for per-file results (defaults to a quiet one)
+
+    Returns:
+        Dictionary with statistics (deleted, bytes, directories, errors)
+    """
+    reporter = reporter or Reporter()
+
+    if dry_run:
+        reclaimable = 0
+        for record in records:
+            reclaimable += record.size
+            reporter.success(
+                f"Would delete: {record.path} ({format_size(record.size)})",
+                event="would_delete",
+                path=record.path,
+                size=record.size,
+            )
+        return _stats(reporter, reclaimable, 0)
+
+    def on_done(path: str, error: Optional[OSError]) -> None:
+        if error is None:
+            reporter.success(f"Deleted: {path}", event="deleted", path=path)
+        else:
+            reporter.error(f"Failed to delete {path}: {error.strerror}", path=path)
+
+    def on_dir_error(path: str, error: OSError) -> None:
+        reporter.error(f"Failed to remove directory {path}: {error.strerror}", path=path)
+
+    with tracer.span("delete"), DeleteExecutor(on_done, workers) as deleter:
+        for record in records:
+            deleter.submit(record.path, record.size)
+
+    directories = 0
+    if remove_empty_dirs:
+        with tracer.span("remove_empty_directories"):
+            directories = deleter.remove_empty_directories(
+                os.fspath(directory),
+                on_removed=lambda path: reporter.emit("removed_directory", path=path),
+                on_error=on_dir_error,
+            )
+
+    return _stats(reporter, deleter.bytes_deleted, directories)
+
+
+def _stats(reporter: Reporter, size: int, directories: int) -> Dict[str, int]:
+    """Statistics of a run from the reporter's item counts."""
+    counts = reporter.counts
+    return {
+        "deleted": counts.get("deleted", 0) + counts.get("would_delete", 0),
+        "bytes": size,
+        "directories": directories,
+        "errors": counts.get("error", 0),
+    }
+
+
+def print_age_table(reporter: Reporter, store: RecordStore) -> None:
+    """Show file counts and sizes per age band (a "scan" record in JSONL mode)."""
+    summary = store.summary()
+    if reporter.is_jsonl:
+        reporter.emit(
+            "scan",
+            total=store.total,
+            bytes=sum(size for _, size in summary.values()),
+            ages={band: {"count": count, "size": size} for band, (count, size) in summary.items()},
+        )
+        return
+
+    table = create_table("Files to Delete", ["Age", "Count", "Total Size"])
+    for band in BAND_LABELS:
+        if band in summary:
+            count, size = summary[band]
+            table.add_row(band, str(count), format_size(size))
+    console.print(table)
+
+
+def _print_stats(reporter: Reporter, stats: Dict[str, int], dry_run: bool) -> None:
+    """Print the summary of a run (a "summary" record in JSONL mode)."""
+    if reporter.is_jsonl:
+        reporter.emit("summary", dry_run=dry_run, **stats)
+        reporter.flush()
+        return
+
+    console.print()
+    if dry_run:
+        console.print(
+            f"[yellow]Would delete {stats['deleted']} file(s), "
+            f"reclaiming {format_size(stats['bytes'])}[/yellow]"
+        )
+    else:
+        print_success(f"Deleted {stats['deleted']} file(s), freed {format_size(stats['bytes'])}")
+
+    if stats["directories"] > 0:
+        count = stats["directories"]
+        print_success(f"Removed {count} empty director{'y' if count == 1 else 'ies'}")
+
+    if stats["errors"] > 0:
+        print_error(f"{stats['errors']} error(s)")
+
+    console.print()
+
+
+def _fail(reporter: Reporter, message: str) -> None:
+    """Report a fatal error and exit."""
+    if reporter.is_jsonl:
+        reporter.emit("error", message=message)
+        reporter.flush()
+    else:
+        print_error(message)
+    raise typer.Exit(1)
+
+
+@app.command()
+def main(
+    directory: Path = typer.Argument(
+        ...,
+        help="Directory to clean",
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    older_than: float = typer.Option(
+        30,
+        "--older-than",
+        "-t",
+        min=0,
+        help="Delete files last modified more than this many days ago",
+    ),
+    min_size: Optional[str] = typer.Option(
+        None,
+        "--min-size",
+        "-s",
+        help="Only delete files at least this large (e.g. 10M, 1.5G)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-d",
+        help="Show what would be deleted and how much space it takes",
+    ),
+    include_hidden: bool = typer.Option(
+        False,
+        "--include-hidden",
+        "-h",
+        help="Include hidden files (starting with .)",
+    ),
+    auto_confirm: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Skip confirmation and delete while scanning",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Also clean subdirectories",
+    ),
+    max_depth: Optional[int] = typer.Option(
+        None,
+        "--max-depth",
+        min=0,
+        help="Maximum depth to descend with --recursive (0 = only the top directory)",
+    ),
+    exclude: List[str] = typer.Option(
+        [],
+        "--exclude",
+        "-e",
+        help="Glob pattern of files or directories to keep (repeatable)",
+    ),
+    keep_empty_dirs: bool = typer.Option(
+        False,
+        "--keep-empty-dirs",
+        help="Do not remove directories left empty by the cleanup",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of threads listing directories and deleting files",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: human-readable text, or one JSON record per file",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="Print a line per file instead of the progress display",
+    ),
+):
+    """
+    Delete files older than a number of days.
+
+    Subdirectories are cleaned with --recursive, and directories left empty
+    by the deletions are removed (unless --keep-empty-dirs). With --yes,
+    files are deleted while the tree is still being listed, for unattended
+    runs over very large trees.
+    """
+    reporter = Reporter(output, verbose, description="Deleting")
+
+    try:
+        min_bytes = parse_size(min_size) if min_size is not None else 0
+    except ValueError as e:
+        _fail(reporter, str(e))
+
+    if not reporter.is_jsonl:
+        console.print(f"\n[bold blue]🧹 Cleaning files in:[/bold blue] {directory}\n")
+        if dry_run:
+            console.print("[yellow]🔍 DRY RUN MODE - No files will be deleted[/yellow]\n")
+
+    def on_scan_error(path: str, error: OSError) -> None:
+        reporter.error(f"Cannot list {path}: {error.strerror}", path=path)
+
+    expired = iter_expired(
+        directory,
+        older_than,
+        min_bytes,
+        include_hidden,
+        recursive,
+        max_depth,
+        exclude,
+        workers,
+        on_scan_error,
+    )
+    clean_options = {
+        "dry_run": dry_run,
+        "remove_empty_dirs": not keep_empty_dirs,
+        "workers": workers,
+    }
+
+    # Unattended: delete while scanning, without keeping the file list
+    if auto_confirm and not dry_run:
+        reporter.start()
+        stats = clean_files(directory, expired, reporter=reporter, **clean_options)
+        reporter.stop()
+        _print_stats(reporter, stats, dry_run)
+        return
+
+    now = time.time_ns()
+    with tracer.span("scan"):
+        store = RecordStore.from_files(
+            ((record, age_band(record.mtime, now)) for record in expired), BAND_LABELS
+        )
+
+    if store.total == 0 and not reporter.is_jsonl:
+        print_warning(f"No files older than {older_than:g} day(s) found.")
+        raise typer.Exit(0)
+
+    print_age_table(reporter, store)
+    if not reporter.is_jsonl:
+        total_size = sum(size for _, size in store.summary().values())
+        console.print(f"\n[bold]Total:[/bold] {store.total} file(s), {format_size(total_size)}\n")
+
+    if not dry_run:
+        if reporter.is_jsonl:
+            _fail(reporter, "--output jsonl cannot prompt; pass --yes")
+        if not confirm_action(f"Delete {store.total} file(s)?", default=False):
+            console.print("[yellow]Cancelled.[/yellow]")
+            raise typer.Exit(0)
+
+    reporter.start(total=store.total)
+    # In scan order, so files of one directory are deleted together
+    files = (store.record(index) for index in range(store.total))
+    stats = clean_files(directory, files, reporter=reporter, **clean_options)
+    reporter.stop()
+    _print_stats(reporter, stats, dry_run)
+
+
+if __name__ == "__main__":
+    app()
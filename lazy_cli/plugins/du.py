@@ -0,0 +1,195 @@
+"""
+Plugin: Disk Usage
+Show the total size of a folder and its largest directories and files.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+import typer
+from rich.console import Console
+from rich.markup import escape
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.usage import (
+    TOP_FILES,
+    DirectoryUsage,
+    UsageCache,
+    largest_directories,
+    largest_files,
+    scan_usage,
+)
+from lazy_cli.core.utils import create_table, format_size, print_error, print_warning
+
+# Plugin metadata
+PLUGIN_NAME = "du"
+PLUGIN_HELP = "Show disk usage and the largest directories and files"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+
+def build_report(
+    root: str,
+    results: Dict[str, DirectoryUsage],
+    top: int,
+    stats: Dict[str, int],
+) -> Dict[str, Any]:
+    """
+    Build the report of a scan.
+
+    Args:
+        root: Scanned directory
+        results: Summaries from scan_usage()
+        top: Number of directories and files to list
+        stats: Scan statistics: listed, reused, errors
+
+    Returns:
+        JSON-serializable report
+    """
+    usage = results[root]
+    return {
+        "path": root,
+        "size": usage.total,
+        "files": usage.total_files,
+        "directories": len(results),
+        "largest_directories": [
+            {"path": directory.path, "size": directory.total, "files": directory.total_files}
+            for directory in largest_directories(results, top, root)
+        ],
+        "largest_files": [
+            {"path": path, "size": size} for size, path in largest_files(results, top)
+        ],
+        **stats,
+    }
+
+
+def _print_report(report: Dict[str, Any], elapsed: float) -> None:
+    """Print a report as tables."""
+    root = report["path"]
+
+    if report["largest_directories"]:
+        table = create_table("Largest Directories", ["Size", "Files", "Directory"])
+        for directory in report["largest_directories"]:
+            table.add_row(
+                format_size(directory["size"]),
+                f"{directory['files']:,}",
+                escape(os.path.relpath(directory["path"], root)),
+            )
+        console.print(table)
+        console.print()
+
+    if report["largest_files"]:
+        table = create_table("Largest Files", ["Size", "File"])
+        for entry in report["largest_files"]:
+            table.add_row(format_size(entry["size"]), escape(os.path.relpath(entry["path"], root)))
+        console.print(table)
+        console.print()
+
+    console.print(
+        f"[bold]Total:[/bold] {format_size(report['size'])} in {report['files']:,} file(s), "
+        f"{report['directories']:,} director{'y' if report['directories'] == 1 else 'ies'}"
+    )
+    console.print(
+        f"[dim]{report['listed']:,} listed, {report['reused']:,} unchanged from the cache, "
+        f"in {elapsed:.1f}s[/dim]"
+    )
+    if report["errors"]:
+        print_error(f"{report['errors']} directory(ies) could not be listed")
+    console.print()
+
+
+@app.command()
+def main(
+    directory: Path = typer.Argument(
+        Path("."),
+        help="Directory to measure",
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    top: int = typer.Option(
+        10,
+        "--top",
+        "-n",
+        min=1,
+        max=TOP_FILES,
+        help="Number of largest directories and files to show",
+    ),
+    one_file_system: bool = typer.Option(
+        False,
+        "--one-file-system",
+        "-x",
+        help="Skip directories on other file systems",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="List every directory again instead of reusing unchanged ones",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of threads listing directories",
+    ),
+    output: Literal["text", "json"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: tables, or a JSON report",
+    ),
+):
+    """
+    Show the total size of a folder and its largest directories and files.
+
+    Directories are listed in parallel and hard-linked files are counted
+    once. Each directory's summary is cached in ~/.lazy-cli/usage.db with
+    its modification time, so measuring the same tree again only lists the
+    directories that changed. Files resized in place are not noticed until
+    their directory changes: use --no-cache to measure everything again.
+    """
+    root = os.fspath(directory)
+    stats = {"listed": 0, "reused": 0, "errors": 0}
+    errors: List[str] = []
+
+    def on_error(path: str, error: OSError) -> None:
+        stats["errors"] += 1
+        errors.append(f"Cannot list {path}: {error.strerror}")
+
+    if output == "text":
+        console.print(f"\n[bold blue]📊 Measuring:[/bold blue] {escape(root)}\n")
+
+    started = time.monotonic()
+    try:
+        with tracer.span("scan"):
+            if no_cache:
+                results = scan_usage(root, None, workers, one_file_system, on_error, stats)
+            else:
+                with UsageCache() as cache:
+                    results = scan_usage(root, cache, workers, one_file_system, on_error, stats)
+    except OSError as error:
+        if output == "json":
+            print(json.dumps({"error": f"Cannot list {root}: {error.strerror}"}))
+        else:
+            print_error(f"Cannot list {root}: {error.strerror}")
+        raise typer.Exit(1) from None
+    elapsed = time.monotonic() - started
+
+    report = build_report(root, results, top, stats)
+    if output == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        for message in errors:
+            print_warning(escape(message))
+        if errors:
+            console.print()
+        _print_report(report, elapsed)
+    if stats["errors"]:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
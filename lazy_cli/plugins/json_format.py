@@ -0,0 +1,207 @@
+"""
+Plugin: JSON
+Pretty-print, minify, sort or validate JSON and JSON Lines files of any size.
+"""
+
+import json
+import os
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Optional
+import typer
+from rich.console import Console
+from rich.markup import escape
+from lazy_cli.core.jsonstream import Utf8Reader, format_jsonl, format_stream
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.utils import format_size, print_error
+
+# Plugin metadata
+PLUGIN_NAME = "json"
+PLUGIN_HELP = "Pretty-print, minify or validate JSON files of any size"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+# Suffixes of JSON Lines files
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+def is_jsonl(path: str) -> bool:
+    """Whether a file name says it holds JSON Lines."""
+    return os.path.splitext(path)[1].lower() in JSONL_SUFFIXES
+
+
+def process_json(
+    source: str,
+    destination: Optional[str],
+    indent: Optional[int] = 2,
+    sort_keys: bool = False,
+    jsonl: bool = False,
+    workers: int = 1,
+) -> int:
+    """
+    Format or validate one JSON (or JSON Lines) file.
+
+    The output is written to a temporary file next to the destination and
+    only replaces it once the whole input is valid, so the destination may
+    be the source itself.
+
+    Args:
+        source: Input file, or "-" for standard input
+        destination: Output file, "-" for standard output, or None to only validate
+        indent: Spaces per level, or None to minify (JSON documents only)
+        sort_keys: Whether to sort object members by key
+        jsonl: Whether the input is JSON Lines (one compact record per line)
+        workers: Number of worker processes for JSON Lines
+
+    Returns:
+        Number of records for JSON Lines, 1 for a JSON document
+
+    Raises:
+        json.JSONDecodeError: At the first error, with its line and column
+        OSError: If a file cannot be read or written
+    """
+    tmp_path = None
+    if destination is not None and destination != "-":
+        tmp_path = f"{destination}.{os.getpid()}.tmp"
+
+    try:
+        with ExitStack() as stack:
+            if source == "-":
+                reader: IO = sys.stdin.buffer
+            else:
+                reader = stack.enter_context(open(source, "rb"))
+            if not jsonl:
+                # Strict UTF-8 whatever the locale, with the position of bad bytes
+                reader = Utf8Reader(reader)  # type: ignore[assignment]
+
+            writer: Optional[IO] = None
+            if tmp_path is not None:
+                writer = stack.enter_context(
+                    open(tmp_path, "wb")
+                    if jsonl
+                    else open(tmp_path, "w", encoding="utf-8", newline="")
+                )
+            elif destination == "-":
+                writer = sys.stdout.buffer if jsonl else sys.stdout
+
+            with tracer.span("format", jsonl=jsonl):
+                if jsonl:
+                    count = format_jsonl(reader, writer, sort_keys, workers)
+                else:
+                    format_stream(reader, writer, indent, sort_keys)
+                    count = 1
+
+        if tmp_path is not None:
+            os.replace(tmp_path, destination)
+    except BaseException:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        raise
+
+    return count
+
+
+@app.command()
+def main(
+    path: str = typer.Argument(
+        ...,
+        help="JSON or JSON Lines file, or - for standard input",
+    ),
+    indent: int = typer.Option(
+        2,
+        "--indent",
+        "-i",
+        min=0,
+        help="Spaces per indentation level",
+    ),
+    minify: bool = typer.Option(
+        False,
+        "--minify",
+        "-m",
+        help="Write compact JSON without whitespace",
+    ),
+    sort_keys: bool = typer.Option(
+        False,
+        "--sort-keys",
+        "-s",
+        help="Sort object members by key",
+    ),
+    check: bool = typer.Option(
+        False,
+        "--check",
+        "-c",
+        help="Only validate; report the line and column of the first error",
+    ),
+    jsonl: Optional[bool] = typer.Option(
+        None,
+        "--jsonl/--no-jsonl",
+        "-l",
+        help="Input is JSON Lines (default: detected from .jsonl/.ndjson)",
+    ),
+    write: Optional[Path] = typer.Option(
+        None,
+        "--write",
+        "-w",
+        help="Write the result to this file instead of standard output (may be PATH)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of processes for JSON Lines (default: one per CPU)",
+    ),
+):
+    """
+    Pretty-print, minify, sort or validate JSON.
+
+    Files are streamed: the whole document is never held in memory, so
+    multi-gigabyte files can be formatted or checked. JSON Lines files
+    are written one compact record per line and processed in parallel.
+    Output goes to standard output unless --write is given.
+    """
+    if path != "-" and not os.path.isfile(path):
+        print_error(f"File not found: {path}")
+        raise typer.Exit(1)
+
+    if jsonl is None:
+        jsonl = is_jsonl(path)
+    destination = None if check else (os.fspath(write) if write is not None else "-")
+    # Messages must not end up in the formatted JSON
+    status = Console(stderr=True) if destination == "-" else console
+
+    try:
+        count = process_json(
+            path,
+            destination,
+            None if minify else indent,
+            sort_keys,
+            jsonl,
+            workers or os.cpu_count() or 1,
+        )
+    except json.JSONDecodeError as e:
+        name = "<stdin>" if path == "-" else escape(path)
+        # One unwrapped line, like compiler errors, so editors and grep can use it
+        status.print(
+            f"[red]✗[/red] {name}: line {e.lineno}, column {e.colno}: {e.msg}", soft_wrap=True
+        )
+        raise typer.Exit(1) from None
+    except OSError as e:
+        status.print(f"[red]✗[/red] {escape(str(e.filename or path))}: {e.strerror}")
+        raise typer.Exit(1) from None
+
+    if check:
+        size = f" ({format_size(os.path.getsize(path))})" if path != "-" else ""
+        records = f", {count} record(s)" if jsonl else ""
+        status.print(f"[green]✓[/green] Valid JSON{records}{size}")
+    elif write is not None:
+        status.print(f"[green]✓[/green] Written to {write}")
+
+
+if __name__ == "__main__":
+    app()
@@ -3,21 +3,44 @@ Plugin: Organize Files
 Automatically organize files in a directory by moving them into subfolders based on their extension.
 """
 
-import shutil
+import os
 from pathlib import Path
-from typing import Dict, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 import typer
 from rich.console import Console
 from rich.table import Table
+from lazy_cli.core.categories import CategoryEngine
+from lazy_cli.core.files import FileRecord, compile_globs, list_names, scan_files, walk_files
+from lazy_cli.core.index import FileIndex
+from lazy_cli.core.mover import MoveCallback, MoveExecutor
+from lazy_cli.core.pipeline import prefetch
+from lazy_cli.core.plan import apply_plan, read_plan, undo_plan, write_plan
+from lazy_cli.core.records import RecordStore
+from lazy_cli.core.trace import tracer
 from lazy_cli.core.utils import (
+    Reporter,
     print_success,
     print_error,
     print_warning,
     confirm_action,
     format_size,
-    get_file_extension,
     ensure_directory,
 )
+from lazy_cli.core.watch import DirectoryWatcher
+from lazy_cli.core.config import get_config_value
 
 # Plugin metadata
 PLUGIN_NAME = "organize"
@@ -41,6 +64,26 @@ FILE_CATEGORIES = {
 }
 
 
+# Compiled lookup for the built-in categories
+DEFAULT_ENGINE = CategoryEngine(FILE_CATEGORIES)
+
+
+def build_category_engine(rules: Iterable[Any] = ()) -> CategoryEngine:
+    """
+    Compile the built-in categories plus user rules into a lookup engine.
+
+    Args:
+        rules: User rules (CategoryRule models or dicts), checked first
+
+    Returns:
+        CategoryEngine instance
+    """
+    rules = list(rules)
+    if not rules:
+        return DEFAULT_ENGINE
+    return CategoryEngine(FILE_CATEGORIES, rules)
+
+
 def get_category(extension: str) -> str:
     """
     Determine the category for a given file extension.
@@ -51,102 +94,562 @@ def get_category(extension: str) -> str:
     Returns:
         Category name
     """
-    ext_lower = extension.lower()
-    for category, extensions in FILE_CATEGORIES.items():
-        if ext_lower in extensions:
-            return category
-    return "Others"
+    return DEFAULT_ENGINE.classify_extension(extension)
 
 
-def scan_directory(directory: Path, include_hidden: bool = False) -> Dict[str, List[Path]]:
+def iter_directory(
+    directory: Path,
+    include_hidden: bool = False,
+    engine: Optional[CategoryEngine] = None,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    exclude: Iterable[str] = (),
+    workers: Optional[int] = None,
+    use_index: bool = False,
+) -> Iterator[Tuple[FileRecord, str]]:
     """
-    Scan directory and categorize files.
+    Scan a directory and categorize each file as soon as it is found.
+
+    Each file is stat'ed once by the scanner; the resulting FileRecord
+    carries its size into the preview table and its path into the move phase.
+
+    In recursive mode the tree is listed by a parallel walker that never
+    descends into the category folders at the top of the directory, and
+    files are returned in a deterministic depth-first order.
+
+    With use_index, the scan is answered from the persistent filesystem
+    index (~/.lazy-cli/index.db): only directories whose mtime changed since
+    the last scan are listed, and stored categories are reused.
     
     Args:
         directory: Directory to scan
         include_hidden: Whether to include hidden files
+        engine: Compiled categorization rules (defaults to the built-in categories)
+        recursive: Whether to include files in subdirectories
+        max_depth: Maximum subdirectory depth in recursive mode (None = no limit)
+        exclude: Glob patterns for files and directories to leave alone
+        workers: Number of directory-listing threads in recursive mode
+        use_index: Answer from the filesystem index instead of walking the tree
+
+    Yields:
+        Tuples of (file record, category)
+    """
+    engine = engine or DEFAULT_ENGINE
+
+    def on_error(path: str, e: OSError) -> None:
+        print_warning(f"Skipping {path}: {e.strerror}")
+
+    if use_index:
+        with FileIndex() as index:
+            yield from index.categorized(
+                directory,
+                engine,
+                include_hidden,
+                max_depth=max_depth if recursive else 0,
+                exclude=exclude,
+                skip_dirs=[directory / category for category in engine.categories],
+                on_error=on_error,
+            )
+        return
+
+    if recursive:
+        records = walk_files(
+            directory,
+            include_hidden,
+            max_depth=max_depth,
+            exclude=exclude,
+            skip_dirs=[directory / category for category in engine.categories],
+            workers=workers,
+            on_error=on_error,
+        )
+    else:
+        exclude_pattern = compile_globs(exclude)
+        records = (
+            record
+            for record in scan_files(directory, include_hidden)
+            if exclude_pattern is None or not exclude_pattern.match(record.name)
+        )
+
+    for record in records:
+        yield record, engine.classify(record.name, record.size)
+
+
+def scan_directory(
+    directory: Path,
+    include_hidden: bool = False,
+    engine: Optional[CategoryEngine] = None,
+    recursive: bool = False,
+    max_depth: Optional[int] = None,
+    exclude: Iterable[str] = (),
+    workers: Optional[int] = None,
+    use_index: bool = False,
+) -> RecordStore:
+    """
+    Scan directory and categorize files.
+
+    Takes the same arguments as iter_directory(). The files are kept in a
+    compact RecordStore (about 60 bytes per file) rather than one object
+    per file.
     
     Returns:
-        Dictionary mapping categories to lists of files
+        RecordStore mapping categories to their files
+    """
+    engine = engine or DEFAULT_ENGINE
+    files = iter_directory(
+        directory, include_hidden, engine, recursive, max_depth, exclude, workers, use_index
+    )
+    with tracer.span("scan", directory=str(directory)):
+        return RecordStore.from_files(files, engine.categories)
+
+
+def iter_categorized(
+    categorized_files: Mapping[str, Sequence[FileRecord]],
+) -> Iterator[Tuple[FileRecord, str]]:
+    """Flatten categorized files into (file record, category) pairs."""
+    for category, files in categorized_files.items():
+        for record in files:
+            yield record, category
+
+
+def tally_categories(
+    files: Iterable[Tuple[FileRecord, str]], summary: Dict[str, List[int]]
+) -> Iterator[Tuple[FileRecord, str]]:
     """
-    categorized_files: Dict[str, List[Path]] = {category: [] for category in FILE_CATEGORIES}
+    Pass files through while counting them, for the summary table.
     
-    for file_path in directory.iterdir():
-        # Skip directories
-        if file_path.is_dir():
-            continue
+    Args:
+        files: (file record, category) pairs
+        summary: Updated in place: category -> [file count, total size]
+
+    Yields:
+        The same pairs
+    """
+    for record, category in files:
+        totals = summary.get(category)
+        if totals is None:
+            totals = summary[category] = [0, 0]
+        totals[0] += 1
+        totals[1] += record.size
+        yield record, category
+
+
+def plan_moves(
+    directory: Path,
+    files: Iterable[Tuple[FileRecord, str]],
+    reporter: Reporter,
+    remember_names: bool = True,
+    exists: Optional[Callable[[str], bool]] = None,
+    list_folders: bool = True,
+) -> Iterator[Tuple[FileRecord, str]]:
+    """
+    Decide where each file goes, skipping name collisions.
+
+    Each category folder is listed once, on its first file; collisions are
+    checked against that listing instead of calling exists() per file.
+
+    Args:
+        directory: Base directory
+        files: (file record, category) pairs
+        reporter: Receives a "skipped" item for each collision
+        remember_names: Add each destination to the listing, to catch two
+            files with the same name (costs memory per file)
+        exists: Extra check for destinations not in the listing, used
+            instead of remember_names when files are moved while planning
+        list_folders: If False, rely on exists alone (for a few files at a
+            time, one check per file is cheaper than listing the folder)
+
+    Yields:
+        Tuples of (file record, destination path)
+    """
+    listings: Dict[str, Set[str]] = {}
+
+    for record, category in files:
+        existing_names = listings.get(category)
+        if existing_names is None:
+            folder = os.path.join(directory, category)
+            existing_names = listings[category] = list_names(folder) if list_folders else set()
+
+        destination = os.path.join(directory, category, record.name)
         
-        # Skip hidden files unless specified
-        if not include_hidden and file_path.name.startswith("."):
+        # Check if destination already exists
+        if record.name in existing_names or (exists is not None and exists(destination)):
+            reporter.skipped(
+                f"Skipping {record.name} (already exists in {category})",
+                source=record.path,
+                category=category,
+            )
             continue
         
-        # Categorize the file
-        extension = get_file_extension(file_path)
-        category = get_category(extension)
-        categorized_files[category].append(file_path)
+        if remember_names:
+            existing_names.add(record.name)
+        yield record, destination
+
+
+def report_move(reporter: Reporter) -> MoveCallback:
+    """
+    Build a MoveExecutor callback that reports each move.
+
+    Args:
+        reporter: Reporter receiving "moved" and "error" items
+
+    Returns:
+        Callback for MoveExecutor, apply_plan() and undo_plan()
+    """
+
+    def on_done(source: str, destination: str, error: Optional[BaseException]) -> None:
+        name = os.path.basename(source)
+        if error is None:
+            folder = os.path.basename(os.path.dirname(destination))
+            reporter.success(
+                f"Moved: {name} to {folder}/",
+                event="moved",
+                source=source,
+                destination=destination,
+            )
+        else:
+            reporter.error(
+                f"Failed to move {name}: {str(error)}", source=source, destination=destination
+            )
+
+    return on_done
+
+
+def _move_files(
+    directory: Path,
+    files: Iterable[Tuple[FileRecord, str]],
+    dry_run: bool,
+    workers: Optional[int],
+    reporter: Reporter,
+    streaming: bool = False,
+    list_folders: bool = True,
+) -> Dict[str, int]:
+    """Move (file record, category) pairs and return the statistics."""
+    created = set()
+
+    with MoveExecutor(on_done=report_move(reporter), workers=workers) as mover:
+        if streaming:
+            # Names are not remembered; files already moved are found on disk
+            def moved_or_moving(path: str) -> bool:
+                return mover.is_pending(path) or os.path.lexists(path)
+
+            exists: Optional[Callable[[str], bool]] = None
+            if not dry_run:
+                exists = moved_or_moving
+            elif not list_folders:
+                exists = os.path.lexists
+            moves = plan_moves(
+                directory,
+                files,
+                reporter,
+                remember_names=False,
+                exists=exists,
+                list_folders=list_folders,
+            )
+        else:
+            moves = plan_moves(directory, files, reporter)
+
+        for record, destination in moves:
+            category_folder = os.path.dirname(destination)
+
+            if dry_run:
+                category = os.path.basename(category_folder)
+                reporter.success(
+                    f"Would move: {record.name} to {category}/",
+                    event="would_move",
+                    source=record.path,
+                    destination=destination,
+                )
+                continue
+
+            # Create category folder
+            if category_folder not in created:
+                tracer.count("mkdir")
+                ensure_directory(Path(category_folder))
+                created.add(category_folder)
+
+            mover.submit(record.path, destination, record.device)
     
-    return categorized_files
+    reporter.stop()
+    return _stats(reporter)
+
+
+def _stats(reporter: Reporter) -> Dict[str, int]:
+    """Statistics of a run from the reporter's item counts."""
+    counts = reporter.counts
+    return {
+        "moved": counts.get("moved", 0) + counts.get("would_move", 0),
+        "skipped": counts.get("skipped", 0),
+        "errors": counts.get("error", 0),
+    }
 
 
 def organize_files(
     directory: Path,
-    categorized_files: Dict[str, List[Path]],
-    dry_run: bool = False
+    categorized_files: Mapping[str, Sequence[FileRecord]],
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
 ) -> Dict[str, int]:
     """
     Move files into category folders.
     
+    Moves within the same filesystem are a single rename; moves to another
+    filesystem are copied in parallel by a MoveExecutor.
+
     Args:
         directory: Base directory
-        categorized_files: Dictionary of categorized files
+        categorized_files: Files by category, e.g. from scan_directory()
         dry_run: If True, don't actually move files
+        workers: Number of threads for cross-filesystem moves
+        reporter: Reporter for per-file results (defaults to a quiet one)
     
     Returns:
         Dictionary with statistics
     """
+    reporter = reporter or Reporter()
+    reporter.start(total=sum(len(files) for files in categorized_files.values()))
+    with tracer.span("move", dry_run=dry_run):
+        return _move_files(
+            directory, iter_categorized(categorized_files), dry_run, workers, reporter
+        )
+
+
+def organize_stream(
+    directory: Path,
+    files: Iterable[Tuple[FileRecord, str]],
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
+) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """
+    Move files while they are still being scanned.
+
+    Scanning and classification run on a background thread and hand files
+    to the mover in small batches through a bounded queue, so the first
+    move happens right away and memory does not grow with the number of
+    files. The per-category summary is accumulated on the way.
+
+    Args:
+        directory: Base directory
+        files: (file record, category) pairs, e.g. from iter_directory()
+        dry_run: If True, don't actually move files
+        workers: Number of threads for cross-filesystem moves
+        reporter: Reporter for per-file results (defaults to a quiet one)
+
+    Returns:
+        Tuple of (statistics, summary of category -> [file count, total size])
+    """
+    reporter = reporter or Reporter()
+    reporter.start()
+    summary: Dict[str, List[int]] = {}
+    with tracer.span("scan_and_move", dry_run=dry_run):
+        stats = _move_files(
+            directory,
+            prefetch(tally_categories(files, summary)),
+            dry_run,
+            workers,
+            reporter,
+            streaming=True,
+        )
+    return stats, summary
+
+
+def organize_watch(
+    directory: Path,
+    watcher: DirectoryWatcher,
+    engine: Optional[CategoryEngine] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
+    exclude: Iterable[str] = (),
+    on_batch: Optional[Callable[[int, Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Organize new files as a DirectoryWatcher reports them, until it is stopped.
+
+    Only the files of each batch are classified and moved; nothing is
+    rescanned. Collisions are checked per file rather than by listing the
+    category folders, since batches are small.
+
+    Args:
+        directory: Watched directory
+        watcher: Watcher for the directory
+        engine: Compiled categorization rules (defaults to the built-in categories)
+        dry_run: If True, don't actually move files
+        workers: Number of threads for cross-filesystem moves
+        reporter: Reporter for per-file results (defaults to a quiet one)
+        exclude: Glob patterns of file names to leave alone
+        on_batch: Called as on_batch(batch size, statistics so far) after each batch
+
+    Returns:
+        Dictionary with statistics
+    """
+    engine = engine or DEFAULT_ENGINE
+    reporter = reporter or Reporter()
+    exclude_pattern = compile_globs(exclude)
     stats = {"moved": 0, "skipped": 0, "errors": 0}
     
-    for category, files in categorized_files.items():
-        if not files:
-            continue
-        
-        # Create category folder
-        category_folder = directory / category
-        
-        if not dry_run:
-            ensure_directory(category_folder)
-        
-        # Move files
-        for file_path in files:
-            try:
-                destination = category_folder / file_path.name
-                
-                # Check if destination already exists
-                if destination.exists():
-                    print_warning(f"Skipping {file_path.name} (already exists in {category})")
-                    stats["skipped"] += 1
-                    continue
-                
-                if dry_run:
-                    console.print(f"  [cyan]→[/cyan] Would move: {file_path.name} to {category}/")
-                else:
-                    shutil.move(str(file_path), str(destination))
-                    console.print(f"  [green]✓[/green] Moved: {file_path.name} to {category}/")
-                
-                stats["moved"] += 1
-            
-            except Exception as e:
-                print_error(f"Failed to move {file_path.name}: {str(e)}")
-                stats["errors"] += 1
+    for batch in watcher.batches():
+        files = [
+            (record, engine.classify(record.name, record.size))
+            for record in batch
+            if exclude_pattern is None or not exclude_pattern.match(record.name)
+        ]
+        stats = _move_files(
+            directory, files, dry_run, workers, reporter, streaming=True, list_folders=False
+        )
+        if on_batch is not None:
+            on_batch(len(files), stats)
     
     return stats
 
 
+def run_plan(
+    plan_path: Path,
+    undo: bool = False,
+    workers: Optional[int] = None,
+    reporter: Optional[Reporter] = None,
+) -> Dict[str, int]:
+    """
+    Apply (or undo) a plan written with --plan-out, journaling each batch.
+
+    Args:
+        plan_path: Plan file
+        undo: If True, move the files of the applied batches back
+        workers: Number of threads for cross-filesystem moves
+        reporter: Reporter for per-file results (defaults to a quiet one)
+
+    Returns:
+        Dictionary with statistics ("skipped" counts moves already done)
+    """
+    reporter = reporter or Reporter()
+    try:
+        if undo:
+            return undo_plan(str(plan_path), report_move(reporter), workers=workers)
+        return apply_plan(str(plan_path), report_move(reporter), workers=workers)
+    finally:
+        reporter.stop()
+
+
+def print_summary_table(
+    reporter: Reporter, summary: Dict[str, List[int]], categories: List[str], title: str
+) -> None:
+    """
+    Show per-category file counts and sizes (a "scan" record in JSONL mode).
+
+    Args:
+        reporter: Reporter deciding the output format
+        summary: Category -> [file count, total size]
+        categories: Display order of the categories
+        title: Table title
+    """
+    if reporter.is_jsonl:
+        reporter.emit(
+            "scan",
+            total=sum(count for count, _ in summary.values()),
+            categories={
+                category: {"count": summary[category][0], "size": summary[category][1]}
+                for category in categories
+                if category in summary
+            },
+        )
+        return
+
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Category", style="cyan")
+    table.add_column("Count", justify="right", style="green")
+    table.add_column("Total Size", justify="right", style="yellow")
+
+    for category in categories:
+        if category in summary:
+            count, total_size = summary[category]
+            table.add_row(category, str(count), format_size(total_size))
+
+    with tracer.span("render"):
+        console.print(table)
+
+
+def _print_stats(
+    reporter: Reporter, stats: Dict[str, int], dry_run: bool = False, verb: str = "Organized"
+) -> None:
+    """Print the summary of a run (a "summary" record in JSONL mode)."""
+    if reporter.is_jsonl:
+        reporter.emit("summary", dry_run=dry_run, **stats)
+        reporter.flush()
+        return
+
+    console.print()
+    if dry_run:
+        console.print(f"[yellow]Would organize {stats['moved']} file(s)[/yellow]")
+    else:
+        print_success(f"{verb} {stats['moved']} file(s)")
+
+    if stats["skipped"] > 0:
+        print_warning(f"Skipped {stats['skipped']} file(s)")
+
+    if stats["errors"] > 0:
+        print_error(f"Failed to move {stats['errors']} file(s)")
+
+    console.print()
+
+
+def _fail(reporter: Reporter, message: str) -> None:
+    """Report a fatal error and exit."""
+    if reporter.is_jsonl:
+        reporter.emit("error", message=message)
+        reporter.flush()
+    else:
+        print_error(message)
+    raise typer.Exit(1)
+
+
+def _confirm(reporter: Reporter, message: str) -> None:
+    """Ask for confirmation, exiting if declined (JSONL output cannot prompt)."""
+    if reporter.is_jsonl:
+        _fail(reporter, "--output jsonl cannot prompt; pass --yes")
+    if not confirm_action(message, default=True):
+        console.print("[yellow]Cancelled.[/yellow]")
+        raise typer.Exit(0)
+
+
+def _execute_plan(
+    plan_path: Path, undo: bool, auto_confirm: bool, workers: Optional[int], reporter: Reporter
+) -> None:
+    """Run --apply or --undo."""
+    action = "Undoing" if undo else "Applying"
+
+    try:
+        header, moves = read_plan(str(plan_path))
+    except (OSError, ValueError) as e:
+        _fail(reporter, f"Cannot read plan: {e}")
+
+    if reporter.is_jsonl:
+        reporter.emit("plan", path=str(plan_path), root=header["root"], moves=len(moves))
+    else:
+        console.print(f"\n[bold blue]📋 {action} plan:[/bold blue] {plan_path}\n")
+        console.print(f"[bold]Directory:[/bold] {header['root']}")
+        console.print(f"[bold]Planned moves:[/bold] {len(moves)}\n")
+
+    if not auto_confirm:
+        _confirm(reporter, f"Proceed with {action.lower()} the plan?")
+
+    reporter.start(total=len(moves))
+    try:
+        stats = run_plan(plan_path, undo=undo, workers=workers, reporter=reporter)
+    except (OSError, ValueError) as e:
+        _fail(reporter, str(e))
+
+    if stats["skipped"] > 0 and not undo and not reporter.is_jsonl:
+        console.print(f"\n[cyan]Resumed: {stats['skipped']} move(s) were already done[/cyan]")
+        stats = dict(stats, skipped=0)
+    _print_stats(reporter, stats, verb="Restored" if undo else "Organized")
+
+
 @app.command()
 def main(
-    directory: Path = typer.Argument(
-        ...,
-        help="Directory to organize",
+    directory: Optional[Path] = typer.Argument(
+        None,
+        help="Directory to organize (not needed with --apply or --undo)",
         exists=True,
         file_okay=False,
         resolve_path=True,
@@ -169,65 +672,298 @@ def main(
         "-y",
         help="Skip confirmation prompt",
     ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Also organize files in subdirectories",
+    ),
+    max_depth: Optional[int] = typer.Option(
+        None,
+        "--max-depth",
+        min=0,
+        help="Maximum subdirectory depth with --recursive",
+    ),
+    exclude: List[str] = typer.Option(
+        [],
+        "--exclude",
+        "-e",
+        help="Glob pattern of files or directories to leave alone (repeatable)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of threads for listing directories and cross-filesystem moves",
+    ),
+    use_index: bool = typer.Option(
+        False,
+        "--use-index",
+        help="Scan through the file index in ~/.lazy-cli/, relisting only changed directories",
+    ),
+    plan_out: Optional[Path] = typer.Option(
+        None,
+        "--plan-out",
+        dir_okay=False,
+        help="Write the moves to a plan file instead of moving anything",
+    ),
+    apply: Optional[Path] = typer.Option(
+        None,
+        "--apply",
+        exists=True,
+        dir_okay=False,
+        help="Execute a plan file, resuming where an interrupted run stopped",
+    ),
+    undo: Optional[Path] = typer.Option(
+        None,
+        "--undo",
+        exists=True,
+        dir_okay=False,
+        help="Move the files of an applied plan back",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        "-w",
+        help="Keep running and organize new files as they arrive",
+    ),
+    settle: float = typer.Option(
+        1.0,
+        "--settle",
+        min=0.0,
+        help="Seconds a new file must stay unchanged before it is moved with --watch",
+    ),
+    poll: bool = typer.Option(
+        False,
+        "--poll",
+        help="With --watch, poll for changes instead of using inotify (e.g. network shares)",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        "-s",
+        help="Move files while scanning, in constant memory (summary shown at the end)",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: progress display, or one JSON record per file on stdout",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="Print a line for every file",
+    ),
 ):
     """
     Organize files in a directory by moving them into subfolders based on their extension.
     
     Files will be categorized into folders like Images, Documents, Videos, Audio, etc.
+
+    Large runs can be split in two: --plan-out writes the moves to a file,
+    and --apply executes it with a journal, so an interrupted run resumes
+    where it stopped and --undo can move everything back.
+
+    Repeated scans of a large tree are faster with --use-index, which keeps
+    directory listings in ~/.lazy-cli/index.db and lists again only the
+    directories that changed since the last run.
     """
-    console.print(f"\n[bold blue]📂 Organizing files in:[/bold blue] {directory}\n")
+    reporter = Reporter(output, verbose, description="Organizing")
     
-    if dry_run:
-        console.print("[yellow]🔍 DRY RUN MODE - No files will be moved[/yellow]\n")
+    if apply is not None or undo is not None:
+        if directory is not None or plan_out is not None or (apply and undo):
+            _fail(reporter, "--apply and --undo take only a plan file")
+        _execute_plan(apply or undo, undo is not None, auto_confirm, workers, reporter)
+        return
+
+    if directory is None:
+        _fail(reporter, "Missing argument 'DIRECTORY'")
+
+    if not reporter.is_jsonl:
+        console.print(f"\n[bold blue]📂 Organizing files in:[/bold blue] {directory}\n")
+
+        if dry_run:
+            console.print("[yellow]🔍 DRY RUN MODE - No files will be moved[/yellow]\n")
+
+    # Compile categorization rules once for this run
+    try:
+        engine = build_category_engine(get_config_value("organize_rules", []))
+    except ValueError as e:
+        _fail(reporter, f"Invalid organize_rules in the config: {e}")
+
+    scan_options = {
+        "include_hidden": include_hidden,
+        "engine": engine,
+        "recursive": recursive,
+        "max_depth": max_depth,
+        "exclude": exclude,
+        "workers": workers,
+        "use_index": use_index,
+    }
+
+    if watch:
+        if recursive or plan_out is not None:
+            _fail(reporter, "--watch only watches the top directory and cannot write a plan")
+        _organize_watching(
+            directory, scan_options, engine, dry_run, auto_confirm, workers, settle, poll, reporter
+        )
+        return
+
+    if stream:
+        _organize_streaming(
+            directory, scan_options, engine, dry_run, auto_confirm, workers, plan_out, reporter
+        )
+        return
     
     # Scan directory
-    categorized_files = scan_directory(directory, include_hidden)
+    categorized_files = scan_directory(directory, **scan_options)
     
     # Count total files
-    total_files = sum(len(files) for files in categorized_files.values())
+    total_files = categorized_files.total
     
-    if total_files == 0:
+    if total_files == 0 and not reporter.is_jsonl:
         print_warning("No files found to organize.")
         raise typer.Exit(0)
     
     # Display preview table
-    table = Table(title="Files to Organize", show_header=True, header_style="bold magenta")
-    table.add_column("Category", style="cyan")
-    table.add_column("Count", justify="right", style="green")
-    table.add_column("Total Size", justify="right", style="yellow")
+    summary = categorized_files.summary()
+    print_summary_table(reporter, summary, engine.categories, "Files to Organize")
+    if not reporter.is_jsonl:
+        console.print(f"\n[bold]Total files:[/bold] {total_files}\n")
     
-    for category, files in categorized_files.items():
-        if files:
-            total_size = sum(f.stat().st_size for f in files)
-            table.add_row(category, str(len(files)), format_size(total_size))
-    
-    console.print(table)
-    console.print(f"\n[bold]Total files:[/bold] {total_files}\n")
+    # Write a plan instead of moving
+    if plan_out is not None:
+        _write_plan(directory, iter_categorized(categorized_files), plan_out, reporter)
+        return
     
     # Confirm before proceeding (unless auto-confirm)
     if not dry_run and not auto_confirm:
-        if not confirm_action("Proceed with organizing files?", default=True):
-            console.print("[yellow]Cancelled.[/yellow]")
-            raise typer.Exit(0)
+        _confirm(reporter, "Proceed with organizing files?")
     
     # Organize files
-    console.print()
-    stats = organize_files(directory, categorized_files, dry_run)
+    stats = organize_files(directory, categorized_files, dry_run, workers, reporter)
     
     # Display results
-    console.print()
-    if dry_run:
-        console.print(f"[yellow]Would organize {stats['moved']} file(s)[/yellow]")
-    else:
-        print_success(f"Organized {stats['moved']} file(s)")
+    _print_stats(reporter, stats, dry_run)
+
+
+def _write_plan(
+    directory: Path,
+    files: Iterable[Tuple[FileRecord, str]],
+    plan_out: Path,
+    reporter: Reporter,
+    remember_names: bool = True,
+) -> None:
+    """Run --plan-out."""
+    moves = (
+        (record.path, destination)
+        for record, destination in plan_moves(directory, files, reporter, remember_names)
+    )
+    count = write_plan(str(plan_out), str(directory), moves)
+    skipped = reporter.counts.get("skipped", 0)
+    if reporter.is_jsonl:
+        reporter.emit("plan", path=str(plan_out), moves=count, skipped=skipped)
+        reporter.flush()
+        return
+    print_success(f"Wrote {count} move(s) to {plan_out}")
+    if skipped > 0:
+        print_warning(f"Skipped {skipped} file(s)")
+    console.print(f"Run [bold]lazy organize --apply {plan_out}[/bold] to execute it.\n")
+
+
+def _organize_streaming(
+    directory: Path,
+    scan_options: Dict[str, Any],
+    engine: CategoryEngine,
+    dry_run: bool,
+    auto_confirm: bool,
+    workers: Optional[int],
+    plan_out: Optional[Path],
+    reporter: Reporter,
+) -> None:
+    """Run --stream: no preview, files move as they are found."""
+    files = iter_directory(directory, **scan_options)
     
-    if stats["skipped"] > 0:
-        print_warning(f"Skipped {stats['skipped']} file(s)")
+    if plan_out is not None:
+        # Only a recursive scan can find the same name twice
+        _write_plan(directory, files, plan_out, reporter, remember_names=scan_options["recursive"])
+        return
     
-    if stats["errors"] > 0:
-        print_error(f"Failed to move {stats['errors']} file(s)")
+    if not dry_run and not auto_confirm:
+        _confirm(reporter, "Move files as they are found, without a preview?")
     
-    console.print()
+    stats, summary = organize_stream(directory, files, dry_run, workers, reporter)
+
+    if not reporter.is_jsonl:
+        console.print()
+    print_summary_table(reporter, summary, engine.categories, "Organized Files")
+    _print_stats(reporter, stats, dry_run)
+
+
+def _organize_watching(
+    directory: Path,
+    scan_options: Dict[str, Any],
+    engine: CategoryEngine,
+    dry_run: bool,
+    auto_confirm: bool,
+    workers: Optional[int],
+    settle: float,
+    poll: bool,
+    reporter: Reporter,
+) -> None:
+    """Run --watch: organize what is there, then each new file as it arrives."""
+    if not dry_run and not auto_confirm:
+        _confirm(reporter, "Organize existing files now, and new files as they arrive?")
+
+    # Subscribe before the first pass, so no file slips in between
+    watcher = DirectoryWatcher(
+        str(directory), scan_options["include_hidden"], settle=settle, use_inotify=not poll
+    )
+    try:
+        stats, summary = organize_stream(
+            directory, iter_directory(directory, **scan_options), dry_run, workers, reporter
+        )
+
+        if reporter.is_jsonl:
+            reporter.emit("watch", directory=str(directory), mode=watcher.mode, **stats)
+            reporter.flush()
+        else:
+            if stats["moved"]:
+                print_success(f"Organized {stats['moved']} existing file(s)")
+            console.print(
+                f"[bold blue]👀 Watching[/bold blue] {directory} ({watcher.mode}), "
+                "press Ctrl+C to stop\n"
+            )
+
+        moved_before = stats["moved"]
+
+        def on_batch(count: int, totals: Dict[str, int]) -> None:
+            nonlocal moved_before
+            if not reporter.is_jsonl and totals["moved"] > moved_before:
+                verb = "Would organize" if dry_run else "Organized"
+                print_success(f"{verb} {totals['moved'] - moved_before} new file(s)")
+            moved_before = totals["moved"]
+
+        try:
+            stats = organize_watch(
+                directory,
+                watcher,
+                engine,
+                dry_run,
+                workers,
+                reporter,
+                exclude=scan_options["exclude"],
+                on_batch=on_batch,
+            )
+        except KeyboardInterrupt:
+            reporter.stop()
+            stats = _stats(reporter)
+    finally:
+        watcher.close()
+
+    _print_stats(reporter, stats, dry_run)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,324 @@
+"""
+Plugin: Rename
+Rename many files at once: prefix/suffix, find and replace, numbering.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional, Sequence
+import typer
+from rich.console import Console
+from rich.markup import escape
+from lazy_cli.core.files import FileRecord, compile_globs, list_names, scan_files
+from lazy_cli.core.renamer import Rename, apply_renames, plan_renames
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.utils import (
+    Reporter,
+    confirm_action,
+    create_table,
+    print_error,
+    print_success,
+    print_warning,
+)
+
+# Plugin metadata
+PLUGIN_NAME = "rename"
+PLUGIN_HELP = "Rename many files at once (prefix, suffix, replace, numbering)"
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+# Rows of the preview table shown without --verbose
+PREVIEW_ROWS = 20
+
+# Sort keys of --sort, which also decide the numbering order
+SORT_KEYS: Dict[str, Callable[[FileRecord], object]] = {
+    "name": lambda record: record.name,
+    "mtime": lambda record: (record.mtime, record.name),
+    "size": lambda record: (record.size, record.name),
+}
+
+
+def build_renamer(
+    prefix: str = "",
+    suffix: str = "",
+    find: Optional[str] = None,
+    replace: str = "",
+    regex: bool = False,
+    template: Optional[str] = None,
+    start: int = 1,
+) -> Callable[[str, int], str]:
+    """
+    Build the function computing new names.
+
+    The steps are applied in order: find/replace on the whole name, then
+    the template, then prefix and suffix (the suffix goes before the
+    extension).
+
+    Args:
+        prefix: Text added before the name
+        suffix: Text added after the name, before the extension
+        find: Text (or regular expression) to replace
+        replace: Replacement text (may use \\1 groups with regex)
+        regex: Whether find is a regular expression
+        template: New name with {name} (without extension), {ext} (with
+            the dot) and {n} (the file's number) fields, e.g. "img_{n:04}{ext}"
+        start: Number of the first file
+
+    Returns:
+        Function (name, position) -> new name, position counting from 0
+
+    Raises:
+        ValueError: If the regular expression, its replacement or the template
+            is invalid
+    """
+    pattern = None
+    if find is not None and regex:
+        try:
+            pattern = re.compile(find)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression {find!r}: {e}") from None
+        try:
+            # The replacement's group references are checked even without a match
+            pattern.sub(replace, "")
+        except (re.error, IndexError) as e:
+            raise ValueError(f"Invalid replacement {replace!r}: {e}") from None
+
+    if template is not None:
+        try:
+            template.format(name="", ext="", n=0)
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"Invalid template {template!r}: {e}") from None
+
+    def rename(name: str, position: int) -> str:
+        if pattern is not None:
+            name = pattern.sub(replace, name)
+        elif find:
+            name = name.replace(find, replace)
+
+        stem, ext = os.path.splitext(name)
+        if template is not None:
+            name = template.format(name=stem, ext=ext, n=start + position)
+            stem, ext = os.path.splitext(name)
+
+        return f"{prefix}{stem}{suffix}{ext}"
+
+    return rename
+
+
+def compute_renames(
+    records: Sequence[FileRecord], rename: Callable[[str, int], str]
+) -> List[Rename]:
+    """
+    Compute the new name of every file.
+
+    Args:
+        records: Files in numbering order
+        rename: Function from build_renamer()
+
+    Returns:
+        (old name, new name) pairs for the files whose name changes
+    """
+    renames = []
+    for position, record in enumerate(records):
+        new = rename(record.name, position)
+        if new != record.name:
+            renames.append((record.name, new))
+    return renames
+
+
+def print_preview(reporter: Reporter, renames: List[Rename], show_all: bool) -> None:
+    """Show the planned renames (one "plan" record per rename in JSONL mode)."""
+    if reporter.is_jsonl:
+        for old, new in renames:
+            reporter.emit("plan", source=old, destination=new)
+        return
+
+    table = create_table("Planned Renames", ["Current Name", "New Name"])
+    shown = renames if show_all else renames[:PREVIEW_ROWS]
+    for old, new in shown:
+        # File names like "[draft] notes.txt" are not markup
+        table.add_row(escape(old), escape(new))
+    with tracer.span("render"):
+        console.print(table)
+    if len(shown) < len(renames):
+        console.print(f"[dim]... and {len(renames) - len(shown)} more (--verbose shows all)[/dim]")
+
+
+def _fail(reporter: Reporter, message: str) -> None:
+    """Report a fatal error and exit."""
+    if reporter.is_jsonl:
+        reporter.emit("error", message=message)
+        reporter.flush()
+    else:
+        print_error(message)
+    raise typer.Exit(1)
+
+
+@app.command()
+def main(
+    directory: Path = typer.Argument(
+        ...,
+        help="Directory whose files are renamed",
+        exists=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    prefix: str = typer.Option(
+        "",
+        "--prefix",
+        help="Add text before each name",
+    ),
+    suffix: str = typer.Option(
+        "",
+        "--suffix",
+        help="Add text after each name, before the extension",
+    ),
+    find: Optional[str] = typer.Option(
+        None,
+        "--find",
+        "-f",
+        help="Text to replace in each name",
+    ),
+    replace: str = typer.Option(
+        "",
+        "--replace",
+        "-R",
+        help="Replacement for --find (default: remove it)",
+    ),
+    regex: bool = typer.Option(
+        False,
+        "--regex",
+        help="Treat --find as a regular expression (--replace may use \\1 groups)",
+    ),
+    template: Optional[str] = typer.Option(
+        None,
+        "--template",
+        "-t",
+        help="New name from {name}, {ext} and {n}, e.g. 'photo_{n:03}{ext}'",
+    ),
+    start: int = typer.Option(
+        1,
+        "--start",
+        help="Number of the first file for {n}",
+    ),
+    sort: Literal["name", "mtime", "size"] = typer.Option(
+        "name",
+        "--sort",
+        help="Order of the files, which sets their numbers",
+    ),
+    pattern: List[str] = typer.Option(
+        [],
+        "--pattern",
+        "-p",
+        help="Only rename files matching this glob (repeatable)",
+    ),
+    include_hidden: bool = typer.Option(
+        False,
+        "--include-hidden",
+        "-h",
+        help="Include hidden files (starting with .)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-d",
+        help="Preview the new names without renaming",
+    ),
+    auto_confirm: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Skip confirmation prompt",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: human-readable text, or one JSON record per rename",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="Show every planned rename, not only the first ones",
+    ),
+):
+    """
+    Rename the files of a directory.
+
+    All new names are computed and checked first: if two files would get
+    the same name, or a new name is already taken, nothing is renamed.
+    Files may swap names (a -> b, b -> a); the plan takes care of the
+    order. If a rename fails, the ones already done are undone.
+    """
+    reporter = Reporter(output, verbose, description="Renaming")
+
+    try:
+        renamer = build_renamer(prefix, suffix, find, replace, regex, template, start)
+    except ValueError as e:
+        _fail(reporter, str(e))
+
+    # One listing gives the files to rename and every name already taken
+    with tracer.span("scan"):
+        existing = list_names(directory)
+        selected = compile_globs(pattern)
+        records = [
+            record
+            for record in scan_files(directory, include_hidden)
+            if selected is None or selected.match(record.name)
+        ]
+        records.sort(key=SORT_KEYS[sort])
+
+    renames = compute_renames(records, renamer)
+    if not renames:
+        if reporter.is_jsonl:
+            reporter.emit("summary", renamed=0, dry_run=dry_run)
+            reporter.flush()
+        else:
+            print_warning("No file names would change.")
+        return
+
+    steps, conflicts = plan_renames(renames, existing)
+    if conflicts:
+        for conflict in conflicts[:PREVIEW_ROWS] if not verbose else conflicts:
+            reporter.emit("conflict", message=conflict)
+            if not reporter.is_jsonl:
+                print_error(escape(conflict))
+        _fail(reporter, f"{len(conflicts)} conflict(s); nothing was renamed")
+
+    print_preview(reporter, renames, verbose)
+    if not reporter.is_jsonl:
+        console.print(f"\n[bold]Files to rename:[/bold] {len(renames)}\n")
+
+    if dry_run:
+        if reporter.is_jsonl:
+            reporter.emit("summary", renamed=len(renames), dry_run=True)
+            reporter.flush()
+        else:
+            console.print(f"[yellow]Would rename {len(renames)} file(s)[/yellow]")
+        return
+
+    if not auto_confirm:
+        if reporter.is_jsonl:
+            _fail(reporter, "--output jsonl cannot prompt; pass --yes")
+        if not confirm_action("Proceed with renaming?", default=True):
+            console.print("[yellow]Cancelled.[/yellow]")
+            raise typer.Exit(0)
+
+    try:
+        apply_renames(os.fspath(directory), steps)
+    except OSError as e:
+        _fail(reporter, f"Rename failed, all renames were undone: {e}")
+
+    if reporter.is_jsonl:
+        reporter.emit("summary", renamed=len(renames), dry_run=False)
+        reporter.flush()
+    else:
+        print_success(f"Renamed {len(renames)} file(s)")
+
+
+if __name__ == "__main__":
+    app()
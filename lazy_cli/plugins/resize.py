@@ -0,0 +1,307 @@
+"""
+Plugin: Resize
+Resize images by width, height or percentage, in batches on all cores.
+"""
+
+import importlib.util
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Literal, Optional, Tuple
+import typer
+from rich.console import Console
+from lazy_cli.core.files import FileRecord, scan_files, walk_files
+from lazy_cli.core.images import DEFAULT_QUALITY, is_image, resize_images
+from lazy_cli.core.trace import tracer
+from lazy_cli.core.utils import Reporter, print_error, print_success, print_warning
+
+# Plugin metadata
+PLUGIN_NAME = "resize"
+PLUGIN_HELP = "Resize images by width, height or percentage"
+PLUGIN_REQUIRES = ["Pillow>=10.0.0"]
+
+# Initialize
+console = Console()
+app = typer.Typer()
+
+# Output directory created in each input directory without --output-dir
+OUTPUT_DIR_NAME = "resized"
+
+Job = Tuple[FileRecord, str]
+
+
+def iter_jobs(
+    paths: Iterable[Path],
+    output_dir: Optional[Path] = None,
+    recursive: bool = False,
+    include_hidden: bool = False,
+    reporter: Optional[Reporter] = None,
+) -> Iterator[Job]:
+    """
+    Yield the images to resize and where each output goes.
+
+    Images of a directory are written under its "resized" subdirectory (or
+    output_dir), keeping their relative paths; a single image is written
+    to the "resized" directory next to it (or output_dir). Output
+    directories are never scanned for images.
+
+    Args:
+        paths: Image files and directories
+        output_dir: Directory receiving all outputs
+        recursive: Whether to include images in subdirectories
+        include_hidden: Whether to include hidden files and directories
+        reporter: Reporter for unreadable directories
+
+    Yields:
+        Tuples of (record of the image, output path)
+    """
+
+    def on_error(path: str, error: OSError) -> None:
+        if reporter is not None:
+            reporter.error(f"Cannot list {path}: {error.strerror}", path=path)
+
+    for path in paths:
+        if not path.is_dir():
+            target = os.fspath(output_dir or path.parent / OUTPUT_DIR_NAME)
+            yield FileRecord(str(path), path.name, path.stat()), os.path.join(target, path.name)
+            continue
+
+        root = os.fspath(path)
+        target = os.fspath(output_dir or path / OUTPUT_DIR_NAME)
+        if recursive:
+            records: Iterable[FileRecord] = walk_files(
+                root, include_hidden, skip_dirs=[target], on_error=on_error
+            )
+        else:
+            records = sorted(scan_files(root, include_hidden), key=lambda record: record.name)
+        for record in records:
+            if is_image(record.name):
+                yield record, os.path.join(target, os.path.relpath(record.path, root))
+
+
+def is_up_to_date(record: FileRecord, destination: str) -> bool:
+    """Whether the output exists and is newer than the image."""
+    try:
+        return os.stat(destination).st_mtime_ns >= record.mtime
+    except OSError:
+        return False
+
+
+def resize_batch(
+    jobs: List[Job],
+    reporter: Reporter,
+    workers: Optional[int] = None,
+    **spec: Any,
+) -> int:
+    """
+    Resize images in parallel and report each result.
+
+    Args:
+        jobs: Images and output paths from iter_jobs()
+        reporter: Reporter for per-image results
+        workers: Number of worker processes
+        **spec: Size and quality arguments of resize_image()
+
+    Returns:
+        Number of images resized
+    """
+    # Create each output directory once, here rather than in every worker
+    for directory in {os.path.dirname(destination) for _, destination in jobs}:
+        os.makedirs(directory, exist_ok=True)
+
+    resized = 0
+    pairs = ((record.path, destination) for record, destination in jobs)
+    with tracer.span("resize", images=len(jobs)):
+        for source, destination, size, error in resize_images(pairs, workers, **spec):
+            if size is None:
+                reporter.error(f"Failed to resize {source}: {error}", source=source)
+                continue
+            resized += 1
+            width, height = size
+            reporter.success(
+                f"Resized: {source} -> {destination} ({width}x{height})",
+                event="resized",
+                source=source,
+                destination=destination,
+                width=width,
+                height=height,
+            )
+    return resized
+
+
+def _fail(reporter: Reporter, message: str) -> None:
+    """Report a fatal error and exit."""
+    if reporter.is_jsonl:
+        reporter.emit("error", message=message)
+        reporter.flush()
+    else:
+        print_error(message)
+    raise typer.Exit(1)
+
+
+@app.command()
+def main(
+    paths: List[Path] = typer.Argument(
+        ...,
+        help="Images and directories of images",
+        exists=True,
+        resolve_path=True,
+    ),
+    width: Optional[int] = typer.Option(
+        None,
+        "--width",
+        "-W",
+        min=1,
+        help="Width in pixels (the height follows the aspect ratio)",
+    ),
+    height: Optional[int] = typer.Option(
+        None,
+        "--height",
+        "-H",
+        min=1,
+        help="Height in pixels (with --width: fit inside both)",
+    ),
+    percent: Optional[float] = typer.Option(
+        None,
+        "--percent",
+        "-p",
+        min=1,
+        help="Scale in percent, e.g. 50",
+    ),
+    stretch: bool = typer.Option(
+        False,
+        "--stretch",
+        help="Resize to exactly --width x --height, ignoring the aspect ratio",
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        "--output-dir",
+        "-O",
+        file_okay=False,
+        resolve_path=True,
+        help=f"Where resized images go (default: a '{OUTPUT_DIR_NAME}' folder next to them)",
+    ),
+    quality: int = typer.Option(
+        DEFAULT_QUALITY,
+        "--quality",
+        "-q",
+        min=1,
+        max=95,
+        help="JPEG/WebP quality",
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Also resize images in subdirectories",
+    ),
+    include_hidden: bool = typer.Option(
+        False,
+        "--include-hidden",
+        "-h",
+        help="Include hidden files (starting with .)",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        "-f",
+        help="Resize again even if the output is newer than the image",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Number of worker processes (default: one per CPU core)",
+    ),
+    output: Literal["text", "jsonl"] = typer.Option(
+        "text",
+        "--output",
+        "-o",
+        help="Output format: human-readable text, or one JSON record per image",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-V",
+        help="Print a line per image instead of the progress display",
+    ),
+):
+    """
+    Resize images by width, height or percentage.
+
+    Directories are resized in batches spread over all CPU cores. Images
+    whose output is already newer than them are skipped, so an interrupted
+    or repeated run only does the remaining work.
+    """
+    reporter = Reporter(output, verbose, description="Resizing", unit="images")
+
+    if width is None and height is None and percent is None:
+        _fail(reporter, "Give --width, --height or --percent")
+    if stretch and (width is None or height is None):
+        _fail(reporter, "--stretch needs both --width and --height")
+    if importlib.util.find_spec("PIL") is None:
+        _fail(reporter, "resize needs Pillow: pip install Pillow")
+
+    # Up-to-date images are not counted by the reporter, to keep the rate
+    # about the images actually resized
+    skipped = 0
+    with tracer.span("scan"):
+        jobs: List[Job] = []
+        images = iter_jobs(paths, output_dir, recursive, include_hidden, reporter)
+        for record, destination in images:
+            if force or not is_up_to_date(record, destination):
+                jobs.append((record, destination))
+                continue
+            skipped += 1
+            reporter.emit("up_to_date", source=record.path, destination=destination)
+            if verbose and not reporter.is_jsonl:
+                print_warning(f"Up to date: {destination}")
+
+    if not jobs:
+        if reporter.is_jsonl:
+            errors = reporter.counts.get("error", 0)
+            reporter.emit("summary", resized=0, skipped=skipped, errors=errors)
+            reporter.flush()
+        else:
+            print_warning("No images to resize" + (f" ({skipped} up to date)" if skipped else "."))
+        return
+
+    started = time.monotonic()
+    reporter.start(total=len(jobs))
+    resized = resize_batch(
+        jobs,
+        reporter,
+        workers,
+        width=width,
+        height=height,
+        percent=percent,
+        keep_aspect=not stretch,
+        quality=quality,
+    )
+    reporter.stop()
+    elapsed = time.monotonic() - started
+    rate = resized / elapsed if elapsed > 0 else 0.0
+    errors = reporter.counts.get("error", 0)
+
+    if reporter.is_jsonl:
+        reporter.emit(
+            "summary",
+            resized=resized,
+            skipped=skipped,
+            errors=errors,
+            seconds=round(elapsed, 3),
+            images_per_second=round(rate, 1),
+        )
+        reporter.flush()
+        return
+
+    console.print()
+    print_success(f"Resized {resized} image(s) in {elapsed:.1f}s ({rate:,.1f} images/s)")
+    if skipped:
+        console.print(f"[dim]{skipped} image(s) already up to date (--force redoes them)[/dim]")
+    if errors:
+        print_error(f"{errors} error(s)")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,46 @@
+"""
+Shared test fixtures.
+"""
+
+import os
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path_factory, monkeypatch):
+    """Point the home directory (config, caches, manifests) at a temporary one."""
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    # Path.home() reads USERPROFILE on Windows
+    monkeypatch.setenv("USERPROFILE", str(home))
+    return home
+
+
+@pytest.fixture
+def age_directories():
+    """Backdate directory mtimes so caches and indexes do not treat them as racy."""
+
+    def age(root):
+        for path, _, _ in os.walk(root):
+            os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    return age
+
+
+@pytest.fixture
+def make_tree(age_directories):
+    """Create a small tree whose directories look old enough to be trusted."""
+
+    def make(root, song_size=3, hidden=False):
+        (root / "a" / "deep").mkdir(parents=True)
+        (root / "b").mkdir()
+        (root / "top.txt").write_bytes(b"1")
+        (root / "a" / "photo.jpg").write_bytes(b"12")
+        (root / "a" / "deep" / "song.mp3").write_bytes(b"x" * song_size)
+        (root / "b" / "notes.pdf").write_bytes(b"1234")
+        if hidden:
+            (root / ".hidden").mkdir()
+            (root / ".hidden" / "secret.txt").write_bytes(b"5")
+        age_directories(root)
+
+    return make
@@ -0,0 +1,43 @@
+"""
+Tests for streaming ZIP archives.
+"""
+
+import io
+import os
+import zipfile
+from lazy_cli.core.archive import DEFLATED, STORED, ZipWriter, compress_files
+
+
+def test_parallel_members_round_trip(tmp_path):
+    """Test that members compressed on threads are written in order and readable."""
+    files = []
+    for index in range(40):
+        path = tmp_path / (f"photo{index}.jpg" if index % 10 == 0 else f"notes{index}.txt")
+        path.write_bytes(b"line %d\n" % index * (index * 500 + 1))
+        files.append(path)
+    os.chmod(files[1], 0o755)
+    items = [(f"dir/é{path.name}", str(path), path.stat().st_size) for path in files]
+    items.append(("missing.txt", str(tmp_path / "missing.txt"), 0))
+
+    stream = io.BytesIO()
+    names, errors = [], []
+    with ZipWriter(stream) as archive:
+        for name, member, error in compress_files(items, workers=3):
+            if member is None:
+                errors.append((name, error))
+                continue
+            archive.write(name, member, os.stat(tmp_path / name[5:]).st_mtime)
+            member.close()
+            names.append(name)
+        archive.write_bytes("deleted.txt", b"old.txt\n")
+
+    assert names == [name for name, _, _ in items[:-1]]
+    assert [name for name, _ in errors] == ["missing.txt"]
+    with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as archive:
+        assert archive.testzip() is None
+        for path in files:
+            assert archive.read(f"dir/é{path.name}") == path.read_bytes()
+        assert archive.getinfo("dir/éphoto0.jpg").compress_type == STORED
+        assert archive.getinfo("dir/énotes1.txt").compress_type == DEFLATED
+        assert archive.getinfo("dir/énotes1.txt").external_attr >> 16 == 0o100755
+        assert archive.read("deleted.txt") == b"old.txt\n"
@@ -0,0 +1,64 @@
+"""
+Tests for the benchmark tree generator and regression gate.
+"""
+
+import os
+from benchmarks.generate import generate_tree, parse_extensions
+from benchmarks.run import compare_results
+
+
+def list_tree(root):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), root)
+        for path, _, names in os.walk(root)
+        for name in names
+    )
+
+
+def test_generate_tree_is_reproducible(tmp_path):
+    """Test that the same arguments create the same tree."""
+    options = {
+        "files": 300,
+        "extensions": {"jpg": 3, "tar.gz": 1},
+        "depth": 2,
+        "fanout": 3,
+        "name_length": (4, 6),
+        "hidden_ratio": 0.5,
+    }
+    generate_tree(tmp_path / "a", **options)
+    generate_tree(tmp_path / "b", **options)
+
+    files = list_tree(tmp_path / "a")
+    assert files == list_tree(tmp_path / "b")
+    assert len(files) == 300
+    names = [os.path.basename(name) for name in files]
+    assert {name.lstrip(".").split(".", 1)[1] for name in names} == {"jpg", "tar.gz"}
+    hidden = sum(name.startswith(".") for name in names)
+    assert 100 < hidden < 200
+
+
+def test_parse_extensions():
+    """Test parsing of an extension mix."""
+    assert parse_extensions("jpg=30, .pdf=10,txt") == {"jpg": 30, "pdf": 10, "txt": 1}
+
+
+def test_compare_results():
+    """Test that only slowdowns and memory growth beyond the threshold count."""
+    baseline = {
+        "cases": {
+            "scan": {"throughput": 1000.0, "unit": "files/s", "peak_rss_mb": 40.0},
+            "organize": {"throughput": 1000.0, "unit": "files/s", "peak_rss_mb": 40.0},
+        }
+    }
+    current = {
+        "cases": {
+            "scan": {"throughput": 800.0, "unit": "files/s", "peak_rss_mb": 60.0},
+            "organize": {"throughput": 700.0, "unit": "files/s", "peak_rss_mb": 42.0},
+            "new_case": {"throughput": 1.0, "unit": "files/s", "peak_rss_mb": 1.0},
+        }
+    }
+
+    assert compare_results(current, baseline) == [
+        "scan: peak RSS 40.0 MB -> 60.0 MB",
+        "organize: 1000 -> 700 files/s",
+    ]
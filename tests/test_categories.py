@@ -0,0 +1,107 @@
+"""
+Tests for the compiled categorization engine.
+"""
+
+import pytest
+from lazy_cli.core.categories import CategoryEngine
+from lazy_cli.core.config import CategoryRule
+
+BUILTIN = {
+    "Images": ["jpg", "png"],
+    "Archives": ["zip", "gz"],
+    "Others": [],
+}
+
+
+def test_builtin_extensions():
+    """Test plain extension lookups."""
+    engine = CategoryEngine(BUILTIN)
+
+    assert engine.classify("photo.JPG") == "Images"
+    assert engine.classify("data.gz") == "Archives"
+    assert engine.classify("README") == "Others"
+    assert engine.classify(".bashrc") == "Others"
+    assert engine.classify_extension("png") == "Images"
+
+
+def test_user_rules():
+    """Test multi-part suffixes, globs, regexes and size thresholds."""
+    rules = [
+        CategoryRule(category="Tarballs", extensions=["tar.gz"]),
+        CategoryRule(category="Screenshots", patterns=["Screenshot*.png"]),
+        CategoryRule(category="Invoices", regex=[r"invoice[-_]\d+"]),
+        {"category": "Huge", "min_size": 1000},
+    ]
+    engine = CategoryEngine(BUILTIN, rules)
+
+    assert engine.classify("backup.tar.gz") == "Tarballs"
+    assert engine.classify("other.gz") == "Archives"
+    assert engine.classify("Screenshot 2024.png") == "Screenshots"
+    assert engine.classify("photo.png") == "Images"
+    assert engine.classify("my_invoice-42.pdf") == "Invoices"
+    assert engine.classify("movie.mkv", size=5000) == "Huge"
+    assert engine.classify("movie.mkv", size=10) == "Others"
+
+    # Earlier rules win, and new categories are listed before the default
+    assert engine.classify("Screenshot.tar.gz") == "Tarballs"
+    assert engine.categories[-1] == "Others"
+    assert "Tarballs" in engine.categories
+
+
+def test_size_bounded_pattern_falls_through():
+    """Test that a pattern rule failing its size bound lets later rules match."""
+    rules = [
+        {"category": "BigLogs", "patterns": ["*.log"], "min_size": 100},
+        {"category": "Logs", "regex": [r"\.log$"]},
+    ]
+    engine = CategoryEngine(BUILTIN, rules)
+
+    assert engine.classify("app.log", size=500) == "BigLogs"
+    assert engine.classify("app.log", size=5) == "Logs"
+
+
+def test_regexes_that_cannot_be_combined():
+    """Test regexes with inline global flags and numbered backreferences."""
+    rules = [
+        {"category": "Logs", "patterns": ["*.log"]},
+        {"category": "Invoices", "regex": [r"(?i)invoice"]},
+        {"category": "Doubled", "regex": [r"(a)\1", r"(?P<x>b)(?P=x)"]},
+        {"category": "Copies", "regex": [r"(?P<y>copy)"]},
+    ]
+    engine = CategoryEngine(BUILTIN, rules)
+
+    assert engine.classify("March-INVOICE.pdf") == "Invoices"
+    assert engine.classify("INVOICE.log") == "Logs"
+    assert engine.classify("baaad.txt") == "Doubled"
+    assert engine.classify("abbey.txt") == "Doubled"
+    assert engine.classify("aba.txt") == "Others"
+    assert engine.classify("copy of photo.jpg") == "Copies"
+    assert engine.classify("photo.jpg") == "Images"
+
+    # Group names repeated across rules cannot share one pattern either
+    rules.append({"category": "Again", "regex": [r"(?P<y>again)"]})
+    engine = CategoryEngine(BUILTIN, rules)
+    assert engine.classify("copy again.jpg") == "Copies"
+    assert engine.classify("again.jpg") == "Again"
+    assert engine.classify("March-INVOICE.pdf") == "Invoices"
+
+
+def test_invalid_regex():
+    """Test that an invalid regex is reported with its category."""
+    with pytest.raises(ValueError, match="Broken"):
+        CategoryEngine(BUILTIN, [{"category": "Broken", "regex": ["(unclosed"]}])
+    with pytest.raises(ValueError, match="Broken"):
+        CategoryEngine(BUILTIN, [{"category": "Broken", "regex": ["name(?i)"]}])
+
+
+def test_many_rules():
+    """Test that hundreds of rules compile and classify correctly."""
+    rules = [
+        {"category": f"Cat{i}", "extensions": [f"x{i}"], "patterns": [f"pre{i}_*"]}
+        for i in range(500)
+    ]
+    engine = CategoryEngine(BUILTIN, rules)
+
+    assert engine.classify("file.x499") == "Cat499"
+    assert engine.classify("pre250_file.bin") == "Cat250"
+    assert engine.classify("photo.jpg") == "Images"
@@ -0,0 +1,69 @@
+"""
+Tests for cached shell completion.
+"""
+
+import json
+from lazy_cli.core import manifest
+from lazy_cli.core.completion import (
+    build_completion_table,
+    get_completions,
+    load_completion_table,
+)
+
+PLUGINS = [
+    {
+        "name": "convert",
+        "help": "Convert files",
+        "options": [
+            {
+                "flags": ["--format", "-f"],
+                "help": "Output format",
+                "is_flag": False,
+                "choices": ["json", "yaml"],
+            },
+            {"flags": ["--dry-run"], "help": "Preview", "is_flag": True, "choices": None},
+        ],
+        "arguments": [{"name": "mode", "help": "Mode", "choices": ["fast", "slow"]}],
+        "commands": {},
+    },
+]
+
+
+def test_completes_commands_options_and_choices():
+    """Test completion of command names, flags and option/argument choices."""
+    table = build_completion_table(PLUGINS)
+
+    assert get_completions(table, [], "co") == [("convert", "Convert files")]
+    assert [v for v, _ in get_completions(table, ["convert"], "--")] == [
+        "--format",
+        "--dry-run",
+        "--help",
+    ]
+    assert [v for v, _ in get_completions(table, ["convert", "--format"], "")] == ["json", "yaml"]
+    assert [v for v, _ in get_completions(table, ["convert", "-f", "json"], "f")] == ["fast"]
+    assert get_completions(table, ["convert", "fast"], "") == []
+
+
+def test_completes_top_level_options():
+    """Test that every option of lazy --help is completed, and --trace takes a value."""
+    table = build_completion_table(PLUGINS)
+
+    flags = [v for v, _ in get_completions(table, [], "--")]
+    assert flags == ["--version", "--trace", "--install-completion", "--show-completion", "--help"]
+    assert get_completions(table, ["--trace", "out.json"], "co") == [("convert", "Convert files")]
+
+
+def test_completion_cache_is_reused(tmp_path, monkeypatch):
+    """Test that an up-to-date cache is answered without reading the manifest."""
+    cache = str(tmp_path / "completion.json")
+
+    table = load_completion_table(cache)
+    assert "organize" in table["commands"]
+    with open(cache) as f:
+        assert "fingerprint" in json.load(f)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("manifest was read")
+
+    monkeypatch.setattr(manifest, "load_manifest", fail)
+    assert load_completion_table(cache) == table
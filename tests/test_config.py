@@ -0,0 +1,77 @@
+"""
+Tests for configuration loading and saving.
+"""
+
+import pytest
+import yaml
+from lazy_cli.core import config
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Point the config at a fresh home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def test_reading_does_not_write(home):
+    """Test that reading without a config file returns defaults and creates nothing."""
+    assert config.get_config_value("verbose") is False
+    assert config.load_config().organize_rules == []
+    assert not (home / ".lazy-cli").exists()
+
+
+def test_config_is_cached_until_the_file_changes(home, monkeypatch):
+    """Test that the file is parsed once, and again only after it changes."""
+    path = home / ".lazy-cli" / "config.yaml"
+    path.parent.mkdir()
+    path.write_text("stock_watchlist: [AAPL]\n")
+
+    calls = []
+    load = yaml.load
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(config.yaml, "load", counting)
+
+    for _ in range(100):
+        assert config.get_config_value("stock_watchlist") == ["AAPL"]
+    assert len(calls) == 1
+
+    path.write_text("stock_watchlist: [AAPL, MSFT]\n")
+    assert config.get_config_value("stock_watchlist") == ["AAPL", "MSFT"]
+    assert len(calls) == 2
+
+
+def test_update_config_writes_once(home, monkeypatch):
+    """Test that a transaction saves all its changes in one atomic write."""
+    saves = []
+    save = config.save_config
+    monkeypatch.setattr(config, "save_config", lambda c: saves.append(1) or save(c))
+
+    with config.update_config() as cfg:
+        cfg.verbose = True
+        cfg.stock_watchlist.append("AAPL")
+        cfg.default_downloads_folder = home / "Downloads"
+
+    assert len(saves) == 1
+    assert config.get_config_value("verbose") is True
+    data = yaml.safe_load((home / ".lazy-cli" / "config.yaml").read_text())
+    assert data["stock_watchlist"] == ["AAPL"]
+    assert data["default_downloads_folder"] == str(home / "Downloads")
+    assert [p.name for p in (home / ".lazy-cli").iterdir()] == ["config.yaml"]
+
+
+def test_update_config_rejects_invalid_values(home):
+    """Test that nothing is written when a transaction fails."""
+    config.set_config_value("verbose", True)
+
+    with pytest.raises(ValueError):
+        with config.update_config() as cfg:
+            cfg.verbose = False
+            cfg.stock_watchlist = "not a list"
+
+    assert config.get_config_value("verbose") is True
+    assert config.get_config_value("stock_watchlist") == []
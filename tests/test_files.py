@@ -0,0 +1,48 @@
+"""
+Tests for the shared file scanning helpers.
+"""
+
+from lazy_cli.core.files import list_names, scan_files, walk_files
+
+
+def test_scan_files(tmp_path):
+    """Test that scanning yields files with their stat data and skips the rest."""
+    (tmp_path / "a.txt").write_bytes(b"hello")
+    (tmp_path / ".hidden").write_bytes(b"")
+    (tmp_path / "subdir").mkdir()
+
+    records = list(scan_files(tmp_path))
+    assert [r.name for r in records] == ["a.txt"]
+    assert records[0].size == 5
+    assert records[0].path == str(tmp_path / "a.txt")
+
+    names = sorted(r.name for r in scan_files(tmp_path, include_hidden=True))
+    assert names == [".hidden", "a.txt"]
+
+
+def test_list_names(tmp_path):
+    """Test that a directory listing is returned as a set of names."""
+    (tmp_path / "a.txt").touch()
+
+    assert list_names(tmp_path) == {"a.txt"}
+    assert list_names(tmp_path / "missing") == set()
+
+
+def test_walk_files(tmp_path):
+    """Test recursive walking with depth limits, excludes and skipped dirs."""
+    files = ["a.txt", "sub/b.txt", "sub/deeper/c.txt", "node_modules/x.js", "Images/old.jpg"]
+    for relative in files:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+
+    def names(**kwargs):
+        return [r.name for r in walk_files(tmp_path, workers=4, **kwargs)]
+
+    # Deterministic depth-first order
+    assert names() == ["a.txt", "old.jpg", "x.js", "b.txt", "c.txt"]
+    assert names() == names()
+
+    assert names(max_depth=1) == ["a.txt", "old.jpg", "x.js", "b.txt"]
+    assert names(exclude=["node_modules", "*.jpg"]) == ["a.txt", "b.txt", "c.txt"]
+    assert names(skip_dirs=[tmp_path / "Images"]) == ["a.txt", "x.js", "b.txt", "c.txt"]
@@ -0,0 +1,74 @@
+"""
+Tests for single-pass hashing and the digest cache.
+"""
+
+import hashlib
+import os
+import pytest
+from lazy_cli.core.files import FileRecord
+from lazy_cli.core.hashing import HashCache, check_algorithms, hash_file, hash_files
+
+
+def test_check_algorithms():
+    """Test normalizing algorithm names."""
+    assert check_algorithms(["SHA-256", "md5", "sha256"]) == ["sha256", "md5"]
+    assert check_algorithms(["sha3-256"]) == ["sha3_256"]
+
+    with pytest.raises(ValueError):
+        check_algorithms(["crc32"])
+
+
+def test_hash_file_computes_all_digests(tmp_path):
+    """Test that every digest matches hashlib over the whole file."""
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    digests = hash_file(path, ["md5", "sha256", "blake2b"])
+
+    assert digests == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "blake2b": hashlib.blake2b(data).hexdigest(),
+    }
+
+
+def test_hash_files_in_order_with_errors(tmp_path):
+    """Test parallel hashing keeps input order and reports unreadable files."""
+    records = []
+    for i in range(50):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(str(i))
+        records.append(FileRecord(str(path), path.name, path.stat()))
+    missing = tmp_path / "0.txt"
+    missing.unlink()
+
+    results = list(hash_files(records, ["sha1"], workers=4))
+
+    assert [record for record, _, _ in results] == records
+    assert results[0][1] is None and isinstance(results[0][2], FileNotFoundError)
+    assert results[1][1] == {"sha1": hashlib.sha1(b"1").hexdigest()}
+
+
+def test_hash_cache(tmp_path):
+    """Test that unchanged files are served from the cache, changed ones are not."""
+    path = tmp_path / "file.txt"
+    path.write_text("hello")
+    cache_path = tmp_path / "hashes.db"
+
+    with HashCache(cache_path) as cache:
+        record = FileRecord(str(path), path.name, path.stat())
+        list(hash_files([record], ["md5", "sha256"], cache=cache))
+        assert cache.hits == 0
+
+    with HashCache(cache_path) as cache:
+        assert cache.get(record, ["sha256"]) == {"sha256": hashlib.sha256(b"hello").hexdigest()}
+        # An algorithm that was not computed is a miss
+        assert cache.get(record, ["sha256", "sha1"]) is None
+
+        path.write_text("hello, world")
+        os.utime(path, ns=(0, 123))
+        changed = FileRecord(str(path), path.name, path.stat())
+        assert cache.get(changed, ["sha256"]) is None
+        ((_, digests, _),) = hash_files([changed], ["sha256"], cache=cache)
+        assert digests == {"sha256": hashlib.sha256(b"hello, world").hexdigest()}
@@ -0,0 +1,52 @@
+"""
+Tests for image resizing.
+"""
+
+import pytest
+from lazy_cli.core.images import is_image, resize_images, target_size
+
+
+def test_target_size():
+    """Test width, height, percentage, fitting and stretching."""
+    assert target_size((4000, 3000), width=800) == (800, 600)
+    assert target_size((4000, 3000), height=300) == (400, 300)
+    assert target_size((4000, 3000), percent=25) == (1000, 750)
+    assert target_size((4000, 3000), width=1000, height=1000) == (1000, 750)
+    assert target_size((4000, 3000), width=1000, height=1000, keep_aspect=False) == (1000, 1000)
+    assert target_size((10000, 10), width=100) == (100, 1)
+    assert is_image("IMG_0001.JPG") and not is_image("notes.txt")
+
+    with pytest.raises(ValueError):
+        target_size((100, 100))
+
+
+def test_resize_images_in_worker_processes(tmp_path):
+    """Test batch resizing of JPEGs (with EXIF rotation) and PNGs, and errors."""
+    Image = pytest.importorskip("PIL.Image")
+
+    jobs = []
+    for index in range(4):
+        source = tmp_path / f"photo{index}.jpg"
+        exif = Image.Exif()
+        # Stored landscape, shown portrait
+        exif[0x0112] = 6 if index == 0 else 1
+        Image.new("RGB", (1600, 1200), (index * 40, 90, 160)).save(source, exif=exif)
+        jobs.append((str(source), str(tmp_path / f"small{index}.jpg")))
+    Image.new("RGBA", (300, 200)).save(tmp_path / "logo.png")
+    jobs.append((str(tmp_path / "logo.png"), str(tmp_path / "logo_small.jpg")))
+    (tmp_path / "broken.jpg").write_bytes(b"not an image")
+    jobs.append((str(tmp_path / "broken.jpg"), str(tmp_path / "broken_small.jpg")))
+
+    results = {
+        source: (size, error)
+        for source, _, size, error in resize_images(jobs, workers=2, width=400)
+    }
+
+    assert results[jobs[0][0]] == ((400, 533), None)
+    assert results[jobs[1][0]] == ((400, 300), None)
+    assert results[str(tmp_path / "logo.png")] == ((400, 267), None)
+    assert results[str(tmp_path / "broken.jpg")][0] is None
+    with Image.open(tmp_path / "small0.jpg") as image:
+        assert image.size == (400, 533)
+    assert not (tmp_path / "broken_small.jpg").exists()
+    assert not list(tmp_path.glob("*.tmp"))
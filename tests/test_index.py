@@ -0,0 +1,95 @@
+"""
+Tests for the persistent filesystem index.
+"""
+
+import shutil
+from lazy_cli.core.categories import CategoryEngine
+from lazy_cli.core.files import walk_files
+from lazy_cli.core.index import FileIndex
+
+
+def test_index_walk_matches_walk_files(tmp_path, make_tree):
+    """Test that indexed walks return what walk_files returns, listing nothing twice."""
+    make_tree(tmp_path / "tree", hidden=True)
+    root = tmp_path / "tree"
+    expected = [(r.path, r.size, r.inode) for r in walk_files(root, exclude=["b"])]
+
+    with FileIndex(tmp_path / "index.db") as index:
+        first = [(r.path, r.size, r.inode) for r in index.files(root, exclude=["b"])]
+        assert first == expected
+        assert index.stats == {"listed": 3, "reused": 0}
+
+    with FileIndex(tmp_path / "index.db") as index:
+        second = [(r.path, r.size, r.inode) for r in index.files(root, exclude=["b"])]
+        assert second == expected
+        assert index.stats == {"listed": 0, "reused": 3}
+
+        # Filters apply to stored listings too
+        shallow = [r.name for r in index.files(root, include_hidden=True, max_depth=1)]
+        assert shallow == ["top.txt", "secret.txt", "photo.jpg", "notes.pdf"]
+
+
+def test_index_relists_changed_directories(tmp_path, make_tree):
+    """Test that only directories whose mtime changed are listed again."""
+    root = tmp_path / "tree"
+    make_tree(root, hidden=True)
+
+    with FileIndex(tmp_path / "index.db") as index:
+        list(index.files(root))
+
+    (root / "a" / "new.png").write_bytes(b"x")
+    shutil.rmtree(root / "a" / "deep")
+
+    with FileIndex(tmp_path / "index.db") as index:
+        names = [r.name for r in index.files(root)]
+        assert names == ["top.txt", "new.png", "photo.jpg", "notes.pdf"]
+        assert index.stats == {"listed": 1, "reused": 2}
+
+        # The removed directory is gone from the index as well
+        remaining = index._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        assert remaining == 4
+
+
+def test_index_reuses_categories(tmp_path, make_tree, monkeypatch):
+    """Test that categories are stored, and recomputed only when the rules change."""
+    root = tmp_path / "tree"
+    make_tree(root, hidden=True)
+    engine = CategoryEngine({"Images": ["jpg"], "Audio": ["mp3"], "Others": []})
+    calls = []
+    classify = CategoryEngine.classify
+
+    def counting(self, name, size=None):
+        calls.append(name)
+        return classify(self, name, size)
+
+    monkeypatch.setattr(CategoryEngine, "classify", counting)
+
+    with FileIndex(tmp_path / "index.db") as index:
+        first = {r.name: c for r, c in index.categorized(root, engine)}
+    assert first == {
+        "top.txt": "Others",
+        "photo.jpg": "Images",
+        "song.mp3": "Audio",
+        "notes.pdf": "Others",
+    }
+
+    calls.clear()
+    with FileIndex(tmp_path / "index.db") as index:
+        assert {r.name: c for r, c in index.categorized(root, engine)} == first
+    assert calls == []
+
+    other = CategoryEngine({"Documents": ["pdf", "txt"], "Others": []})
+    with FileIndex(tmp_path / "index.db") as index:
+        second = {r.name: c for r, c in index.categorized(root, other)}
+    assert second["notes.pdf"] == "Documents"
+    assert second["song.mp3"] == "Others"
+    assert len(calls) == 4
+
+
+def test_index_reports_unreadable_directories(tmp_path):
+    """Test that a missing root goes to on_error."""
+    errors = []
+    with FileIndex(tmp_path / "index.db") as index:
+        files = list(index.files(tmp_path / "missing", on_error=lambda p, e: errors.append(p)))
+    assert files == []
+    assert errors == [str(tmp_path / "missing")]
@@ -0,0 +1,126 @@
+"""
+Tests for streaming JSON formatting and validation.
+"""
+
+import io
+import json
+import pytest
+from lazy_cli.core.jsonstream import Utf8Reader, format_jsonl, format_stream
+
+DOCUMENT = {
+    "name": 'café "quoted"',
+    "numbers": [0, -1.5, 1e100, 12345678901234567890123],
+    "nested": {"z": [], "a": {}, "m": [{"k": None, "b": True}] * 3},
+    "text": "x" * 50,
+}
+
+
+def run(text, indent=2, sort_keys=False, read_size=7, validate=False):
+    """Format text with a tiny read size, so values cross block boundaries."""
+    output = None if validate else io.StringIO()
+    format_stream(io.StringIO(text), output, indent, sort_keys, read_size=read_size)
+    return None if validate else output.getvalue()
+
+
+@pytest.mark.parametrize("indent", [None, 0, 2, 4])
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("read_size", [1, 7, 1024 * 1024])
+def test_output_matches_json_module(indent, sort_keys, read_size):
+    """Test that streamed output is exactly what json.dumps writes."""
+    text = json.dumps(DOCUMENT)
+    separators = (",", ":") if indent is None else None
+    expected = json.dumps(
+        DOCUMENT, indent=indent, sort_keys=sort_keys, ensure_ascii=False, separators=separators
+    )
+
+    assert run(text, indent, sort_keys, read_size) == expected + "\n"
+
+
+@pytest.mark.parametrize("length", range(8, 40))
+def test_closing_quote_on_block_boundary(length):
+    """Test strings and keys whose closing quote is the last character of a block."""
+    document = {"k" * length: ["x" * length, "y\\" * length]}
+    text = json.dumps(document)
+
+    assert run(text, None, read_size=16) == json.dumps(document, separators=(",", ":")) + "\n"
+
+
+def test_long_string_ending_on_block_boundary():
+    """Test a string longer than a block, ending exactly on a later boundary."""
+    text = '["' + "x" * (3 * 1024 * 1024 - 3) + '"]'
+    assert run(text, None, read_size=1024 * 1024) == text + "\n"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"a": 1,\n  "b": }', "[1, 2", '{"a" 1}', "[1] 2", '["abc', "", "[1,]"],
+)
+def test_errors_match_json_module(text):
+    """Test that the first error has the message and position json.loads gives."""
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        run(text, validate=True)
+
+    assert (error.value.msg, error.value.lineno, error.value.colno) == (
+        expected.value.msg,
+        expected.value.lineno,
+        expected.value.colno,
+    )
+
+
+@pytest.mark.parametrize("cut", [1, 2])
+def test_truncated_large_container(cut):
+    """Test that a container larger than a block must be closed, as json.loads requires."""
+    document = [{"id": i, "tags": ["a", "b"]} for i in range(300)]
+    text = json.dumps(document)[:-cut]
+    output = io.StringIO()
+
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError) as error:
+        format_stream(io.StringIO(text), output, None, read_size=64)
+
+    assert (error.value.msg, error.value.pos) == (expected.value.msg, expected.value.pos)
+    assert not output.getvalue().endswith("]")
+
+
+def test_utf8_reader_across_blocks():
+    """Test decoding characters split between reads, and the position of bad bytes."""
+    data = '{"a": "é€😀",\n"b": "'.encode("utf-8")
+    reader = Utf8Reader(io.BytesIO(data + b"ok\xe9"))
+    output = io.StringIO()
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        format_stream(reader, output, read_size=3)
+    assert error.value.msg == f"Invalid UTF-8 at byte {len(data) + 2} (unexpected end of data)"
+    assert (error.value.lineno, error.value.colno) == (2, 9)
+
+    reader = Utf8Reader(io.BytesIO(data + b'ok"}'))
+    format_stream(reader, output, read_size=3)
+
+
+def test_nan_is_rejected():
+    """Test that NaN and Infinity, accepted by json.loads, are reported as invalid."""
+    with pytest.raises(json.JSONDecodeError, match="Invalid literal NaN"):
+        run('{"a": [1, NaN]}', validate=True)
+
+
+def test_format_jsonl_in_worker_processes():
+    """Test parallel JSON Lines output order, record count and error lines."""
+    lines = [json.dumps({"id": i, "b": [i] * 3, "a": "x"}) for i in range(2000)]
+    source = io.BytesIO(("\n".join(lines) + "\n\n").encode())
+    output = io.BytesIO()
+
+    records = format_jsonl(source, output, sort_keys=True, workers=2, chunk_size=4096)
+
+    assert records == 2000
+    result = output.getvalue().decode().splitlines()
+    assert [json.loads(line)["id"] for line in result] == list(range(2000))
+    assert result[0] == '{"a":"x","b":[0,0,0],"id":0}'
+
+    lines[1500] = '{"id": 1500,'
+    with pytest.raises(json.JSONDecodeError) as error:
+        format_jsonl(io.BytesIO("\n".join(lines).encode()), None, workers=2, chunk_size=4096)
+    assert error.value.lineno == 1501
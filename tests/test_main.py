@@ -0,0 +1,64 @@
+"""
+Tests for the lazy-cli entry point and its fast paths.
+"""
+
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["typer", "rich", "pydantic", "yaml", "lazy_cli.plugins.organize_files"]
+
+
+def run_lazy(*args, env=None):
+    """Run the lazy entry point in a fresh interpreter and report heavy imports."""
+    code = (
+        "import sys, atexit\n"
+        f"sys.argv = ['lazy'] + {list(args)!r}\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "atexit.register(lambda: print(sorted(m for m in heavy if m in sys.modules), file=sys.stderr))\n"
+        "from lazy_cli.main import run\n"
+        "run()\n"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, **(env or {})),
+    )
+
+
+def test_version_fast_path():
+    """Test that --version does not import typer, rich, pydantic or yaml."""
+    result = run_lazy("--version")
+
+    assert result.returncode == 0
+    assert "lazy-cli version" in result.stdout
+    assert result.stderr.strip() == "[]"
+
+
+def test_help_fast_path():
+    """Test that top-level help lists plugins from cached metadata only."""
+    result = run_lazy("--help")
+
+    assert result.returncode == 0
+    assert "organize" in result.stdout
+    assert "Organize files into folders" in result.stdout
+    assert result.stderr.strip() == "[]"
+
+
+def test_completion_fast_path():
+    """Test that shell completion is answered without heavy imports."""
+    env = {"_LAZY_COMPLETE": "complete_bash", "COMP_WORDS": "lazy organize --dr", "COMP_CWORD": "2"}
+    result = run_lazy(env=env)
+
+    assert result.returncode == 0
+    assert result.stdout.split() == ["--dry-run"]
+    assert result.stderr.strip() == "[]"
+
+
+def test_app_is_built_on_demand():
+    """Test that lazy_cli.main.app still exposes the Typer application."""
+    from lazy_cli.main import app
+    import typer
+
+    assert isinstance(app, typer.Typer)
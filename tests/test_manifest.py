@@ -0,0 +1,100 @@
+"""
+Tests for the plugin manifest cache.
+"""
+
+import os
+import pytest
+from lazy_cli.core import manifest
+from lazy_cli.core.manifest import PluginManifest, read_plugin_metadata
+
+PLUGIN_SOURCE = '''
+import typer
+
+PLUGIN_NAME = "hello"
+PLUGIN_HELP = "Say hello"
+
+app = typer.Typer()
+
+raise RuntimeError("plugin code must not run")
+
+@app.command()
+def main(
+    name: str = typer.Argument(..., help="Who to greet"),
+    loud: bool = typer.Option(False, "--loud", "-l", help="Shout"),
+):
+    """Greet someone."""
+'''
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    """Create a plugins directory with a single plugin."""
+    directory = tmp_path / "plugins"
+    directory.mkdir()
+    (directory / "hello.py").write_text(PLUGIN_SOURCE)
+    (directory / "_private.py").write_text("PLUGIN_NAME = 'private'\n")
+    return directory
+
+
+def test_read_plugin_metadata(plugins_dir):
+    """Test that metadata and options are read without executing the plugin."""
+    metadata = read_plugin_metadata(plugins_dir / "hello.py", "lazy_cli.plugins.hello")
+
+    assert metadata["name"] == "hello"
+    assert metadata["help"] == "Say hello"
+    assert metadata["arguments"] == [{"name": "name", "help": "Who to greet", "choices": None}]
+    assert metadata["options"][0]["flags"] == ["--loud", "-l"]
+    assert metadata["options"][0]["is_flag"] is True
+
+
+def test_manifest_is_cached_and_invalidated(tmp_path, plugins_dir, monkeypatch):
+    """Test that unchanged files are served from the cache and changed files re-read."""
+    cache = tmp_path / "plugins.json"
+    plugins = PluginManifest(cache, plugins_dir).plugins(include_entry_points=False)
+
+    assert [p["name"] for p in plugins] == ["hello"]
+    assert cache.exists()
+
+    # A fresh manifest must not parse unchanged files again
+    def fail(*args, **kwargs):
+        raise AssertionError("file was re-parsed")
+
+    monkeypatch.setattr(manifest, "read_plugin_metadata", fail)
+    plugins = PluginManifest(cache, plugins_dir).plugins(include_entry_points=False)
+    assert plugins[0]["help"] == "Say hello"
+
+    # Changing the file invalidates its entry
+    monkeypatch.undo()
+    plugin_file = plugins_dir / "hello.py"
+    plugin_file.write_text(PLUGIN_SOURCE.replace("Say hello", "Say hi there"))
+    st = plugin_file.stat()
+    os.utime(plugin_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    plugins = PluginManifest(cache, plugins_dir).plugins(include_entry_points=False)
+    assert plugins[0]["help"] == "Say hi there"
+
+
+def test_entry_points_are_cached(tmp_path, plugins_dir, monkeypatch):
+    """Test that entry points are only rescanned when sys.path changes."""
+    package = tmp_path / "site" / "thirdparty"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "tool.py").write_text(PLUGIN_SOURCE.replace('"hello"', '"third"'))
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+
+    scans = []
+
+    def scan():
+        scans.append(1)
+        return [{"name": "third", "value": "thirdparty.tool:app"}]
+
+    monkeypatch.setattr(manifest, "_scan_entry_points", scan)
+    cache = tmp_path / "plugins.json"
+
+    for _ in range(2):
+        plugins = PluginManifest(cache, plugins_dir).plugins()
+        third = [p for p in plugins if p.get("entry_point") == "third"][0]
+        assert third["name"] == "third"
+        assert third["module"] == "thirdparty.tool"
+        assert third["attr"] == "app"
+
+    assert len(scans) == 1
@@ -0,0 +1,68 @@
+"""
+Tests for the file move executor.
+"""
+
+import errno
+import os
+from lazy_cli.core import mover
+from lazy_cli.core.mover import MoveExecutor, copy_file, move_across_devices
+
+
+def test_copy_file(tmp_path):
+    """Test that a copy reproduces the source contents."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(300_000))
+
+    copy_file(str(source), str(tmp_path / "copy.bin"))
+    assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+
+def test_move_across_devices(tmp_path):
+    """Test that a cross-device move copies, keeps mtime and removes the source."""
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"data")
+    os.utime(source, (1_000_000, 1_000_000))
+    destination = tmp_path / "dest" / "source.txt"
+    destination.parent.mkdir()
+
+    move_across_devices(str(source), str(destination))
+    assert not source.exists()
+    assert destination.read_bytes() == b"data"
+    assert destination.stat().st_mtime == 1_000_000
+    assert os.listdir(destination.parent) == ["source.txt"]
+
+
+def test_executor_rename_and_errors(tmp_path):
+    """Test same-device renames and that failures are reported, not raised."""
+    (tmp_path / "a.txt").write_bytes(b"a")
+    (tmp_path / "out").mkdir()
+    results = []
+
+    with MoveExecutor(on_done=lambda s, d, e: results.append((os.path.basename(s), e))) as m:
+        m.submit(str(tmp_path / "a.txt"), str(tmp_path / "out" / "a.txt"))
+        m.submit(str(tmp_path / "missing.txt"), str(tmp_path / "out" / "missing.txt"))
+
+    assert (tmp_path / "out" / "a.txt").read_bytes() == b"a"
+    assert results[0] == ("a.txt", None)
+    assert results[1][0] == "missing.txt"
+    assert isinstance(results[1][1], FileNotFoundError)
+
+
+def test_executor_cross_device_fallback(tmp_path, monkeypatch):
+    """Test that an EXDEV rename falls back to copying in the pool."""
+
+    def rename(source, destination):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(mover.os, "rename", rename)
+    (tmp_path / "out").mkdir()
+    results = []
+
+    with MoveExecutor(on_done=lambda s, d, e: results.append(e), workers=2) as m:
+        for i in range(10):
+            (tmp_path / f"{i}.txt").write_bytes(str(i).encode())
+            m.submit(str(tmp_path / f"{i}.txt"), str(tmp_path / "out" / f"{i}.txt"))
+
+    assert results == [None] * 10
+    assert sorted(os.listdir(tmp_path / "out")) == sorted(f"{i}.txt" for i in range(10))
+    assert (tmp_path / "out" / "7.txt").read_bytes() == b"7"
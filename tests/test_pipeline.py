@@ -0,0 +1,46 @@
+"""
+Tests for the bounded pipeline hand-off.
+"""
+
+import threading
+import pytest
+from lazy_cli.core.pipeline import prefetch
+
+
+def test_prefetch_preserves_order():
+    """Test that items arrive in order across batches."""
+    assert list(prefetch(range(1000), batch_size=7, max_batches=2)) == list(range(1000))
+
+
+def test_prefetch_raises_producer_errors():
+    """Test that an exception in the producer reaches the consumer."""
+
+    def broken():
+        yield 1
+        raise OSError("disk gone")
+
+    items = prefetch(broken())
+    with pytest.raises(OSError):
+        list(items)
+
+
+def test_prefetch_backpressure_and_early_stop():
+    """Test that the producer stays a bounded distance ahead and stops with the consumer."""
+    produced = []
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(10_000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    items = prefetch(source(), batch_size=10, max_batches=2)
+    assert next(items) == 0
+    items.close()
+
+    assert closed.wait(5)
+    # Two queued batches, one being filled and one handed to the consumer
+    assert len(produced) <= 10 * 4 + 1
@@ -0,0 +1,123 @@
+"""
+Tests for move plans and journaled execution.
+"""
+
+import json
+import os
+import pytest
+from lazy_cli.core.plan import apply_plan, get_journal_path, read_plan, undo_plan, write_plan
+
+
+def make_plan(tmp_path, count=5):
+    """Create count files and a plan moving them into out/."""
+    moves = []
+    for i in range(count):
+        (tmp_path / f"{i}.txt").write_text(str(i))
+        moves.append((str(tmp_path / f"{i}.txt"), str(tmp_path / "out" / f"{i}.txt")))
+    plan = tmp_path / "plan.jsonl"
+    assert write_plan(str(plan), str(tmp_path), moves) == count
+    return str(plan), moves
+
+
+def ignore(source, destination, error):
+    assert error is None
+
+
+def test_write_and_read_plan(tmp_path):
+    """Test that plans store relative paths and read back absolute ones."""
+    plan, moves = make_plan(tmp_path, 2)
+
+    lines = open(plan).read().splitlines()
+    assert json.loads(lines[1]) == ["0.txt", os.path.join("out", "0.txt")]
+
+    header, read_moves = read_plan(plan)
+    assert header["root"] == str(tmp_path)
+    assert read_moves == moves
+
+
+def test_read_plan_rejects_other_files(tmp_path):
+    """Test that a file that is not a plan is refused."""
+    (tmp_path / "notes.txt").write_text("hello\n")
+
+    with pytest.raises(ValueError):
+        read_plan(str(tmp_path / "notes.txt"))
+
+
+def test_apply_resumes_after_interruption(tmp_path):
+    """Test that an interrupted run resumes after its last committed batch."""
+    plan, moves = make_plan(tmp_path)
+    done = []
+
+    def interrupt(source, destination, error):
+        done.append(source)
+        if len(done) == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        apply_plan(plan, interrupt, batch_size=2)
+
+    # Batch 0..1 committed, move 2 happened but its batch did not
+    assert (tmp_path / "out" / "2.txt").exists()
+
+    stats = apply_plan(plan, ignore, batch_size=2)
+    assert stats == {"moved": 2, "skipped": 3, "errors": 0}
+    assert sorted(os.listdir(tmp_path / "out")) == [f"{i}.txt" for i in range(5)]
+
+
+def test_apply_reports_collisions(tmp_path):
+    """Test that an existing destination is never overwritten."""
+    plan, moves = make_plan(tmp_path, 2)
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "1.txt").write_text("existing")
+    errors = []
+
+    stats = apply_plan(plan, lambda s, d, e: errors.append(e))
+    assert stats == {"moved": 1, "skipped": 0, "errors": 1}
+    assert isinstance(errors[1], FileExistsError)
+    assert (tmp_path / "out" / "1.txt").read_text() == "existing"
+
+
+def test_apply_reports_unusable_folders(tmp_path):
+    """Test that a file in place of a target folder fails its moves, not the run."""
+    plan, moves = make_plan(tmp_path, 3)
+    (tmp_path / "out").write_text("not a folder")
+    errors = []
+
+    stats = apply_plan(plan, lambda s, d, e: errors.append(e))
+    assert stats == {"moved": 0, "skipped": 0, "errors": 3}
+    assert all(isinstance(error, OSError) for error in errors)
+    assert (tmp_path / "0.txt").read_text() == "0"
+
+
+def test_undo(tmp_path):
+    """Test that undo restores every applied move and removes empty folders."""
+    plan, moves = make_plan(tmp_path)
+    apply_plan(plan, ignore, batch_size=2)
+
+    stats = undo_plan(plan, ignore)
+    assert stats == {"moved": 5, "skipped": 0, "errors": 0}
+    assert not (tmp_path / "out").exists()
+    assert (tmp_path / "4.txt").read_text() == "4"
+
+    # Undoing twice does nothing; applying again works
+    assert undo_plan(plan, ignore)["moved"] == 0
+    assert apply_plan(plan, ignore)["moved"] == 5
+    assert os.path.exists(get_journal_path(plan))
+
+
+def test_undo_interrupted_batch(tmp_path):
+    """Test that undo also restores moves of a batch that never committed."""
+    plan, moves = make_plan(tmp_path)
+    done = []
+
+    def interrupt(source, destination, error):
+        done.append(source)
+        if len(done) == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        apply_plan(plan, interrupt, batch_size=2)
+
+    stats = undo_plan(plan, ignore)
+    assert stats["moved"] == 3
+    assert sorted(p.name for p in tmp_path.glob("*.txt")) == [f"{i}.txt" for i in range(5)]
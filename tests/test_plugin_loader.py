@@ -2,9 +2,15 @@
 Tests for plugin loader functionality.
 """
 
+import subprocess
+import sys
 import pytest
+import typer
 from pathlib import Path
-from lazy_cli.core.plugin_loader import get_plugin_info
+from typer.testing import CliRunner
+from lazy_cli.core.plugin_loader import LazyPluginGroup, get_plugin_info
+
+runner = CliRunner()
 
 
 def test_get_plugin_info():
@@ -28,3 +34,34 @@ def test_organize_plugin_exists():
     plugin_names = [p["name"] for p in plugins]
     
     assert "organize" in plugin_names
+
+
+def test_load_plugins_does_not_import_plugins():
+    """Test that registering plugins does not import plugin modules."""
+    code = "import sys, lazy_cli.main; " "print('lazy_cli.plugins.organize_files' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "False"
+
+
+def test_broken_plugin_only_fails_when_invoked():
+    """Test that a broken plugin is listed in help and only fails on dispatch."""
+    broken = {
+        "name": "broken",
+        "help": "A plugin that cannot be imported",
+        "file": "broken.py",
+        "module": "lazy_cli.plugins._does_not_exist",
+    }
+    app = typer.Typer(cls=LazyPluginGroup.with_plugins([broken]))
+
+    @app.callback()
+    def main():
+        pass
+
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "broken" in result.stdout
+
+    result = runner.invoke(app, ["broken"])
+    assert result.exit_code == 1
@@ -0,0 +1,79 @@
+"""
+Tests for the backup plugin.
+"""
+
+import os
+import zipfile
+from typer.testing import CliRunner
+from lazy_cli.plugins.backup import DELETED_LIST, app
+
+runner = CliRunner()
+
+
+def test_backup_help():
+    """Test backup help command."""
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "Back up" in result.stdout
+
+
+def test_backup_is_incremental(tmp_path):
+    """Test a full backup, then one archiving only changed files and deletions."""
+    source = tmp_path / "home"
+    (source / "docs").mkdir(parents=True)
+    (source / "docs" / "a.txt").write_text("a")
+    (source / "docs" / "b.txt").write_text("b")
+    (source / "gone.txt").write_text("gone")
+    (source / "cache.tmp").write_text("excluded")
+    backups = tmp_path / "backups"
+
+    result = runner.invoke(app, [str(source), str(backups), "--exclude", "*.tmp"])
+    assert result.exit_code == 0
+    [first] = sorted(backups.glob("*.zip"))
+    with zipfile.ZipFile(first) as archive:
+        assert sorted(archive.namelist()) == ["docs/a.txt", "docs/b.txt", "gone.txt"]
+
+    result = runner.invoke(app, [str(source), str(backups), "-e", "*.tmp"])
+    assert result.exit_code == 0
+    assert "No changes" in result.stdout
+
+    (source / "docs" / "a.txt").write_text("changed")
+    os.utime(source / "docs" / "b.txt", (0, 2**31))
+    (source / "gone.txt").unlink()
+    result = runner.invoke(app, [str(source), str(backups), "-e", "*.tmp", "--output", "jsonl"])
+    assert result.exit_code == 0
+    assert '"archived": 1, "bytes": 7' in result.stdout
+    assert '"unchanged": 0, "touched": 1, "deleted": 1' in result.stdout
+
+    [second] = [path for path in backups.glob("*.zip") if path != first]
+    with zipfile.ZipFile(second) as archive:
+        assert sorted(archive.namelist()) == [DELETED_LIST, "docs/a.txt"]
+        assert archive.read("docs/a.txt") == b"changed"
+        assert archive.read(DELETED_LIST) == b"gone.txt\n"
+
+
+def test_backup_archives_symlinks_as_links(tmp_path):
+    """Test that symlinks, even dangling ones, are archived as links once."""
+    source = tmp_path / "home"
+    source.mkdir()
+    (source / "a.txt").write_text("contents of a")
+    os.symlink("a.txt", source / "link.txt")
+    os.symlink("missing", source / ".#lock")
+    backups = tmp_path / "backups"
+
+    result = runner.invoke(app, [str(source), str(backups)])
+    assert result.exit_code == 0
+    [first] = backups.glob("*.zip")
+    with zipfile.ZipFile(first) as archive:
+        assert archive.read("link.txt") == b"a.txt"
+        assert archive.read(".#lock") == b"missing"
+        assert archive.getinfo("link.txt").external_attr >> 16 == 0o120777
+
+    result = runner.invoke(app, [str(source), str(backups)])
+    assert result.exit_code == 0
+    assert "No changes" in result.stdout
+
+    (source / "a.txt").unlink()
+    result = runner.invoke(app, [str(source), str(backups), "--output", "jsonl"])
+    assert result.exit_code == 0
+    assert '"touched": 0, "deleted": 1' in result.stdout
@@ -0,0 +1,72 @@
+"""
+Tests for the checksum plugin.
+"""
+
+import hashlib
+import json
+from typer.testing import CliRunner
+from lazy_cli.plugins.checksum import app, format_digests, parse_checksum_file
+
+runner = CliRunner()
+
+
+def test_checksum_help():
+    """Test checksum help command."""
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "checksum" in result.stdout
+
+
+def test_format_and_parse_checksum_file(tmp_path):
+    """Test that written checksum lines can be read back in both formats."""
+    sha256 = hashlib.sha256(b"a").hexdigest()
+    md5 = hashlib.md5(b"a").hexdigest()
+    lines = format_digests("dir/a.txt", {"sha256": sha256})
+    lines += format_digests("b.txt", {"md5": md5, "sha256": sha256})
+    lines += ["# comment", f"{md5} *c.bin", "not a checksum line"]
+    checksum_file = tmp_path / "SUMS"
+    checksum_file.write_text("\n".join(lines) + "\n")
+
+    entries, invalid = parse_checksum_file(checksum_file)
+
+    assert entries == [
+        ("dir/a.txt", {"sha256": sha256}),
+        ("b.txt", {"md5": md5, "sha256": sha256}),
+        ("c.bin", {"md5": md5}),
+    ]
+    assert invalid == 1
+
+
+def test_checksum_and_verify(tmp_path, monkeypatch):
+    """Test hashing a tree, then verifying it and detecting a change."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    tree = tmp_path / "tree"
+    (tree / "sub").mkdir(parents=True)
+    (tree / "a.txt").write_text("a")
+    (tree / "sub" / "b.txt").write_text("b")
+
+    result = runner.invoke(app, [str(tree), "--recursive"])
+    assert result.exit_code == 0
+    assert f"{hashlib.sha256(b'a').hexdigest()}  {tree / 'a.txt'}" in result.stdout
+    checksum_file = tmp_path / "SHA256SUMS"
+    checksum_file.write_text(result.stdout)
+    assert (tmp_path / ".lazy-cli" / "hashes.db").exists()
+
+    result = runner.invoke(app, ["--verify", str(checksum_file), "--verbose"])
+    assert result.exit_code == 0
+    assert "a.txt: OK" in result.stdout
+
+    (tree / "sub" / "b.txt").write_text("changed")
+    (tree / "a.txt").unlink()
+    result = runner.invoke(app, ["--verify", str(checksum_file), "--output", "jsonl"])
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records[-1] == {"event": "summary", "ok": 0, "failed": 1, "missing": 1}
+
+
+def test_checksum_rejects_unknown_algorithm(tmp_path):
+    """Test that an unsupported algorithm is an error."""
+    (tmp_path / "a.txt").write_text("a")
+    result = runner.invoke(app, [str(tmp_path / "a.txt"), "--algorithm", "crc32", "--no-cache"])
+    assert result.exit_code == 1
+    assert "Unsupported algorithm" in result.stdout
@@ -0,0 +1,101 @@
+"""
+Tests for the clean plugin.
+"""
+
+import json
+import os
+import time
+from typer.testing import CliRunner
+from lazy_cli.core.deleter import DeleteExecutor
+from lazy_cli.plugins.clean import age_band, app, clean_files, iter_expired
+
+runner = CliRunner()
+
+DAY = 86400
+
+
+def make_file(path, days_old, size=1):
+    """Create a file with a modification time days_old days in the past."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - days_old * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_age_band():
+    """Test the age bands of the preview table."""
+    now = time.time_ns()
+    assert age_band(now - 10 * DAY * 10**9, now) == "Under 1 month"
+    assert age_band(now - 100 * DAY * 10**9, now) == "1-6 months"
+    assert age_band(now - 400 * DAY * 10**9, now) == "Over 1 year"
+
+
+def test_iter_expired_filters_by_age_and_size(tmp_path):
+    """Test that only old enough and large enough files are selected."""
+    make_file(tmp_path / "new.log", 1)
+    make_file(tmp_path / "old.log", 40)
+    make_file(tmp_path / "old-big.log", 40, size=2048)
+    make_file(tmp_path / "sub" / "old.log", 40)
+
+    names = sorted(record.name for record in iter_expired(tmp_path, 30))
+    assert names == ["old-big.log", "old.log"]
+
+    records = iter_expired(tmp_path, 30, min_size=1024, recursive=True)
+    assert [record.name for record in records] == ["old-big.log"]
+
+
+def test_clean_removes_emptied_directories(tmp_path):
+    """Test deletion in batches and bottom-up removal of emptied directories."""
+    for i in range(20):
+        make_file(tmp_path / "a" / "b" / f"{i}.tmp", 40)
+    make_file(tmp_path / "a" / "keep" / "new.tmp", 1)
+    make_file(tmp_path / "c" / "old.tmp", 40)
+    (tmp_path / "untouched").mkdir()
+
+    records = iter_expired(tmp_path, 30, recursive=True)
+    stats = clean_files(tmp_path, records, workers=2)
+
+    assert stats == {"deleted": 21, "bytes": 21, "directories": 2, "errors": 0}
+    assert sorted(os.listdir(tmp_path)) == ["a", "untouched"]
+    assert os.listdir(tmp_path / "a") == ["keep"]
+
+
+def test_delete_executor_reports_errors(tmp_path):
+    """Test that a failed unlink is reported and does not stop the batch."""
+    existing = make_file(tmp_path / "a.txt", 0)
+    results = {}
+
+    with DeleteExecutor(lambda path, error: results.update({path: error}), batch_size=2) as d:
+        d.submit(str(tmp_path / "missing.txt"))
+        d.submit(str(existing), 1)
+
+    assert isinstance(results[str(tmp_path / "missing.txt")], FileNotFoundError)
+    assert results[str(existing)] is None
+    assert d.bytes_deleted == 1
+    assert not existing.exists()
+
+
+def test_clean_dry_run(tmp_path):
+    """Test that a dry run reports reclaimable space and deletes nothing."""
+    make_file(tmp_path / "old.log", 40, size=2048)
+
+    result = runner.invoke(app, [str(tmp_path), "--dry-run"])
+
+    assert result.exit_code == 0
+    assert "reclaiming 2.0 KB" in result.stdout
+    assert (tmp_path / "old.log").exists()
+
+
+def test_clean_yes_jsonl(tmp_path):
+    """Test an unattended recursive run with JSON output."""
+    make_file(tmp_path / "sub" / "old.log", 40)
+    make_file(tmp_path / "new.log", 0)
+
+    result = runner.invoke(app, [str(tmp_path), "-r", "--yes", "--output", "jsonl"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["event"] for record in records] == ["deleted", "removed_directory", "summary"]
+    assert records[-1]["deleted"] == 1
+    assert os.listdir(tmp_path) == ["new.log"]
@@ -0,0 +1,72 @@
+"""
+Tests for the du plugin.
+"""
+
+import json
+import os
+from typer.testing import CliRunner
+from lazy_cli.plugins.du import app
+
+runner = CliRunner()
+
+
+def make_tree(root):
+    """Create a tree with a large file deep down, hard-linked from a later directory."""
+    (root / "videos" / "2024").mkdir(parents=True)
+    (root / "work").mkdir()
+    (root / "videos" / "2024" / "trip.mp4").write_bytes(b"v" * 5000)
+    (root / "work" / "report.pdf").write_bytes(b"d" * 300)
+    (root / "notes.txt").write_bytes(b"n" * 10)
+    os.link(root / "videos" / "2024" / "trip.mp4", root / "work" / "trip-copy.mp4")
+    for path, _, _ in os.walk(root):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+
+
+def test_du_help():
+    """Test du help command."""
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "largest directories" in result.stdout
+
+
+def test_du_text_report(tmp_path, monkeypatch):
+    """Test the tables and the totals, hard links counted once."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    root = tmp_path / "tree"
+    make_tree(root)
+
+    result = runner.invoke(app, [str(root), "--top", "2"])
+    assert result.exit_code == 0
+    assert "Largest Directories" in result.stdout
+    assert "trip.mp4" in result.stdout
+    assert "trip-copy.mp4" not in result.stdout
+    assert "5.2 KB in 3 file(s), 4 directories" in result.stdout
+    assert "4 listed, 0 unchanged" in result.stdout
+
+    result = runner.invoke(app, [str(root)])
+    assert "0 listed, 4 unchanged" in result.stdout
+
+    result = runner.invoke(app, [str(root), "--no-cache"])
+    assert "4 listed, 0 unchanged" in result.stdout
+
+
+def test_du_json_report(tmp_path):
+    """Test the JSON report."""
+    root = tmp_path / "tree"
+    make_tree(root)
+
+    result = runner.invoke(app, [str(root), "--no-cache", "--output", "json", "-n", "2"])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["size"] == 5310
+    assert report["files"] == 3
+    assert report["directories"] == 4
+    assert [entry["path"] for entry in report["largest_directories"]] == [
+        str(root / "videos"),
+        str(root / "videos" / "2024"),
+    ]
+    assert report["largest_files"] == [
+        {"path": str(root / "videos" / "2024" / "trip.mp4"), "size": 5000},
+        {"path": str(root / "work" / "report.pdf"), "size": 300},
+    ]
+    assert report["errors"] == 0
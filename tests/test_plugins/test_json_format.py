@@ -0,0 +1,75 @@
+"""
+Tests for the json plugin.
+"""
+
+import json
+from typer.testing import CliRunner
+from lazy_cli.plugins.json_format import app
+
+runner = CliRunner()
+
+
+def test_json_help():
+    """Test json help command."""
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "JSON" in result.stdout
+
+
+def test_json_format_and_write_in_place(tmp_path):
+    """Test pretty-printing to stdout, and sorting and minifying a file in place."""
+    data = {"b": [1, {"d": None}], "a": "é"}
+    source = tmp_path / "data.json"
+    source.write_text(json.dumps(data), encoding="utf-8")
+
+    result = runner.invoke(app, [str(source)])
+    assert result.exit_code == 0
+    assert result.stdout == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+    result = runner.invoke(app, [str(source), "--minify", "--sort-keys", "--write", str(source)])
+    assert result.exit_code == 0
+    assert source.read_text(encoding="utf-8") == '{"a":"é","b":[1,{"d":null}]}\n'
+    assert list(tmp_path.iterdir()) == [source]
+
+
+def test_json_check_reports_error_position(tmp_path):
+    """Test that --check reports the first error and --write leaves the file alone."""
+    source = tmp_path / "bad.json"
+    source.write_text('{"a": 1,\n  "b": }')
+
+    result = runner.invoke(app, [str(source), "--check"])
+    assert result.exit_code == 1
+    assert "line 2, column 8: Expecting value" in result.output
+
+    result = runner.invoke(app, [str(source), "--write", str(source)])
+    assert result.exit_code == 1
+    assert source.read_text() == '{"a": 1,\n  "b": }'
+    assert list(tmp_path.iterdir()) == [source]
+
+
+def test_json_check_reports_invalid_utf8(tmp_path):
+    """Test that bytes that are not UTF-8 are an error with their position."""
+    source = tmp_path / "latin1.json"
+    source.write_bytes(b'{"a": "caf\xe9",\n "b": "\xff"}')
+
+    result = runner.invoke(app, [str(source), "--check"])
+    assert result.exit_code == 1
+    assert "line 1, column 11: Invalid UTF-8 at byte 10" in result.stdout
+
+    result = runner.invoke(app, ["-", "--check"], input=b'{"a": "\xff"}')
+    assert result.exit_code == 1
+    assert "Invalid UTF-8 at byte 7" in result.stdout
+
+
+def test_json_lines(tmp_path):
+    """Test that .jsonl files are detected and written one record per line."""
+    source = tmp_path / "events.jsonl"
+    source.write_text('{"id": 1, "tags": ["x"]}\n\n{"id": 2}\n')
+
+    result = runner.invoke(app, [str(source), "--workers", "1"])
+    assert result.exit_code == 0
+    assert result.stdout == '{"id":1,"tags":["x"]}\n{"id":2}\n'
+
+    result = runner.invoke(app, [str(source), "--check"])
+    assert result.exit_code == 0
+    assert "2 record(s)" in result.stdout
@@ -2,11 +2,21 @@
 Tests for the organize_files plugin.
 """
 
+import json
+import threading
 import pytest
 from pathlib import Path
 import tempfile
 from typer.testing import CliRunner
-from lazy_cli.plugins.organize_files import app, get_category, scan_directory
+from lazy_cli.core.watch import DirectoryWatcher
+from lazy_cli.plugins.organize_files import (
+    app,
+    build_category_engine,
+    get_category,
+    organize_files,
+    organize_watch,
+    scan_directory,
+)
 
 runner = CliRunner()
 
@@ -70,3 +80,195 @@ def test_organize_dry_run():
         assert (tmpdir_path / "doc.pdf").exists()
         assert not (tmpdir_path / "Images").exists()
         assert not (tmpdir_path / "Documents").exists()
+
+
+def test_organize_moves_files_and_skips_collisions():
+    """Test that files are moved and existing destinations are skipped."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        # Create test files, one of which already exists in its category folder
+        (tmpdir_path / "test.jpg").write_bytes(b"image")
+        (tmpdir_path / "doc.pdf").write_bytes(b"pdf")
+        (tmpdir_path / "Documents").mkdir()
+        (tmpdir_path / "Documents" / "doc.pdf").write_bytes(b"old")
+
+        categorized = scan_directory(tmpdir_path)
+        assert categorized["Images"][0].size == 5
+
+        stats = organize_files(tmpdir_path, categorized)
+
+        assert stats == {"moved": 1, "skipped": 1, "errors": 0}
+        assert (tmpdir_path / "Images" / "test.jpg").exists()
+        assert (tmpdir_path / "doc.pdf").exists()
+        assert (tmpdir_path / "Documents" / "doc.pdf").read_bytes() == b"old"
+
+
+def test_scan_directory_with_custom_rules():
+    """Test that user rules create new categories during a scan."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        (tmpdir_path / "backup.tar.gz").touch()
+        (tmpdir_path / "photo.jpg").touch()
+
+        engine = build_category_engine([{"category": "Backups", "extensions": ["tar.gz"]}])
+        categorized = scan_directory(tmpdir_path, engine=engine)
+
+        assert len(categorized["Backups"]) == 1
+        assert len(categorized["Images"]) == 1
+
+
+def test_organize_recursive():
+    """Test that recursive mode collects nested files but skips category folders."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        (tmpdir_path / "nested" / "deep").mkdir(parents=True)
+        (tmpdir_path / "nested" / "photo.png").touch()
+        (tmpdir_path / "nested" / "deep" / "song.mp3").touch()
+        (tmpdir_path / "Images").mkdir()
+        (tmpdir_path / "Images" / "sorted.jpg").touch()
+
+        result = runner.invoke(app, [str(tmpdir_path), "--recursive", "--yes"])
+
+        assert result.exit_code == 0
+        assert (tmpdir_path / "Images" / "photo.png").exists()
+        assert (tmpdir_path / "Audio" / "song.mp3").exists()
+        assert (tmpdir_path / "Images" / "sorted.jpg").exists()
+
+
+def test_organize_use_index(tmp_path, monkeypatch):
+    """Test that --use-index organizes from the index and notices new files."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    tmpdir_path = tmp_path / "files"
+    (tmpdir_path / "nested").mkdir(parents=True)
+    (tmpdir_path / "photo.jpg").touch()
+    (tmpdir_path / "nested" / "song.mp3").touch()
+
+    result = runner.invoke(app, [str(tmpdir_path), "--recursive", "--use-index", "--yes"])
+    assert result.exit_code == 0
+    assert (tmpdir_path / "Images" / "photo.jpg").exists()
+    assert (tmpdir_path / "Audio" / "song.mp3").exists()
+    assert (tmp_path / ".lazy-cli" / "index.db").exists()
+
+    (tmpdir_path / "nested" / "doc.pdf").touch()
+    result = runner.invoke(app, [str(tmpdir_path), "--recursive", "--use-index", "--yes"])
+    assert result.exit_code == 0
+    assert (tmpdir_path / "Documents" / "doc.pdf").exists()
+
+
+def test_organize_reports_invalid_rules(tmp_path, monkeypatch):
+    """Test that an invalid regex in the config rules is an error, not a crash."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".lazy-cli").mkdir()
+    (tmp_path / ".lazy-cli" / "config.yaml").write_text(
+        "organize_rules:\n  - category: Broken\n    regex: ['(unclosed']\n"
+    )
+    (tmp_path / "files").mkdir()
+
+    result = runner.invoke(app, [str(tmp_path / "files"), "--yes"])
+    assert result.exit_code == 1
+    assert "Invalid organize_rules" in result.stdout
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+
+def test_organize_inline_flag_rule(tmp_path, monkeypatch):
+    """Test a config regex rule starting with an inline flag."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".lazy-cli").mkdir()
+    (tmp_path / ".lazy-cli" / "config.yaml").write_text(
+        "organize_rules:\n  - category: Invoices\n    regex: ['(?i)invoice']\n"
+    )
+    (tmp_path / "files").mkdir()
+    (tmp_path / "files" / "INVOICE-3.pdf").touch()
+
+    result = runner.invoke(app, [str(tmp_path / "files"), "--yes"])
+    assert result.exit_code == 0
+    assert (tmp_path / "files" / "Invoices" / "INVOICE-3.pdf").exists()
+
+
+def test_organize_plan_apply_undo():
+    """Test writing a plan, applying it and undoing it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir) / "files"
+        tmpdir_path.mkdir()
+        plan = Path(tmpdir) / "plan.jsonl"
+
+        (tmpdir_path / "photo.jpg").touch()
+        (tmpdir_path / "doc.pdf").touch()
+
+        result = runner.invoke(app, [str(tmpdir_path), "--plan-out", str(plan)])
+        assert result.exit_code == 0
+        assert (tmpdir_path / "photo.jpg").exists()
+
+        result = runner.invoke(app, ["--apply", str(plan), "--yes"])
+        assert result.exit_code == 0
+        assert (tmpdir_path / "Images" / "photo.jpg").exists()
+        assert (tmpdir_path / "Documents" / "doc.pdf").exists()
+
+        result = runner.invoke(app, ["--undo", str(plan), "--yes"])
+        assert result.exit_code == 0
+        assert (tmpdir_path / "photo.jpg").exists()
+        assert not (tmpdir_path / "Images").exists()
+
+
+def test_organize_jsonl_output():
+    """Test that --output jsonl writes one record per file plus a summary."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        (tmpdir_path / "photo.jpg").touch()
+        (tmpdir_path / "doc.pdf").touch()
+
+        result = runner.invoke(app, [str(tmpdir_path), "--output", "jsonl", "--yes"])
+        assert result.exit_code == 0
+
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        events = [record["event"] for record in records]
+        assert events[0] == "scan"
+        assert events.count("moved") == 2
+        assert records[-1] == {
+            "event": "summary",
+            "dry_run": False,
+            "moved": 2,
+            "skipped": 0,
+            "errors": 0,
+        }
+
+
+def test_organize_stream():
+    """Test that streaming mode moves files and reports the summary at the end."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+
+        (tmpdir_path / "nested").mkdir()
+        (tmpdir_path / "photo.jpg").touch()
+        (tmpdir_path / "nested" / "photo.jpg").touch()
+        (tmpdir_path / "doc.pdf").write_bytes(b"12345")
+
+        result = runner.invoke(app, [str(tmpdir_path), "--stream", "--recursive", "--yes"])
+
+        assert result.exit_code == 0
+        assert "Organized Files" in result.stdout
+        assert (tmpdir_path / "Images" / "photo.jpg").exists()
+        assert (tmpdir_path / "Documents" / "doc.pdf").exists()
+        # The second photo.jpg collides with the first and stays put
+        assert (tmpdir_path / "nested" / "photo.jpg").exists()
+
+
+def test_organize_watch():
+    """Test that watch mode moves files that arrive later."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        watcher = DirectoryWatcher(tmpdir, settle=0.1, poll_interval=0.05)
+
+        def on_batch(count, stats):
+            watcher.stop()
+
+        threading.Timer(0.1, (tmpdir_path / "song.mp3").touch).start()
+        stats = organize_watch(tmpdir_path, watcher, on_batch=on_batch)
+        watcher.close()
+
+        assert stats["moved"] == 1
+        assert (tmpdir_path / "Audio" / "song.mp3").exists()
@@ -0,0 +1,72 @@
+"""
+Tests for the rename plugin.
+"""
+
+import json
+import os
+from typer.testing import CliRunner
+from lazy_cli.plugins.rename import app, build_renamer
+
+runner = CliRunner()
+
+
+def test_build_renamer():
+    """Test the order of the renaming steps."""
+    rename = build_renamer(prefix="2024_", suffix="_v2", find=" ", replace="-")
+    assert rename("my photo.jpg", 0) == "2024_my-photo_v2.jpg"
+
+    rename = build_renamer(template="img_{n:03}{ext}", start=5)
+    assert rename("DSC1234.JPG", 2) == "img_007.JPG"
+
+    rename = build_renamer(find=r"(\d+)-(\d+)", replace=r"\2-\1", regex=True)
+    assert rename("10-20.txt", 0) == "20-10.txt"
+
+
+def test_invalid_replacement_is_an_error(tmp_path):
+    """Test that a replacement referring to a missing group is reported, not raised."""
+    (tmp_path / "photo1.jpg").touch()
+
+    result = runner.invoke(app, [str(tmp_path), "--find", r"(\d)", "--regex", "--replace", r"\2"])
+    assert result.exit_code == 1
+    assert "Invalid replacement" in result.stdout
+    assert (tmp_path / "photo1.jpg").exists()
+
+
+def test_rename_overlapping_names(tmp_path):
+    """Test numbering files into names that are taken by other files of the plan."""
+    (tmp_path / "2.txt").write_text("second")
+    (tmp_path / "10.txt").write_text("first")
+
+    # Sorted by name, "10.txt" comes first and takes number 2, "2.txt" number 10
+    result = runner.invoke(app, [str(tmp_path), "--template", "{n}{ext}", "--start", "2", "--yes"])
+    assert result.exit_code == 0, result.stdout
+    assert (tmp_path / "2.txt").read_text() == "first"
+    assert (tmp_path / "3.txt").read_text() == "second"
+
+
+def test_rename_conflict_renames_nothing(tmp_path):
+    """Test that a collision aborts the whole plan."""
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+
+    result = runner.invoke(app, [str(tmp_path), "--template", "same{ext}", "--yes"])
+
+    assert result.exit_code == 1
+    assert "nothing was renamed" in result.stdout
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_rename_dry_run_jsonl(tmp_path):
+    """Test that the preview comes from the plan and nothing is renamed."""
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.log").write_text("b")
+
+    result = runner.invoke(
+        app, [str(tmp_path), "--prefix", "x_", "-p", "*.txt", "--dry-run", "-o", "jsonl"]
+    )
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records[0] == {"event": "plan", "source": "a.txt", "destination": "x_a.txt"}
+    assert records[-1] == {"event": "summary", "renamed": 1, "dry_run": True}
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.log"]
@@ -0,0 +1,46 @@
+"""
+Tests for the resize plugin.
+"""
+
+import os
+import pytest
+from typer.testing import CliRunner
+from lazy_cli.plugins.resize import app
+
+runner = CliRunner()
+
+
+def test_resize_help():
+    """Test resize help command."""
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "Resize images" in result.stdout
+
+
+def test_resize_needs_a_size(tmp_path):
+    """Test that a width, height or percentage is required."""
+    result = runner.invoke(app, [str(tmp_path)])
+    assert result.exit_code == 1
+    assert "--width" in result.stdout
+
+
+def test_resize_directory_skips_up_to_date(tmp_path):
+    """Test resizing a tree, then skipping the images whose output is newer."""
+    Image = pytest.importorskip("PIL.Image")
+    photos = tmp_path / "photos"
+    (photos / "trip").mkdir(parents=True)
+    Image.new("RGB", (800, 600)).save(photos / "a.jpg")
+    Image.new("RGB", (600, 800)).save(photos / "trip" / "b.png")
+    (photos / "notes.txt").write_text("not an image")
+
+    result = runner.invoke(app, [str(photos), "--percent", "50", "-r", "--workers", "1"])
+    assert result.exit_code == 0
+    assert "Resized 2 image(s)" in result.stdout
+    with Image.open(photos / "resized" / "trip" / "b.png") as image:
+        assert image.size == (300, 400)
+
+    os.utime(photos / "a.jpg", (0, 2**31))
+    result = runner.invoke(app, [str(photos), "--percent", "50", "-r", "--output", "jsonl"])
+    assert result.exit_code == 0
+    assert '"event": "up_to_date"' in result.stdout
+    assert '"resized": 1, "skipped": 1' in result.stdout
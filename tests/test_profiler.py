@@ -0,0 +1,79 @@
+"""
+Tests for the startup profiler.
+"""
+
+import json
+import subprocess
+import sys
+import pytest
+from lazy_cli.core.profiler import StartupProfiler, compare_to_baseline, main
+
+
+def test_profiler_records_phases():
+    """Test that phases are timed and totalled."""
+    profiler = StartupProfiler()
+
+    with profiler.phase("import something"):
+        pass
+    with profiler.phase("config load"):
+        pass
+
+    report = profiler.as_dict()
+    assert set(report["phases"]) == {"import something", "config load"}
+    assert report["total_ms"] >= 0
+
+
+def test_compare_to_baseline():
+    """Test that only significant slowdowns count as regressions."""
+    baseline = {"phases": {"import typer": 50.0, "config load": 10.0}, "total_ms": 60.0}
+
+    # Within threshold / below the absolute noise floor
+    current = {"phases": {"import typer": 55.0, "config load": 11.5}, "total_ms": 66.5}
+    assert compare_to_baseline(current, baseline) == []
+
+    # import typer got 60% slower
+    current = {"phases": {"import typer": 80.0, "config load": 10.0}, "total_ms": 90.0}
+    regressions = compare_to_baseline(current, baseline)
+    assert any(r.startswith("import typer") for r in regressions)
+    assert any(r.startswith("total") for r in regressions)
+
+
+def test_profile_startup_json(capsys):
+    """Test that --json prints every phase and the total in milliseconds."""
+    assert main(["--profile-startup", "--json"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert set(report) == {"phases", "total_ms"}
+    assert report["phases"]
+    assert all(isinstance(ms, float) for ms in report["phases"].values())
+    assert report["total_ms"] == pytest.approx(sum(report["phases"].values()), abs=0.01)
+
+
+def test_profile_startup_baseline(tmp_path, capsys):
+    """Test that a regression against the baseline makes the command fail."""
+    baseline = tmp_path / "baseline.json"
+
+    # A baseline far slower than any real startup passes
+    baseline.write_text(json.dumps({"phases": {}, "total_ms": 1e9}), encoding="utf-8")
+    assert main(["--profile-startup", "--json", "--baseline", str(baseline)]) == 0
+    assert "Startup regression" not in capsys.readouterr().err
+
+    # A baseline of zero with no tolerance fails
+    baseline.write_text(json.dumps({"phases": {}, "total_ms": 0.0}), encoding="utf-8")
+    argv = ["--profile-startup", "--json", "--baseline", str(baseline)]
+    assert main(argv + ["--threshold", "0", "--min-delta-ms", "0"]) == 1
+    assert "Startup regression: total" in capsys.readouterr().err
+
+
+def test_profile_startup_times_typer_import():
+    """Test that a fresh run reports the real cost of importing typer."""
+    result = subprocess.run(
+        [sys.executable, "-m", "lazy_cli.main", "--profile-startup", "--json"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    phases = json.loads(result.stdout)["phases"]
+    # Tens of milliseconds; a few microseconds means it had already been imported
+    assert phases["import typer"] > 1.0
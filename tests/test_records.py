@@ -0,0 +1,60 @@
+"""
+Tests for the compact record store.
+"""
+
+import tracemalloc
+from lazy_cli.core.files import FileRecord, scan_files
+from lazy_cli.core.records import MAX_BYTES_PER_RECORD, RecordStore
+
+
+def make_record(i):
+    """Build a record as the scanner would, without touching the disk."""
+    name = f"file_{i:07d}.{('jpg', 'pdf', 'txt')[i % 3]}"
+    return FileRecord.from_values(
+        f"/data/dir{i % 100}/{name}", name, size=i, mtime=i * 10**9, inode=i, device=2049
+    )
+
+
+def test_record_store_roundtrip(tmp_path):
+    """Test that stored files read back as the scanner produced them."""
+    (tmp_path / "photo.JPG").write_bytes(b"12345")
+    (tmp_path / "notes.txt").write_bytes(b"x")
+
+    scanned = {record.name: record for record in scan_files(tmp_path)}
+    store = RecordStore(["Images", "Documents", "Others"])
+    for record in scanned.values():
+        store.add(record, "Images" if record.name.endswith("JPG") else "Documents")
+
+    assert store.total == 2
+    assert len(store["Others"]) == 0
+    assert store.summary() == {"Images": [1, 5], "Documents": [1, 1]}
+
+    photo = store["Images"][0]
+    original = scanned["photo.JPG"]
+    assert (photo.path, photo.name, photo.size) == (original.path, "photo.JPG", 5)
+    assert (photo.mtime, photo.inode, photo.device) == (
+        original.mtime,
+        original.inode,
+        original.device,
+    )
+    assert store.extension(store["Images"].indices[0]) == "jpg"
+
+
+def test_record_store_memory_per_entry():
+    """Test the documented memory target: MAX_BYTES_PER_RECORD plus the name."""
+    count = 20_000
+    records = [make_record(i) for i in range(count)]
+    name_bytes = sum(len(record.name) for record in records)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = RecordStore(["Images", "Documents", "Others"])
+        for i, record in enumerate(records):
+            store.add(record, ("Images", "Documents", "Others")[i % 3])
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert store.total == count
+    assert used <= count * MAX_BYTES_PER_RECORD + name_bytes
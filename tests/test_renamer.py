@@ -0,0 +1,75 @@
+"""
+Tests for rename plans.
+"""
+
+import os
+import pytest
+from lazy_cli.core.renamer import TEMP_PREFIX, apply_renames, plan_renames
+
+
+def simulate(names, steps):
+    """Apply steps to a set of names, failing on any overwrite."""
+    names = set(names)
+    for old, new in steps:
+        assert old in names and new not in names, (old, new)
+        names.remove(old)
+        names.add(new)
+    return names
+
+
+def test_chain_is_ordered_from_free_end():
+    """Test that a -> b -> c runs b -> c first, without temporary names."""
+    steps, conflicts = plan_renames([("a", "b"), ("b", "c")], {"a", "b"})
+
+    assert conflicts == []
+    assert steps == [("b", "c"), ("a", "b")]
+
+
+def test_cycles_use_one_temporary_name_each():
+    """Test swaps and longer cycles."""
+    renames = [("a", "b"), ("b", "a"), ("x", "y"), ("y", "z"), ("z", "x"), ("p", "q")]
+    existing = {"a", "b", "x", "y", "z", "p"}
+
+    steps, conflicts = plan_renames(renames, existing)
+
+    assert conflicts == []
+    assert len(steps) == len(renames) + 2
+    assert sum(new.startswith(TEMP_PREFIX) for _, new in steps) == 2
+    assert simulate(existing, steps) == {"a", "b", "x", "y", "z", "q"}
+
+
+def test_large_shift_is_linear():
+    """Test renaming n -> n + 1 for many files (one long chain)."""
+    count = 100000
+    renames = [(f"{i}", f"{i + 1}") for i in range(count)]
+
+    steps, conflicts = plan_renames(renames, {f"{i}" for i in range(count)})
+
+    assert conflicts == []
+    assert steps[0] == (f"{count - 1}", f"{count}")
+    assert len(steps) == count
+
+
+def test_conflicts():
+    """Test collisions between targets and with existing names."""
+    _, conflicts = plan_renames([("a", "c"), ("b", "c")], {"a", "b"})
+    assert conflicts == ["a and b would both be renamed to c"]
+
+    _, conflicts = plan_renames([("a", "b")], {"a", "b"})
+    assert conflicts == ["a -> b: b already exists"]
+
+    _, conflicts = plan_renames([("a", "x/y")], {"a"})
+    assert len(conflicts) == 1
+
+
+def test_apply_renames_rolls_back(tmp_path):
+    """Test that a failed rename undoes the earlier ones."""
+    for name in ("a", "b"):
+        (tmp_path / name).write_text(name)
+
+    apply_renames(str(tmp_path), [("b", "c"), ("a", "b")])
+    assert sorted(os.listdir(tmp_path)) == ["b", "c"]
+
+    with pytest.raises(FileNotFoundError):
+        apply_renames(str(tmp_path), [("b", "d"), ("missing", "e")])
+    assert sorted(os.listdir(tmp_path)) == ["b", "c"]
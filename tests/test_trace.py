@@ -0,0 +1,63 @@
+"""
+Tests for spans and counters.
+"""
+
+import json
+import threading
+from lazy_cli.core.trace import Tracer, pop_trace_option
+
+
+def test_disabled_tracer_records_nothing():
+    """Test that a disabled tracer hands out a shared no-op span."""
+    tracer = Tracer()
+
+    with tracer.span("scan"):
+        tracer.count("stat", 10)
+
+    assert tracer.span("a") is tracer.span("b")
+    assert tracer.events == []
+    assert tracer.counters == {}
+
+
+def test_spans_and_counters(tmp_path):
+    """Test recording from several threads and writing a Chrome trace."""
+    tracer = Tracer()
+    tracer.enable()
+
+    def work():
+        with tracer.span("list_directory", path="/tmp"):
+            tracer.count("stat", 5)
+
+    with tracer.span("scan"):
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    summary = tracer.summary()
+    assert summary["spans"]["list_directory"]["count"] == 4
+    assert summary["spans"]["scan"]["count"] == 1
+    assert summary["counters"] == {"stat": 20}
+
+    tracer.write(str(tmp_path / "trace.json"))
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(spans) == 5
+    assert spans[0]["args"] == {"path": "/tmp"}
+    assert {"name": "stat", "ph": "C"}.items() <= trace["traceEvents"][-1].items()
+
+
+def test_pop_trace_option():
+    """Test that only a leading --trace option is taken from the arguments."""
+    argv = ["--trace", "out.json", "organize", "."]
+    assert pop_trace_option(argv) == "out.json"
+    assert argv == ["organize", "."]
+
+    argv = ["--trace=-", "organize"]
+    assert pop_trace_option(argv) == "-"
+    assert argv == ["organize"]
+
+    argv = ["organize", "--trace", "x"]
+    assert pop_trace_option(argv) is None
+    assert argv == ["organize", "--trace", "x"]
@@ -0,0 +1,98 @@
+"""
+Tests for disk usage scans.
+"""
+
+import os
+import shutil
+from lazy_cli.core.usage import UsageCache, largest_directories, largest_files, scan_usage
+
+
+def totals(results):
+    """Map directory paths to (total, total_files)."""
+    return {path: (usage.total, usage.total_files) for path, usage in results.items()}
+
+
+def test_scan_usage_adds_up_subtrees(tmp_path, make_tree):
+    """Test subtree totals and the largest directories and files."""
+    root = tmp_path / "tree"
+    make_tree(root, song_size=300)
+
+    results = scan_usage(root, workers=2)
+    assert totals(results) == {
+        str(root): (307, 4),
+        str(root / "a"): (302, 2),
+        str(root / "a" / "deep"): (300, 1),
+        str(root / "b"): (4, 1),
+    }
+
+    directories = largest_directories(results, 2, str(root))
+    assert [usage.path for usage in directories] == [str(root / "a"), str(root / "a" / "deep")]
+    assert largest_files(results, 2) == [
+        (300, str(root / "a" / "deep" / "song.mp3")),
+        (4, str(root / "b" / "notes.pdf")),
+    ]
+
+
+def test_scan_usage_counts_hard_links_once(tmp_path, make_tree):
+    """Test that a file linked from two directories is counted in the first one."""
+    root = tmp_path / "tree"
+    make_tree(root, song_size=300)
+    os.link(root / "a" / "deep" / "song.mp3", root / "b" / "song-link.mp3")
+
+    results = scan_usage(root)
+    assert results[str(root)].total == 307
+    assert results[str(root / "a")].total == 302
+    assert results[str(root / "b")].total == 4
+    assert [path for _, path in largest_files(results, 10)].count(
+        str(root / "b" / "song-link.mp3")
+    ) == 0
+
+
+def test_scan_usage_reuses_unchanged_directories(tmp_path, make_tree):
+    """Test that only directories whose mtime changed are listed again."""
+    root = tmp_path / "tree"
+    make_tree(root, song_size=300)
+
+    with UsageCache(tmp_path / "usage.db") as cache:
+        stats = {"listed": 0, "reused": 0}
+        first = totals(scan_usage(root, cache, stats=stats))
+        assert stats == {"listed": 4, "reused": 0}
+
+    with UsageCache(tmp_path / "usage.db") as cache:
+        stats = {"listed": 0, "reused": 0}
+        assert totals(scan_usage(root, cache, stats=stats)) == first
+        assert stats == {"listed": 0, "reused": 4}
+
+    (root / "b" / "new.bin").write_bytes(b"x" * 10)
+    shutil.rmtree(root / "a" / "deep")
+    for path in (root / "a", root / "b"):
+        os.utime(path, (2_000_000_000, 2_000_000_000))
+    with UsageCache(tmp_path / "usage.db") as cache:
+        stats = {"listed": 0, "reused": 0}
+        results = scan_usage(root, cache, stats=stats)
+        assert stats == {"listed": 2, "reused": 1}
+        assert totals(results) == {
+            str(root): (17, 4),
+            str(root / "a"): (2, 1),
+            str(root / "b"): (14, 2),
+        }
+        assert str(root / "a" / "deep") not in cache.load(str(root))
+
+
+def test_scan_usage_reports_unreadable_directories(tmp_path, make_tree, monkeypatch):
+    """Test that directories that cannot be listed are reported and skipped."""
+    root = tmp_path / "tree"
+    make_tree(root, song_size=300)
+    errors = []
+    real_stat = os.stat
+
+    def stat_or_fail(path, *args, **kwargs):
+        if path == str(root / "b"):
+            raise PermissionError(13, "Permission denied", path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat_or_fail)
+    results = scan_usage(root, on_error=lambda path, error: errors.append(path))
+    monkeypatch.undo()
+    assert errors == [str(root / "b")]
+    assert results[str(root)].total == 303
@@ -0,0 +1,61 @@
+"""
+Tests for the shared utilities.
+"""
+
+import io
+import json
+import pytest
+from lazy_cli.core.utils import Reporter, parse_size
+
+
+def test_reporter_jsonl_buffers_records():
+    """Test that JSONL records are buffered and written unstyled."""
+    stream = io.StringIO()
+    reporter = Reporter("jsonl", stream=stream, buffer_size=2)
+
+    reporter.success("Moved: a", event="moved", source="a")
+    assert stream.getvalue() == ""
+    reporter.skipped("Skipping b", source="b")
+    reporter.error("Failed c", source="c")
+    reporter.stop()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"event": "moved", "source": "a"},
+        {"event": "skipped", "source": "b"},
+        {"event": "error", "source": "c", "message": "Failed c"},
+    ]
+    assert reporter.counts == {"moved": 1, "skipped": 1, "error": 1}
+
+
+def test_reporter_text_is_quiet_unless_verbose(capsys):
+    """Test that per-item lines only appear with verbose (errors always do)."""
+    with Reporter() as reporter:
+        reporter.start(total=2)
+        reporter.success("Moved: quiet.txt")
+        reporter.error("Failed: broken.txt")
+
+    output = capsys.readouterr().out
+    assert "quiet.txt" not in output
+    assert "broken.txt" in output
+
+    with Reporter(verbose=True) as reporter:
+        reporter.success("Moved: loud.txt")
+    assert "loud.txt" in capsys.readouterr().out
+
+
+def test_reporter_rejects_unknown_output():
+    """Test that an unknown output format is refused."""
+    with pytest.raises(ValueError):
+        Reporter("xml")
+
+
+def test_parse_size():
+    """Test parsing human-readable sizes."""
+    assert parse_size("512") == 512
+    assert parse_size("10K") == 10 * 1024
+    assert parse_size("1.5 MB") == 1536 * 1024
+    assert parse_size("2GiB") == 2 * 1024**3
+
+    with pytest.raises(ValueError):
+        parse_size("ten")
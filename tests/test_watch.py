@@ -0,0 +1,56 @@
+"""
+Tests for the directory watcher.
+"""
+
+import os
+import threading
+import time
+import pytest
+from lazy_cli.core.watch import DirectoryWatcher
+
+
+def write_files_later(directory):
+    """Create a finished file and a download that completes by renaming."""
+
+    def run():
+        time.sleep(0.1)
+        (directory / "report.pdf").write_bytes(b"pdf")
+        (directory / ".hidden").write_bytes(b"")
+        (directory / "movie.mp4.part").write_bytes(b"partial")
+        time.sleep(0.05)
+        os.rename(directory / "movie.mp4.part", directory / "movie.mp4")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reports_new_files_in_one_batch(tmp_path, use_inotify):
+    """Test that a burst becomes one batch, without partial or hidden files."""
+    (tmp_path / "existing.txt").write_bytes(b"")
+    watcher = DirectoryWatcher(
+        str(tmp_path), settle=0.3, poll_interval=0.05, use_inotify=use_inotify
+    )
+    thread = write_files_later(tmp_path)
+
+    try:
+        batch = next(watcher.batches())
+    finally:
+        thread.join()
+        watcher.close()
+
+    assert [record.name for record in batch] == ["movie.mp4", "report.pdf"]
+    assert batch[1].size == 3
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_stop_wakes_it_up(tmp_path, use_inotify):
+    """Test that stop() ends an idle watch immediately."""
+    watcher = DirectoryWatcher(str(tmp_path), poll_interval=30, use_inotify=use_inotify)
+    threading.Timer(0.1, watcher.stop).start()
+
+    started = time.monotonic()
+    assert list(watcher.batches()) == []
+    assert time.monotonic() - started < 2
+    watcher.close()